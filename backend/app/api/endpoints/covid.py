@@ -9,10 +9,16 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from backend.app.core.database import get_db
+from backend.app.core.export import MOTIF_FORMAT_EXPORT, reponse_export
+from backend.app.core.reponses import ReponseORJSON
+from backend.app.core.pagination import ENTETE_CURSEUR, curseur_suivant, reponse_ndjson
 from backend.app.crud.covid import (
-    creer_donnees_covid, obtenir_donnees_covid_par_id, liste_donnees_covid, 
-    mettre_a_jour_donnees_covid, supprimer_donnees_covid
+    creer_donnees_covid, obtenir_donnees_covid_par_id,
+    mettre_a_jour_donnees_covid, supprimer_donnees_covid, construire_requete_donnees_covid,
+    liste_donnees_covid_lignes,
+    obtenir_evolution_temporelle_covid
 )
+from backend.app.models.models import FCovid
 from backend.app.schemas.schemas import FCovidCreate, FCovidRead
 from backend.app.crud.location import obtenir_pays_par_id
 
@@ -22,27 +28,103 @@ router = APIRouter()
 @router.get("/", response_model=List[FCovidRead])
 async def liste_donnees_covid_endpoint(
     skip: int = 0, 
-    limit: int = 100,
+    limit: Optional[int] = Query(None, gt=0),
     location_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    format_sortie: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    Liste paginée par curseur, triée par (location_id, date, id)
+
+    - format=json : page de `limit` lignes (100 par défaut) ;
+      le jeton de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+    - format=ndjson : flux d'une ligne JSON par enregistrement, sans limite
+      par défaut, pour exporter la table entière
+    """
     try:
-        return await liste_donnees_covid(
+        if format_sortie == "ndjson":
+            query = construire_requete_donnees_covid(location_id, start_date, end_date, cursor, skip, limit)
+            return reponse_ndjson(query, lambda obj: FCovidRead.model_validate(obj).model_dump_json())
+
+        # Pas de plafond sur cette route (comportement historique)
+        limit = limit or 100
+
+        # Lignes lues colonne par colonne et encodées par orjson, sans objets ORM
+        donnees = await liste_donnees_covid_lignes(
             db, 
             skip=skip, 
             limit=limit,
             location_id=location_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            curseur=cursor
         )
+        suivant = curseur_suivant(donnees, limit, lambda ligne: (ligne["location_id"], ligne["date"], ligne["covid_fact_id"]))
+        return ReponseORJSON(donnees, headers={ENTETE_CURSEUR: suivant} if suivant else None)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur interne du serveur: {str(e)}"
         )
 
+# GET - Série temporelle agrégée pour les graphiques (déclarée avant /{covid_fact_id})
+@router.get("/series", response_model=List[Dict[str, Any]])
+async def serie_temporelle_covid_endpoint(
+    metric: str = "new_cases",
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    granularite: str = Query("jour", pattern="^(jour|semaine|mois)$"),
+    fenetre: Optional[int] = Query(None, ge=1, le=365, description="Moyenne glissante sur N périodes"),
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Nombre de points maximal par pays (LTTB)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Série temporelle d'une métrique, agrégée par jour, semaine ou mois
+
+    Le regroupement et la moyenne glissante sont faits en SQL ; `points`
+    réduit chaque pays au nombre de points demandé en conservant la forme
+    de la courbe.
+    """
+    try:
+        return await obtenir_evolution_temporelle_covid(
+            db,
+            location_id=location_id,
+            metric=metric,
+            start_date=start_date,
+            end_date=end_date,
+            granularite=granularite,
+            fenetre=fenetre,
+            points_max=points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erreur lors du calcul de la série temporelle COVID: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur interne du serveur: {str(e)}"
+        )
+
+# GET - Exporter les données COVID en flux (déclarée avant /{covid_fact_id})
+@router.get("/export")
+async def exporter_donnees_covid_endpoint(
+    format_export: str = Query("csv", alias="format", pattern=MOTIF_FORMAT_EXPORT),
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Exporte f_covid en CSV, NDJSON ou Arrow IPC depuis un curseur serveur, sans pagination"""
+    query = construire_requete_donnees_covid(location_id, start_date, end_date)
+    return reponse_export(query.with_only_columns(*FCovid.__table__.columns), format_export, "f_covid")
+
 # GET - Récupérer une donnée COVID par son ID
 @router.get("/{covid_fact_id}", response_model=FCovidRead)
 async def obtenir_donnees_covid_par_id_endpoint(
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
 
 from backend.app.core.database import get_db
+from backend.app.core.export import MOTIF_FORMAT_EXPORT, reponse_export
+from backend.app.core.reponses import ReponseORJSON
+from backend.app.core.pagination import ENTETE_CURSEUR, curseur_suivant, reponse_ndjson
 from backend.app.crud.mpox import (
-    creer_donnees_mpox, obtenir_donnees_mpox_par_id, liste_donnees_mpox,
-    mettre_a_jour_donnees_mpox, supprimer_donnees_mpox
+    creer_donnees_mpox, obtenir_donnees_mpox_par_id,
+    mettre_a_jour_donnees_mpox, supprimer_donnees_mpox, construire_requete_donnees_mpox,
+    liste_donnees_mpox_lignes
 )
+from backend.app.models.models import FMpox
 from backend.app.schemas.schemas import FMpoxCreate, FMpoxRead
 from backend.app.crud.location import obtenir_pays_par_id
 
@@ -16,13 +21,40 @@ router = APIRouter()
 @router.get("/", response_model=List[FMpoxRead])
 async def liste_donnees_mpox_endpoint(
     skip: int = 0,
-    limit: int = 100,
+    limit: Optional[int] = Query(None, gt=0),
     location_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    format_sortie: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
     db: AsyncSession = Depends(get_db)
 ):
-    return await liste_donnees_mpox(db, skip, limit, location_id, start_date, end_date)
+    """Liste paginée par curseur (en-tête X-Next-Cursor), ou flux NDJSON avec format=ndjson"""
+    try:
+        if format_sortie == "ndjson":
+            query = construire_requete_donnees_mpox(location_id, start_date, end_date, cursor, skip, limit)
+            return reponse_ndjson(query, lambda obj: FMpoxRead.model_validate(obj).model_dump_json())
+
+        # Pas de plafond sur cette route (comportement historique)
+        limit = limit or 100
+
+        donnees = await liste_donnees_mpox_lignes(db, skip, limit, location_id, start_date, end_date, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    suivant = curseur_suivant(donnees, limit, lambda ligne: (ligne["location_id"], ligne["date"], ligne["mpox_fact_id"]))
+    return ReponseORJSON(donnees, headers={ENTETE_CURSEUR: suivant} if suivant else None)
+
+@router.get("/export")
+async def exporter_donnees_mpox_endpoint(
+    format_export: str = Query("csv", alias="format", pattern=MOTIF_FORMAT_EXPORT),
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Exporte f_mpox en CSV, NDJSON ou Arrow IPC depuis un curseur serveur, sans pagination"""
+    query = construire_requete_donnees_mpox(location_id, start_date, end_date)
+    return reponse_export(query.with_only_columns(*FMpox.__table__.columns), format_export, "f_mpox")
 
 @router.get("/{mpox_fact_id}", response_model=FMpoxRead)
 async def obtenir_donnees_mpox_par_id_endpoint(
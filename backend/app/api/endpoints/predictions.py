@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, and_
+from sqlalchemy import Date, text
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import date
+import json
+import time
 
-from backend.app.core.database import get_db, engine
+from backend.app.core.cache import cache_reponses
+from backend.app.core.database import get_db, engine, SessionLocal
+from backend.app.core.export import MOTIF_FORMAT_EXPORT, reponse_export
+from backend.app.core.reponses import ReponseORJSON
+from backend.app.core.pagination import ENTETE_CURSEUR, LIMITE_MAX_PAGE, curseur_suivant, reponse_ndjson
+from backend.app.core.jobs import Job, gestionnaire_jobs
+from backend.app.core.migrations import appliquer_migrations
 from backend.app.crud import predi_covid as crud_predi_covid
 from backend.app.crud import location as crud_location
 from backend.app.schemas.schemas import (
-    FPrediCovidCreate,
     FPrediCovidRead,
+    GenerationPredictionsResume,
+    JobGenerationRead,
     PredictionFilters,
+    PredictionsBatchRequest,
+    PredictionsPaysRead,
     IndicateurType
 )
 from backend.app.models.models import FPrediCovid, Base
@@ -39,6 +51,9 @@ async def check_and_create_tables():
                 print("✅ Tables créées avec succès")
             else:
                 print("✅ Table f_predi_covid existe déjà")
+
+            # Idempotentes : même état (contraintes, index, résumé rempli) que la base soit neuve ou non
+            await appliquer_migrations(conn)
                 
     except Exception as e:
         print(f"❌ Erreur lors de la vérification/création des tables: {str(e)}")
@@ -46,12 +61,15 @@ async def check_and_create_tables():
 
 @router.get("/countries", response_model=List[str], tags=["Prédictions"])
 async def get_countries_with_predictions(
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Récupère la liste des pays qui ont des prédictions de nouveaux cas (new_cases)
+
+    Réponse mise en cache et validée par ETag (304 si If-None-Match correspond).
     """
-    try:
+    async def calculer():
         # Utiliser SQLAlchemy de manière asynchrone
         from sqlalchemy import select, distinct
         from backend.app.models.models import DLocation, FPrediCovid
@@ -72,6 +90,11 @@ async def get_countries_with_predictions(
             
         return countries
 
+    try:
+        return await cache_reponses.repondre(request, db, "countries", calculer)
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Erreur lors de la récupération des pays: {str(e)}")
         raise HTTPException(
@@ -79,49 +102,137 @@ async def get_countries_with_predictions(
             detail=f"Erreur lors de la récupération des pays: {str(e)}"
         )
 
+# Pivot des trois indicateurs par pays et par date, trié pour pouvoir être consommé en flux.
+# Un seul modèle à la fois : les modes direct et récursif d'une même année ne sont pas mélangés
+REQUETE_PREDICTIONS_ANNEE = text("""
+    WITH predictions_by_type AS (
+        -- Récupérer les nouveaux cas
+        SELECT 
+            dl.location_name as pays,
+            fpc.date_predite,
+            fpc.valeur_predite as valeur,
+            fpc.indicateur,
+            fpc.model_name
+        FROM d_location dl
+        JOIN f_predi_covid fpc ON dl.location_id = fpc.location_id
+        WHERE fpc.date_predite BETWEEN :date_debut AND :date_fin
+        AND fpc.indicateur IN ('new_cases', 'new_deaths', 'countries_reporting')
+        AND fpc.model_name = :model_name
+    )
+    SELECT 
+        pays,
+        date_predite,
+        MAX(CASE WHEN indicateur = 'new_cases' THEN valeur END) as nouveaux_cas,
+        MAX(CASE WHEN indicateur = 'new_deaths' THEN valeur END) as deces,
+        MAX(CASE WHEN indicateur = 'countries_reporting' THEN valeur END) as countries_reporting_pred,
+        MAX(CASE WHEN indicateur = 'new_cases' THEN model_name END) as model_name
+    FROM predictions_by_type
+    GROUP BY pays, date_predite
+    ORDER BY pays, date_predite;
+""").columns(date_predite=Date)
+
+# Nombre de lignes lues à chaque aller-retour du curseur serveur en mode colonnes
+TAILLE_LOT_CURSEUR = 2000
+
+def _colonnes_vides():
+    return {"dates": [], "nouveaux_cas": [], "deces": [], "countries_reporting_pred": [], "modele": None}
+
+async def _flux_predictions_colonnes(session: AsyncSession, result, premiere_ligne):
+    """
+    Émet le JSON colonnes pays par pays au fil du curseur serveur
+
+    Seules les colonnes du pays en cours sont gardées en mémoire : la
+    requête est triée par pays puis par date.
+    """
+    try:
+        yield "{"
+        pays_courant = None
+        colonnes = None
+        ligne = premiere_ligne
+        premier_pays = True
+        while ligne is not None:
+            if ligne.pays != pays_courant:
+                if colonnes is not None:
+                    yield ("" if premier_pays else ",") + f"{json.dumps(pays_courant)}:{json.dumps(colonnes)}"
+                    premier_pays = False
+                pays_courant = ligne.pays
+                colonnes = _colonnes_vides()
+                colonnes["modele"] = ligne.model_name
+
+            colonnes["dates"].append(ligne.date_predite.strftime("%Y-%m-%d"))
+            colonnes["nouveaux_cas"].append(float(ligne.nouveaux_cas or 0))
+            colonnes["deces"].append(float(ligne.deces or 0))
+            colonnes["countries_reporting_pred"].append(float(ligne.countries_reporting_pred or 0))
+            ligne = await result.fetchone()
+
+        if colonnes is not None:
+            yield ("" if premier_pays else ",") + f"{json.dumps(pays_courant)}:{json.dumps(colonnes)}"
+        yield "}"
+    finally:
+        await result.close()
+        await session.close()
+
+async def _reponse_predictions_colonnes(year: int, model_name: str) -> StreamingResponse:
+    """
+    Ouvre un curseur serveur sur les prédictions de l'année et renvoie la réponse en flux
+
+    La réponse est émise après la fin des dépendances de la requête : elle
+    utilise donc sa propre session, fermée à la fin du flux.
+    """
+    session = SessionLocal()
+    try:
+        result = await session.stream(
+            REQUETE_PREDICTIONS_ANNEE.execution_options(yield_per=TAILLE_LOT_CURSEUR),
+            {"date_debut": date(year, 1, 1), "date_fin": date(year, 12, 31), "model_name": model_name}
+        )
+        premiere_ligne = await result.fetchone()
+    except Exception:
+        await session.close()
+        raise
+
+    if premiere_ligne is None:
+        await result.close()
+        await session.close()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Aucune prédiction trouvée pour l'année {year}"
+        )
+
+    return StreamingResponse(
+        _flux_predictions_colonnes(session, result, premiere_ligne),
+        media_type="application/json"
+    )
+
 @router.get("/all-predictions/{year}")
 async def get_all_predictions_by_year(
+    request: Request,
     year: int,
+    mode: str = Query("lignes", pattern="^(lignes|colonnes)$"),
+    recursif: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Récupère toutes les prédictions pour tous les pays pour une année spécifique
+
+    - mode=lignes (défaut) : {pays: [{date, nouveaux_cas, deces, ...}, ...]}
+    - mode=colonnes : {pays: {dates: [...], nouveaux_cas: [...], deces: [...], ...}},
+      émis en flux depuis un curseur serveur, sans matérialiser toute l'année
+
+    Seules les prédictions du mode de génération demandé sont renvoyées
+    (directes par défaut, récursives avec recursif=true).
+
+    Les deux modes sont validés par ETag ; seul le mode lignes est gardé en cache.
     """
-    try:
+    model_name = crud_predi_covid.nom_modele(recursif)
+
+    async def calculer():
         # Construire les dates de début et fin d'année
         date_debut = date(year, 1, 1)
         date_fin = date(year, 12, 31)
         
-        # Utiliser une requête SQL directe pour plus d'efficacité
-        query = text("""
-            WITH predictions_by_type AS (
-                -- Récupérer les nouveaux cas
-                SELECT 
-                    dl.location_name as pays,
-                    fpc.date_predite,
-                    fpc.valeur_predite as valeur,
-                    fpc.indicateur,
-                    fpc.model_name
-                FROM d_location dl
-                JOIN f_predi_covid fpc ON dl.location_id = fpc.location_id
-                WHERE fpc.date_predite BETWEEN :date_debut AND :date_fin
-                AND fpc.indicateur IN ('new_cases', 'new_deaths', 'countries_reporting')
-            )
-            SELECT 
-                pays,
-                date_predite,
-                MAX(CASE WHEN indicateur = 'new_cases' THEN valeur END) as nouveaux_cas,
-                MAX(CASE WHEN indicateur = 'new_deaths' THEN valeur END) as deces,
-                MAX(CASE WHEN indicateur = 'countries_reporting' THEN valeur END) as countries_reporting_pred,
-                MAX(CASE WHEN indicateur = 'new_cases' THEN model_name END) as model_name
-            FROM predictions_by_type
-            GROUP BY pays, date_predite
-            ORDER BY pays, date_predite;
-        """)
-        
         result = await db.execute(
-            query,
-            {"date_debut": date_debut, "date_fin": date_fin}
+            REQUETE_PREDICTIONS_ANNEE,
+            {"date_debut": date_debut, "date_fin": date_fin, "model_name": model_name}
         )
         
         # Organiser les prédictions par pays
@@ -147,6 +258,19 @@ async def get_all_predictions_by_year(
             
         return predictions_par_pays
 
+    try:
+        if mode == "colonnes":
+            entetes = await cache_reponses.entetes(db, f"all-predictions:{year}:{model_name}:colonnes")
+            if cache_reponses.non_modifie(request, entetes):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=entetes)
+            reponse = await _reponse_predictions_colonnes(year, model_name)
+            reponse.headers.update(entetes)
+            return reponse
+
+        return await cache_reponses.repondre(request, db, f"all-predictions:{year}:{model_name}", calculer)
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Erreur lors de la récupération des prédictions: {str(e)}")
         raise HTTPException(
@@ -156,14 +280,21 @@ async def get_all_predictions_by_year(
 
 @router.get("/predictions-by-country/{year}")
 async def get_predictions_by_country_and_year(
+    request: Request,
     year: int,
     pays: str,
+    recursif: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Récupère toutes les prédictions de nouveaux cas pour un pays et une année spécifique
+
+    Prédictions directes par défaut, récursives avec recursif=true.
+    Réponse mise en cache et validée par ETag (304 si If-None-Match correspond).
     """
-    try:
+    model_name = crud_predi_covid.nom_modele(recursif)
+
+    async def calculer():
         # Construire les dates de début et fin d'année
         date_debut = f"{year}-01-01"
         date_fin = f"{year}-12-31"
@@ -180,12 +311,13 @@ async def get_predictions_by_country_and_year(
             WHERE dl.location_name = :pays
             AND fpc.indicateur = 'new_cases'
             AND fpc.date_predite BETWEEN :date_debut AND :date_fin
+            AND fpc.model_name = :model_name
             ORDER BY fpc.date_predite;
-        """)
+        """).columns(date_predite=Date)
         
         result = await db.execute(
             query,
-            {"pays": pays, "date_debut": date_debut, "date_fin": date_fin}
+            {"pays": pays, "date_debut": date_debut, "date_fin": date_fin, "model_name": model_name}
         )
         
         predictions = []
@@ -205,6 +337,11 @@ async def get_predictions_by_country_and_year(
             
         return predictions
 
+    try:
+        return await cache_reponses.repondre(request, db, f"predictions-by-country:{year}:{pays}:{model_name}", calculer)
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Erreur lors de la récupération des prédictions: {str(e)}")
         raise HTTPException(
@@ -218,41 +355,132 @@ async def get_predictions(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Récupère les prédictions avec filtres optionnels
+    Récupère les prédictions avec filtres optionnels, triées par (location_id, date_predite, pred_id)
+
+    Pagination par curseur : passer la valeur de l'en-tête X-Next-Cursor dans
+    `cursor` pour obtenir la page suivante. Avec format=ndjson, les lignes
+    sont émises en flux sans limite de 1000.
     """
     try:
-        all_predictions = []
-        
+        location_id = filters.location_id
+
         # Si un nom de pays est fourni
         if filters.pays:
             location = await crud_location.obtenir_pays_par_nom(db, filters.pays)
-            if location:
-                predictions = await crud_predi_covid.liste_predictions_covid(
-                    db, 
-                    skip=filters.skip, 
-                    limit=filters.limit,
-                    location_id=location.location_id,
-                    indicateur=filters.indicateur.value if filters.indicateur else None,
-                    date_debut=filters.date_debut,
-                    date_fin=filters.date_fin
-                )
-                all_predictions.extend(predictions)
-            else:
+            if not location:
                 print(f"Pays non trouvé: {filters.pays}")
-        else:
-            # Si aucun pays n'est spécifié, récupérer toutes les prédictions
-            predictions = await crud_predi_covid.liste_predictions_covid(
-                db, 
-                skip=filters.skip, 
-                limit=filters.limit,
-                location_id=filters.location_id,
-                indicateur=filters.indicateur.value if filters.indicateur else None,
-                date_debut=filters.date_debut,
-                date_fin=filters.date_fin
+                return []
+            location_id = location.location_id
+
+        indicateur = filters.indicateur.value if filters.indicateur else None
+
+        if filters.format == "ndjson":
+            query = crud_predi_covid.construire_requete_predictions_covid(
+                location_id, indicateur, filters.date_debut, filters.date_fin,
+                filters.cursor, filters.skip, filters.limit
+            )
+            return reponse_ndjson(query, lambda obj: FPrediCovidRead.model_validate(obj).model_dump_json())
+
+        if filters.limit > LIMITE_MAX_PAGE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La limite maximale est de {LIMITE_MAX_PAGE} enregistrements (utiliser format=ndjson au-delà)"
             )
-            all_predictions.extend(predictions)
-        
-        return all_predictions
+
+        # Lignes lues colonne par colonne et encodées par orjson, sans objets ORM
+        predictions = await crud_predi_covid.liste_predictions_covid_lignes(
+            db, 
+            skip=filters.skip, 
+            limit=filters.limit,
+            location_id=location_id,
+            indicateur=indicateur,
+            date_debut=filters.date_debut,
+            date_fin=filters.date_fin,
+            curseur=filters.cursor
+        )
+
+        suivant = curseur_suivant(
+            predictions, filters.limit, lambda ligne: (ligne["location_id"], ligne["date_predite"], ligne["pred_id"])
+        )
+        return ReponseORJSON(predictions, headers={ENTETE_CURSEUR: suivant} if suivant else None)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        print(f"Erreur lors de la récupération des prédictions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la récupération des prédictions: {str(e)}"
+        )
+
+@router.get("/export")
+async def export_predictions(
+    format_export: str = Query("csv", alias="format", pattern=MOTIF_FORMAT_EXPORT),
+    location_id: Optional[int] = None,
+    indicateur: Optional[IndicateurType] = None,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None
+):
+    """
+    Exporte f_predi_covid en CSV, NDJSON ou Arrow IPC depuis un curseur serveur, sans pagination
+    """
+    query = crud_predi_covid.construire_requete_predictions_covid(
+        location_id, indicateur.value if indicateur else None, date_debut, date_fin
+    )
+    return reponse_export(
+        query.with_only_columns(*FPrediCovid.__table__.columns), format_export, "f_predi_covid"
+    )
+
+@router.post("/batch", response_model=List[PredictionsPaysRead])
+async def get_predictions_batch(
+    requete: PredictionsBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Récupère les prédictions de plusieurs pays en une seule requête
+
+    Les pays sont désignés par identifiant et/ou par nom ; le résultat est
+    groupé par pays, dans l'ordre de la demande. Les noms ou identifiants
+    inconnus sont ignorés.
+    """
+    try:
+        locations = []
+        for location_id in requete.location_ids:
+            location = await crud_location.obtenir_pays_par_id(db, location_id)
+            if location:
+                locations.append(location)
+            else:
+                print(f"Pays non trouvé: {location_id}")
+        for nom in requete.pays:
+            location = await crud_location.obtenir_pays_par_nom(db, nom)
+            if location:
+                locations.append(location)
+            else:
+                print(f"Pays non trouvé: {nom}")
+
+        # Dédoublonner en conservant l'ordre de la demande
+        locations = list({location.location_id: location for location in locations}.values())
+        if not locations:
+            return []
+
+        predictions_par_pays = await crud_predi_covid.liste_predictions_covid_par_pays(
+            db,
+            [location.location_id for location in locations],
+            indicateur=requete.indicateur.value,
+            date_debut=requete.date_debut,
+            date_fin=requete.date_fin
+        )
+
+        return ReponseORJSON([
+            {
+                "location_id": location.location_id,
+                "pays": location.location_name,
+                "predictions": predictions_par_pays[location.location_id]
+            }
+            for location in locations
+        ])
 
     except Exception as e:
         print(f"Erreur lors de la récupération des prédictions: {str(e)}")
@@ -277,13 +505,72 @@ async def get_prediction_by_id(
         )
     return prediction
 
-@router.post("/generate/{year}", response_model=List[FPrediCovidRead])
+async def _executer_generation(
+    job: Job,
+    year: int,
+    generate_predictions,
+    recursif: bool = False
+) -> GenerationPredictionsResume:
+    """
+    Génère puis enregistre les prédictions d'une année pour un job d'arrière-plan
+
+    La génération (CPU) tourne dans le pool de threads des jobs ; l'écriture en
+    base reste asynchrone. La progression est répartie à parts égales entre
+    les deux phases.
+    """
+    debut = time.perf_counter()
+    model_name = crud_predi_covid.nom_modele(recursif)
+
+    # 1. Générer les prédictions hors de la boucle d'événements
+    job.mettre_a_jour(statut="generation")
+    predictions_data = await gestionnaire_jobs.executer_en_thread(
+        generate_predictions,
+        year,
+        recursif=recursif,
+        progression=lambda pays_traites, total_pays: job.mettre_a_jour(
+            progression=0.5 * pays_traites / total_pays
+        )
+    )
+    print(f"📊 {len(predictions_data)} prédictions générées par le script")
+
+    # 2. Sauvegarder en base de données (une transaction, insertions par lots)
+    lignes_totales = len(predictions_data) * len(crud_predi_covid.INDICATEURS_GENERES)
+    job.mettre_a_jour(statut="sauvegarde", progression=0.5, lignes_totales=lignes_totales)
+    async with SessionLocal() as db:
+        resume = await crud_predi_covid.creer_predictions_covid_en_masse(
+            db,
+            predictions_data,
+            model_name=model_name,
+            progression=lambda lignes: job.mettre_a_jour(
+                lignes_ecrites=lignes,
+                progression=0.5 + 0.5 * lignes / max(lignes_totales, 1)
+            )
+        )
+
+    print(f"✅ {resume['lignes_inserees']} enregistrements sauvegardés en base")
+    return GenerationPredictionsResume(
+        annee=year,
+        predictions_generees=len(predictions_data),
+        model_name=model_name,
+        duree_secondes=round(time.perf_counter() - debut, 3),
+        **resume
+    )
+
+@router.post(
+    "/generate/{year}",
+    response_model=JobGenerationRead,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def generate_predictions_for_year(
     year: int,
-    db: AsyncSession = Depends(get_db)
+    recursif: bool = False
 ):
     """
-    Génère des prédictions pour une année donnée
+    Soumet la génération des prédictions d'une année en tâche de fond
+
+    Renvoie le job à suivre via GET /predictions/jobs/{job_id}. Une génération
+    déjà en cours pour la même année et le même mode est réutilisée plutôt que relancée.
+    Avec recursif=true, chaque jour prédit alimente les features du lendemain.
     """
     try:
         # 1. Vérifier et créer les tables si nécessaire
@@ -296,42 +583,17 @@ async def generate_predictions_for_year(
         sys.path.append(os.path.join(os.path.dirname(__file__), '../../../scripts'))
         from generate_predictions import generate_predictions
         
-        print(f"🎯 Génération des prédictions pour {year}...")
-        
-        # 3. Générer les prédictions
-        predictions_data = generate_predictions(year)
-        print(f"📊 {len(predictions_data)} prédictions générées par le script")
-        
-        # 4. Sauvegarder en base de données
-        saved_predictions = []
-        print("💾 Sauvegarde en base de données...")
-        
-        for i, pred_data in enumerate(predictions_data):
-            if i % 1000 == 0:  # Afficher le progrès tous les 1000 enregistrements
-                print(f"   Traitement: {i}/{len(predictions_data)} ({i/len(predictions_data)*100:.1f}%)")
-            
-            # Récupérer ou créer la location
-            location = await crud_location.obtenir_ou_creer_pays(db, pred_data["location"])
-            
-            # Créer les prédictions pour chaque indicateur
-            for indicateur, valeur in [
-                ("new_cases", pred_data["new_cases_pred"]),
-                ("new_deaths", pred_data["new_deaths_pred"]),
-                ("countries_reporting", pred_data["countries_reporting_pred"])
-            ]:
-                pred_create = FPrediCovidCreate(
-                    date_predite=pred_data["date"],
-                    location_id=location.location_id,
-                    indicateur=indicateur,
-                    valeur_predite=float(valeur),
-                    model_name="RF_XGB_Ensemble"  # Nom du modèle utilisé
-                )
-                
-                saved_pred = await crud_predi_covid.creer_prediction_covid(db, pred_create)
-                saved_predictions.append(saved_pred)
-        
-        print(f"✅ {len(saved_predictions)} enregistrements sauvegardés en base")
-        return saved_predictions
+        # 3. Soumettre le job (dédoublonné par année et par mode)
+        mode = "recursif" if recursif else "direct"
+        job, cree = gestionnaire_jobs.soumettre(
+            f"generation-{year}-{mode}",
+            lambda job: _executer_generation(job, year, generate_predictions, recursif)
+        )
+        if cree:
+            print(f"🎯 Job {job.job_id} soumis pour la génération des prédictions {year} (mode {mode})")
+        else:
+            print(f"↩️ Génération {year} (mode {mode}) déjà en cours (job {job.job_id})")
+        return job.to_dict()
         
     except ImportError as e:
         print(f"❌ Erreur d'import du script: {str(e)}")
@@ -340,11 +602,26 @@ async def generate_predictions_for_year(
             detail=f"Erreur d'import du script de génération: {str(e)}"
         )
     except Exception as e:
-        print(f"❌ Erreur lors de la génération des prédictions: {str(e)}")
+        print(f"❌ Erreur lors de la soumission de la génération: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la génération des prédictions: {str(e)}"
+            detail=f"Erreur lors de la soumission de la génération: {str(e)}"
+        )
+
+@router.get("/jobs/{job_id}", response_model=JobGenerationRead)
+async def get_generation_job(
+    job_id: str
+):
+    """
+    Récupère l'état d'un job de génération : progression, lignes écrites et temps restant estimé
+    """
+    job = gestionnaire_jobs.obtenir(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job non trouvé"
         )
+    return job.to_dict()
 
 @router.delete("/{pred_id}")
 async def delete_prediction(
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, Protocol, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import DateTime, Integer, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.reponses import ReponseORJSON
+
+# Durée de vie des réponses en cache (secondes) : borne le décalage entre
+# workers quand le backend est local au processus
+CACHE_REPONSES_TTL = float(os.getenv("CACHE_REPONSES_TTL", "600"))
+# Nombre maximal de réponses gardées par le backend mémoire
+CACHE_REPONSES_MAX_ENTREES = int(os.getenv("CACHE_REPONSES_MAX_ENTREES", "256"))
+
+# Empreinte des données de prédiction : dernière génération, dernière mise à
+# jour et nombre de lignes (pour détecter les suppressions)
+REQUETE_VERSION_PREDICTIONS = text("""
+    SELECT MAX(date_generation) AS max_generation,
+           MAX(updated_at) AS max_mise_a_jour,
+           COUNT(*) AS nb_lignes
+    FROM f_predi_covid
+""").columns(
+    column("max_generation", DateTime),
+    column("max_mise_a_jour", DateTime),
+    column("nb_lignes", Integer)
+)
+
+CLE_VERSION = "predictions:version"
+
+
+class BackendCache(Protocol):
+    """
+    Interface minimale d'un backend de cache (valeurs en octets)
+
+    Un backend partagé (Redis, memcached...) peut être branché via
+    CacheReponses.definir_backend pour que tous les workers profitent
+    du même cache et des mêmes invalidations.
+    """
+
+    def lire(self, cle: str) -> Optional[bytes]: ...
+
+    def ecrire(self, cle: str, valeur: bytes, ttl: float) -> None: ...
+
+    def vider(self) -> None: ...
+
+
+class BackendMemoire:
+    """Cache LRU en mémoire, propre au processus, avec expiration par entrée"""
+
+    def __init__(self, max_entrees: int = CACHE_REPONSES_MAX_ENTREES):
+        self.max_entrees = max_entrees
+        self._entrees: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def lire(self, cle: str) -> Optional[bytes]:
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                return None
+            expire_le, valeur = entree
+            if expire_le <= time.monotonic():
+                del self._entrees[cle]
+                return None
+            self._entrees.move_to_end(cle)
+            return valeur
+
+    def ecrire(self, cle: str, valeur: bytes, ttl: float) -> None:
+        with self._verrou:
+            self._entrees[cle] = (time.monotonic() + ttl, valeur)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.max_entrees:
+                self._entrees.popitem(last=False)
+
+    def vider(self) -> None:
+        with self._verrou:
+            self._entrees.clear()
+
+
+class CacheReponses:
+    """
+    Cache des réponses JSON des routes de prédiction en lecture seule
+
+    Chaque réponse porte un ETag fort calculé à partir de l'empreinte des
+    données (REQUETE_VERSION_PREDICTIONS) et de la clé de la route. Cette
+    empreinte est elle-même mise en cache : tant qu'aucune invalidation
+    n'a eu lieu, une requête servie depuis le cache ne touche pas la base.
+    """
+
+    def __init__(self, backend: Optional[BackendCache] = None, ttl: float = CACHE_REPONSES_TTL):
+        self.backend: BackendCache = backend or BackendMemoire()
+        self.ttl = ttl
+
+    def definir_backend(self, backend: BackendCache):
+        self.backend = backend
+
+    def invalider(self):
+        """À appeler après toute écriture ou suppression dans f_predi_covid"""
+        self.backend.vider()
+
+    async def version(self, db: AsyncSession) -> Tuple[str, Optional[datetime]]:
+        """Empreinte courante des prédictions et date de dernière modification"""
+        brut = self.backend.lire(CLE_VERSION)
+        if brut is None:
+            row = (await db.execute(REQUETE_VERSION_PREDICTIONS)).one()
+            dates = [d for d in (row.max_generation, row.max_mise_a_jour) if d is not None]
+            derniere_modif = max(dates) if dates else None
+            empreinte = f"{row.max_generation}|{row.max_mise_a_jour}|{row.nb_lignes}"
+            brut = json.dumps({
+                "empreinte": empreinte,
+                "derniere_modif": derniere_modif.isoformat() if derniere_modif else None
+            }).encode()
+            self.backend.ecrire(CLE_VERSION, brut, self.ttl)
+
+        version = json.loads(brut)
+        derniere_modif = version["derniere_modif"]
+        return version["empreinte"], datetime.fromisoformat(derniere_modif) if derniere_modif else None
+
+    @staticmethod
+    def etag(cle: str, empreinte: str) -> str:
+        return '"' + hashlib.sha256(f"{cle}|{empreinte}".encode()).hexdigest()[:32] + '"'
+
+    async def entetes(self, db: AsyncSession, cle: str) -> dict:
+        """En-têtes de validation (ETag, Last-Modified) pour la clé donnée"""
+        empreinte, derniere_modif = await self.version(db)
+        entetes = {"ETag": self.etag(cle, empreinte), "Cache-Control": "no-cache"}
+        if derniere_modif is not None:
+            if derniere_modif.tzinfo is None:
+                derniere_modif = derniere_modif.replace(tzinfo=timezone.utc)
+            entetes["Last-Modified"] = format_datetime(derniere_modif.replace(microsecond=0), usegmt=True)
+        return entetes
+
+    @staticmethod
+    def non_modifie(request: Request, entetes: dict) -> bool:
+        """Applique If-None-Match, ou à défaut If-Modified-Since"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            etags = [valeur.strip() for valeur in if_none_match.split(",")]
+            return "*" in etags or entetes["ETag"] in etags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and "Last-Modified" in entetes:
+            try:
+                return parsedate_to_datetime(entetes["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def repondre(
+        self,
+        request: Request,
+        db: AsyncSession,
+        cle: str,
+        calculer: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        Renvoie 304 si le client est à jour, sinon la réponse en cache ou calculée
+
+        `calculer` produit le contenu JSON ; une HTTPException levée (404...)
+        est propagée et n'est pas mise en cache.
+        """
+        entetes = await self.entetes(db, cle)
+        if self.non_modifie(request, entetes):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=entetes)
+
+        corps = self.backend.lire(entetes["ETag"])
+        if corps is None:
+            contenu = await calculer()
+            corps = ReponseORJSON(contenu).body
+            self.backend.ecrire(entetes["ETag"], corps, self.ttl)
+
+        return Response(content=corps, media_type="application/json", headers=entetes)
+
+
+cache_reponses = CacheReponses()
@@ -1,6 +1,12 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
@@ -13,8 +19,172 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL n'est pas défini dans le fichier .env")
 
+
+def _env_bool(nom: str, defaut: bool) -> bool:
+    valeur = os.getenv(nom)
+    if valeur is None:
+        return defaut
+    return valeur.strip().lower() in ("1", "true", "yes", "oui", "on")
+
+
+# Réglages du pool de connexions (surchargeables via .env)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recyclage des connexions avant les coupures côté serveur / pare-feu
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# Timeout des requêtes côté PostgreSQL en millisecondes (0 = pas de limite, par défaut).
+# Il s'appliquerait aussi aux migrations de démarrage, au rafraîchissement complet
+# de f_covid_resume et aux exports en flux (une seule longue requête) : à activer
+# seulement en connaissance de cause
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Taille du cache de requêtes préparées asyncpg, par connexion
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "500"))
+# Journalisation SQL, désactivée par défaut (très coûteuse sur les gros volumes)
+DB_ECHO = _env_bool("DB_ECHO", False)
+
+
+class MetriquesPool:
+    """Compteurs d'utilisation du pool : checkouts, attentes et timeouts"""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        with self._verrou:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connexions_creees = 0
+            self.timeouts = 0
+            self.attente_totale = 0.0
+            self.attente_max = 0.0
+
+    def enregistrer_attente(self, duree: float, timeout: bool = False):
+        with self._verrou:
+            self.attente_totale += duree
+            self.attente_max = max(self.attente_max, duree)
+            if timeout:
+                self.timeouts += 1
+
+    def incrementer(self, compteur: str):
+        with self._verrou:
+            setattr(self, compteur, getattr(self, compteur) + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._verrou:
+            attentes = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connexions_creees": self.connexions_creees,
+                "timeouts": self.timeouts,
+                "attente_totale_secondes": round(self.attente_totale, 6),
+                "attente_moyenne_secondes": round(self.attente_totale / attentes, 6) if attentes else 0.0,
+                "attente_max_secondes": round(self.attente_max, 6),
+            }
+
+
+metriques_pool = MetriquesPool()
+
+
+class PoolMesure(AsyncAdaptedQueuePool):
+    """Pool asynchrone qui mesure le temps d'attente pour obtenir une connexion"""
+
+    def _do_get(self):
+        debut = time.perf_counter()
+        try:
+            connexion = super()._do_get()
+        except Exception:
+            metriques_pool.enregistrer_attente(time.perf_counter() - debut, timeout=True)
+            raise
+        metriques_pool.enregistrer_attente(time.perf_counter() - debut)
+        return connexion
+
+
+def _ecouter_pool(engine: AsyncEngine):
+    """Branche les événements du pool sur les compteurs globaux"""
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _connexion(dbapi_connection, connection_record):
+        metriques_pool.incrementer("connexions_creees")
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metriques_pool.incrementer("checkouts")
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metriques_pool.incrementer("checkins")
+
+
+def options_engine(
+    database_url: str = DATABASE_URL,
+    *,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    prepared_statement_cache_size: int = DB_PREPARED_STATEMENT_CACHE_SIZE,
+    echo: bool = DB_ECHO,
+) -> Tuple[URL, Dict[str, Any]]:
+    """
+    URL et arguments de create_async_engine correspondant aux réglages
+
+    Les options propres à asyncpg (statement_timeout, cache de requêtes
+    préparées) ne sont appliquées que si l'URL utilise ce driver, ce qui
+    permet de réutiliser la fabrique avec aiosqlite pour les tests.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {"echo": echo, "pool_pre_ping": pool_pre_ping}
+    connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=PoolMesure,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        if "prepared_statement_cache_size" not in url.query:
+            url = url.update_query_dict({"prepared_statement_cache_size": str(prepared_statement_cache_size)})
+        if statement_timeout_ms > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return url, options
+
+
+def creer_engine(database_url: str = DATABASE_URL, **reglages) -> AsyncEngine:
+    """Crée l'engine asynchrone avec les réglages de production (voir options_engine)"""
+    url, options = options_engine(database_url, **reglages)
+    nouvel_engine = create_async_engine(url, **options)
+    _ecouter_pool(nouvel_engine)
+    return nouvel_engine
+
+
+def obtenir_metriques_pool(engine_cible: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+    """État instantané du pool et compteurs cumulés depuis le démarrage"""
+    pool = (engine_cible or engine).sync_engine.pool
+    etat: Dict[str, Any] = {"classe": type(pool).__name__}
+    for nom in ("size", "checkedin", "checkedout", "overflow"):
+        methode = getattr(pool, nom, None)
+        if callable(methode):
+            etat[nom] = methode()
+    etat.update(metriques_pool.to_dict())
+    return etat
+
+
 # Créer l'engine SQLAlchemy
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = creer_engine(DATABASE_URL)
 
 # Créer une session asynchrone
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
@@ -25,4 +195,4 @@ Base = declarative_base()
 # Fonction pour récupérer une session DB
 async def get_db():
     async with SessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, List, Sequence
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Date, DateTime, Integer, Numeric, Select
+
+from backend.app.core.database import SessionLocal
+
+# pyarrow est optionnel : sans lui, seul le format arrow est indisponible
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:
+    pa = None
+
+MOTIF_FORMAT_EXPORT = "^(csv|ndjson|arrow)$"
+# Lignes lues par aller-retour du curseur serveur et par lot écrit dans le flux
+TAILLE_LOT_EXPORT = 10000
+
+TYPES_MEDIA = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _valeur_json(valeur: Any) -> Any:
+    if isinstance(valeur, Decimal):
+        return float(valeur)
+    if isinstance(valeur, (date, datetime)):
+        return valeur.isoformat()
+    return valeur
+
+
+def _schema_arrow(colonnes: Sequence):
+    """Schéma Arrow déduit des types SQLAlchemy des colonnes exportées"""
+    champs = []
+    for colonne in colonnes:
+        type_sql = colonne.type
+        if isinstance(type_sql, Integer):
+            type_arrow = pa.int64()
+        elif isinstance(type_sql, Numeric):
+            type_arrow = pa.float64()
+        elif isinstance(type_sql, DateTime):
+            type_arrow = pa.timestamp("us")
+        elif isinstance(type_sql, Date):
+            type_arrow = pa.date32()
+        else:
+            type_arrow = pa.string()
+        champs.append(pa.field(colonne.name, type_arrow))
+    return pa.schema(champs)
+
+
+def _lot_csv(lignes: List[tuple]) -> str:
+    tampon = io.StringIO()
+    csv.writer(tampon).writerows(lignes)
+    return tampon.getvalue()
+
+
+def _lot_ndjson(noms: List[str], lignes: List[tuple]) -> str:
+    return "".join(
+        json.dumps({nom: _valeur_json(valeur) for nom, valeur in zip(noms, ligne)}, separators=(",", ":")) + "\n"
+        for ligne in lignes
+    )
+
+
+def _lot_arrow(schema, lignes: List[tuple]):
+    colonnes = list(zip(*lignes))
+    tableaux = []
+    for champ, valeurs in zip(schema, colonnes):
+        if pa.types.is_floating(champ.type):
+            valeurs = [None if valeur is None else float(valeur) for valeur in valeurs]
+        tableaux.append(pa.array(valeurs, type=champ.type))
+    return pa.RecordBatch.from_arrays(tableaux, schema=schema)
+
+
+def _vider(tampon: io.BytesIO) -> bytes:
+    contenu = tampon.getvalue()
+    tampon.seek(0)
+    tampon.truncate()
+    return contenu
+
+
+async def _flux_export(query: Select, format_export: str) -> AsyncIterator[Any]:
+    """
+    Lit la requête par lots depuis un curseur serveur et émet chaque lot encodé
+
+    Les lignes restent des tuples (requête sur colonnes, pas d'objets ORM) :
+    la mémoire utilisée est bornée par TAILLE_LOT_EXPORT quel que soit le volume.
+    """
+    colonnes = list(query.selected_columns)
+    noms = [colonne.name for colonne in colonnes]
+    schema = _schema_arrow(colonnes) if format_export == "arrow" else None
+
+    async with SessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=TAILLE_LOT_EXPORT))
+
+        if format_export == "csv":
+            yield _lot_csv([noms])
+        elif format_export == "arrow":
+            # Tampon vidé après chaque lot : seul le lot courant reste en mémoire
+            tampon = io.BytesIO()
+            writer = pa.ipc.new_stream(tampon, schema)
+
+        async for lignes in result.partitions(TAILLE_LOT_EXPORT):
+            if format_export == "csv":
+                yield _lot_csv(lignes)
+            elif format_export == "ndjson":
+                yield _lot_ndjson(noms, lignes)
+            else:
+                writer.write_batch(_lot_arrow(schema, lignes))
+                yield _vider(tampon)
+
+        if format_export == "arrow":
+            writer.close()
+            yield _vider(tampon)
+
+
+def reponse_export(query: Select, format_export: str, nom_fichier: str) -> StreamingResponse:
+    """
+    Réponse en flux d'un export CSV, NDJSON ou Arrow IPC (format stream)
+
+    `query` doit sélectionner des colonnes (Table.columns), pas une entité ORM.
+    """
+    if format_export == "arrow" and pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le format arrow nécessite le paquet pyarrow, non installé sur le serveur"
+        )
+
+    extension = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows"}[format_export]
+    return StreamingResponse(
+        _flux_export(query, format_export),
+        media_type=TYPES_MEDIA[format_export],
+        headers={"Content-Disposition": f'attachment; filename="{nom_fichier}.{extension}"'}
+    )
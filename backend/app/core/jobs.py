@@ -0,0 +1,146 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Nombre de threads disponibles pour les traitements lourds des jobs
+JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+# Nombre de jobs terminés conservés pour consultation
+JOBS_HISTORIQUE_MAX = int(os.getenv("JOBS_HISTORIQUE_MAX", "100"))
+
+STATUTS_ACTIFS = ("en_attente", "generation", "sauvegarde")
+
+
+class Job:
+    """Suivi d'un traitement exécuté en arrière-plan"""
+
+    def __init__(self, cle: str):
+        self.job_id = uuid.uuid4().hex
+        self.cle = cle
+        self.statut = "en_attente"
+        self.progression = 0.0
+        self.lignes_ecrites = 0
+        self.lignes_totales: Optional[int] = None
+        self.resultat: Any = None
+        self.erreur: Optional[str] = None
+        self.cree_le = datetime.now()
+        self.termine_le: Optional[datetime] = None
+        self._debut: Optional[float] = None
+
+    @property
+    def actif(self) -> bool:
+        return self.statut in STATUTS_ACTIFS
+
+    @property
+    def eta_secondes(self) -> Optional[float]:
+        """Temps restant estimé à partir du rythme observé depuis le démarrage"""
+        if not self.actif or self._debut is None or self.progression <= 0:
+            return None
+        ecoule = time.monotonic() - self._debut
+        return round(ecoule * (1 - self.progression) / self.progression, 1)
+
+    def mettre_a_jour(
+        self,
+        statut: Optional[str] = None,
+        progression: Optional[float] = None,
+        lignes_ecrites: Optional[int] = None,
+        lignes_totales: Optional[int] = None
+    ):
+        if statut is not None:
+            self.statut = statut
+            if self._debut is None:
+                self._debut = time.monotonic()
+        if progression is not None:
+            self.progression = min(max(progression, 0.0), 1.0)
+        if lignes_ecrites is not None:
+            self.lignes_ecrites = lignes_ecrites
+        if lignes_totales is not None:
+            self.lignes_totales = lignes_totales
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "cle": self.cle,
+            "statut": self.statut,
+            "progression": round(self.progression, 4),
+            "lignes_ecrites": self.lignes_ecrites,
+            "lignes_totales": self.lignes_totales,
+            "eta_secondes": self.eta_secondes,
+            "resultat": self.resultat,
+            "erreur": self.erreur,
+            "cree_le": self.cree_le,
+            "termine_le": self.termine_le,
+        }
+
+
+class GestionnaireJobs:
+    """
+    File de jobs en mémoire, propre au processus
+
+    Les jobs tournent comme tâches asyncio ; leurs parties CPU sont déportées
+    dans un pool de threads via executer_en_thread pour ne pas bloquer la
+    boucle d'événements. Deux soumissions avec la même clé pendant qu'un job
+    est actif renvoient le même job.
+    """
+
+    def __init__(self, max_workers: int = JOBS_MAX_WORKERS, historique_max: int = JOBS_HISTORIQUE_MAX):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        self._historique_max = historique_max
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._jobs_actifs: Dict[str, Job] = {}
+        self._taches = set()
+
+    def soumettre(self, cle: str, traitement: Callable[[Job], Awaitable[Any]]) -> Tuple[Job, bool]:
+        """
+        Lance `traitement(job)` en arrière-plan, sauf si un job actif existe déjà pour `cle`
+
+        Returns:
+            tuple: (job, True si un nouveau job a été créé)
+        """
+        job_existant = self._jobs_actifs.get(cle)
+        if job_existant is not None and job_existant.actif:
+            return job_existant, False
+
+        job = Job(cle)
+        self._jobs[job.job_id] = job
+        self._jobs_actifs[cle] = job
+        self._purger_historique()
+
+        tache = asyncio.create_task(self._executer(job, traitement))
+        self._taches.add(tache)
+        tache.add_done_callback(self._taches.discard)
+        return job, True
+
+    def obtenir(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def executer_en_thread(self, fonction: Callable, *args, **kwargs):
+        """Exécute une fonction bloquante dans le pool de threads des jobs"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fonction, *args, **kwargs))
+
+    async def _executer(self, job: Job, traitement: Callable[[Job], Awaitable[Any]]):
+        try:
+            job.resultat = await traitement(job)
+            job.mettre_a_jour(statut="termine", progression=1.0)
+        except Exception as e:
+            print(f"❌ Job {job.job_id} ({job.cle}) en erreur: {str(e)}")
+            job.erreur = str(e)
+            job.mettre_a_jour(statut="erreur")
+        finally:
+            job.termine_le = datetime.now()
+            if self._jobs_actifs.get(job.cle) is job:
+                del self._jobs_actifs[job.cle]
+
+    def _purger_historique(self):
+        termines = [job_id for job_id, job in self._jobs.items() if not job.actif]
+        for job_id in termines[:max(0, len(self._jobs) - self._historique_max)]:
+            del self._jobs[job_id]
+
+
+gestionnaire_jobs = GestionnaireJobs()
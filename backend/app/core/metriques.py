@@ -0,0 +1,270 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.app.core.database import obtenir_metriques_pool
+
+logger = logging.getLogger(__name__)
+
+# Requêtes SQL journalisées au-delà de ce seuil en millisecondes (0 = désactivé)
+SEUIL_SQL_LENT_MS = float(os.getenv("METRIQUES_SEUIL_SQL_LENT_MS", "0"))
+# Longueur maximale du SQL recopié dans le journal des requêtes lentes
+LONGUEUR_SQL_JOURNAL = 500
+
+BORNES_DUREE = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BORNES_TAILLE = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+BORNES_LIGNES = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+@dataclass
+class MesureRequete:
+    """Temps SQL et lignes cumulés pendant une requête HTTP"""
+    temps_db: float = 0.0
+    nb_requetes_sql: int = 0
+    lignes: int = 0
+
+
+# Mesure de la requête HTTP en cours ; l'objet est partagé (et non copié)
+# avec les tâches filles, ce qui couvre aussi les réponses en flux
+_mesure_courante: ContextVar[Optional[MesureRequete]] = ContextVar("mesure_requete", default=None)
+
+
+class Histogramme:
+    """Histogramme cumulatif par jeu d'étiquettes, au format Prometheus"""
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str], bornes: Sequence[float]):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self.bornes = tuple(bornes)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._verrou = threading.Lock()
+
+    def observer(self, valeurs: Tuple[str, ...], mesure: float):
+        with self._verrou:
+            serie = self._series.get(valeurs)
+            if serie is None:
+                # Un compteur par borne, puis +Inf, somme et nombre d'observations
+                serie = self._series[valeurs] = [0] * (len(self.bornes) + 1) + [0.0, 0]
+            serie[bisect_left(self.bornes, mesure)] += 1
+            serie[-2] += mesure
+            serie[-1] += 1
+
+    def exposer(self) -> List[str]:
+        lignes = [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} histogram"]
+        with self._verrou:
+            series = {valeurs: list(serie) for valeurs, serie in self._series.items()}
+        for valeurs, serie in sorted(series.items()):
+            etiquettes = _etiquettes(self.etiquettes, valeurs)
+            cumul = 0
+            for borne, nombre in zip(list(self.bornes) + ["+Inf"], serie[:-2]):
+                cumul += nombre
+                le = borne if borne == "+Inf" else _nombre(borne)
+                lignes.append(f'{self.nom}_bucket{{{etiquettes}{"," if etiquettes else ""}le="{le}"}} {cumul}')
+            lignes.append(f"{self.nom}_sum{{{etiquettes}}} {_nombre(serie[-2])}")
+            lignes.append(f"{self.nom}_count{{{etiquettes}}} {serie[-1]}")
+        return lignes
+
+
+class Compteur:
+    """Compteur monotone par jeu d'étiquettes"""
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = ()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        # Sans étiquette, la série existe dès le départ (exposée à 0)
+        self._valeurs: Dict[Tuple[str, ...], float] = {} if self.etiquettes else {(): 0}
+        self._verrou = threading.Lock()
+
+    def incrementer(self, valeurs: Tuple[str, ...] = (), pas: float = 1):
+        with self._verrou:
+            self._valeurs[valeurs] = self._valeurs.get(valeurs, 0) + pas
+
+    def exposer(self) -> List[str]:
+        lignes = [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} counter"]
+        with self._verrou:
+            valeurs = dict(self._valeurs)
+        for cle, total in sorted(valeurs.items()):
+            etiquettes = _etiquettes(self.etiquettes, cle)
+            lignes.append(f"{self.nom}{{{etiquettes}}} {_nombre(total)}" if etiquettes else f"{self.nom} {_nombre(total)}")
+        return lignes
+
+
+def _nombre(valeur: float) -> str:
+    return str(int(valeur)) if float(valeur).is_integer() else repr(float(valeur))
+
+
+def _echapper(valeur: str) -> str:
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquettes(noms: Tuple[str, ...], valeurs: Tuple[str, ...]) -> str:
+    return ",".join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in zip(noms, valeurs))
+
+
+class RegistreMetriques:
+    """Métriques HTTP et SQL de l'API, exposées sur /metrics"""
+
+    def __init__(self):
+        self.duree_requete = Histogramme(
+            "api_requete_duree_secondes", "Durée des requêtes HTTP par route",
+            ("methode", "route", "statut"), BORNES_DUREE
+        )
+        self.duree_db = Histogramme(
+            "api_requete_duree_db_secondes", "Temps passé en base par requête HTTP",
+            ("methode", "route"), BORNES_DUREE
+        )
+        self.lignes = Histogramme(
+            "api_requete_lignes_sql", "Lignes renvoyées ou modifiées en base par requête HTTP",
+            ("methode", "route"), BORNES_LIGNES
+        )
+        self.taille_reponse = Histogramme(
+            "api_reponse_taille_octets", "Taille du corps des réponses HTTP",
+            ("methode", "route"), BORNES_TAILLE
+        )
+        self.requetes_sql = Compteur(
+            "api_requetes_sql_total", "Requêtes SQL exécutées pendant les requêtes HTTP", ("methode", "route")
+        )
+        self.requetes_sql_lentes = Compteur(
+            "api_requetes_sql_lentes_total", "Requêtes SQL au-delà de METRIQUES_SEUIL_SQL_LENT_MS"
+        )
+
+    def observer_requete(self, methode: str, route: str, statut: int, duree: float, taille: int, mesure: MesureRequete):
+        self.duree_requete.observer((methode, route, str(statut)), duree)
+        self.duree_db.observer((methode, route), mesure.temps_db)
+        self.lignes.observer((methode, route), mesure.lignes)
+        self.taille_reponse.observer((methode, route), taille)
+        if mesure.nb_requetes_sql:
+            self.requetes_sql.incrementer((methode, route), mesure.nb_requetes_sql)
+
+    def exposer(self) -> str:
+        lignes: List[str] = []
+        for metrique in (
+            self.duree_requete, self.duree_db, self.lignes, self.taille_reponse,
+            self.requetes_sql, self.requetes_sql_lentes
+        ):
+            lignes.extend(metrique.exposer())
+        lignes.extend(_exposer_pool())
+        return "\n".join(lignes) + "\n"
+
+
+def _exposer_pool() -> List[str]:
+    """État du pool (jauges) et compteurs cumulés de obtenir_metriques_pool"""
+    etat = obtenir_metriques_pool()
+    lignes = ["# HELP api_pool_connexions Connexions du pool par état", "# TYPE api_pool_connexions gauge"]
+    for nom in ("size", "checkedin", "checkedout", "overflow"):
+        if nom in etat:
+            lignes.append(f'api_pool_connexions{{etat="{nom}"}} {etat[nom]}')
+    for nom in ("checkouts", "checkins", "connexions_creees", "timeouts"):
+        lignes.append(f"# TYPE api_pool_{nom}_total counter")
+        lignes.append(f"api_pool_{nom}_total {etat[nom]}")
+    lignes.append("# TYPE api_pool_attente_secondes_total counter")
+    lignes.append(f"api_pool_attente_secondes_total {_nombre(etat['attente_totale_secondes'])}")
+    lignes.append("# TYPE api_pool_attente_max_secondes gauge")
+    lignes.append(f"api_pool_attente_max_secondes {_nombre(etat['attente_max_secondes'])}")
+    return lignes
+
+
+registre_metriques = RegistreMetriques()
+
+
+def instrumenter_engine(engine: AsyncEngine, seuil_lent_ms: float = SEUIL_SQL_LENT_MS):
+    """
+    Chronomètre chaque requête SQL de l'engine
+
+    Le temps et les lignes sont ajoutés à la mesure de la requête HTTP en
+    cours. Les lignes proviennent du rowcount du driver : asyncpg le renseigne
+    aussi pour les SELECT, mais pas pour les curseurs serveur (flux, exports).
+    """
+    cible = engine.sync_engine
+    if getattr(cible, "_instrumente_metriques", False):
+        return
+    cible._instrumente_metriques = True
+
+    @event.listens_for(cible, "before_cursor_execute")
+    def _avant(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("debuts_requetes", []).append(time.perf_counter())
+
+    @event.listens_for(cible, "after_cursor_execute")
+    def _apres(conn, cursor, statement, parameters, context, executemany):
+        debuts = conn.info.get("debuts_requetes")
+        if not debuts:
+            return
+        duree = time.perf_counter() - debuts.pop()
+
+        mesure = _mesure_courante.get()
+        if mesure is not None:
+            mesure.temps_db += duree
+            mesure.nb_requetes_sql += 1
+            if cursor is not None and cursor.rowcount > 0:
+                mesure.lignes += cursor.rowcount
+
+        if seuil_lent_ms > 0 and duree * 1000 >= seuil_lent_ms:
+            registre_metriques.requetes_sql_lentes.incrementer()
+            logger.warning(
+                "🐢 Requête SQL lente (%.1f ms): %s",
+                duree * 1000, " ".join(statement.split())[:LONGUEUR_SQL_JOURNAL]
+            )
+
+    @event.listens_for(cible, "handle_error")
+    def _erreur(contexte):
+        # Une requête en échec ne passe pas par after_cursor_execute
+        debuts = contexte.connection.info.get("debuts_requetes") if contexte.connection is not None else None
+        if debuts:
+            debuts.pop()
+
+
+class MiddlewareMetriques:
+    """
+    Middleware ASGI : durée, temps SQL, lignes et taille de réponse par route
+
+    La route est le gabarit FastAPI (ex: /api/covid/{covid_fact_id}) pour
+    garder un nombre de séries borné ; les chemins inconnus sont regroupés.
+    La mesure couvre l'envoi complet du corps, réponses en flux comprises.
+    """
+
+    def __init__(self, app, chemins_exclus: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.chemins_exclus = set(chemins_exclus)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.chemins_exclus:
+            await self.app(scope, receive, send)
+            return
+
+        mesure = MesureRequete()
+        jeton = _mesure_courante.set(mesure)
+        debut = time.perf_counter()
+        statut = 500
+        taille = 0
+
+        async def envoyer(message):
+            nonlocal statut, taille
+            if message["type"] == "http.response.start":
+                statut = message["status"]
+            elif message["type"] == "http.response.body":
+                taille += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, envoyer)
+        finally:
+            _mesure_courante.reset(jeton)
+            route = scope.get("route")
+            registre_metriques.observer_requete(
+                scope["method"],
+                getattr(route, "path", "non_routee"),
+                statut,
+                time.perf_counter() - debut,
+                taille,
+                mesure
+            )
@@ -0,0 +1,73 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.app.core.database import Base
+from backend.app.models import models  # Enregistre les tables sur Base.metadata
+from backend.app.crud.resume_covid import REQUETES_RAFRAICHISSEMENT_COMPLET
+
+# Migrations idempotentes appliquées aux bases créées avant l'ajout des contraintes.
+# Chaque entrée : (description, requête de vérification renvoyant True si déjà appliquée, requêtes)
+MIGRATIONS = [
+    (
+        "Clé unique (location_id, indicateur, date_predite, model_name) sur f_predi_covid",
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'uq_f_predi_covid_prediction'
+        )
+        """,
+        [
+            # Conserver uniquement la prédiction la plus récente de chaque doublon
+            """
+            DELETE FROM f_predi_covid ancienne
+            USING f_predi_covid recente
+            WHERE ancienne.location_id = recente.location_id
+            AND ancienne.indicateur = recente.indicateur
+            AND ancienne.date_predite = recente.date_predite
+            AND ancienne.model_name = recente.model_name
+            AND ancienne.pred_id < recente.pred_id
+            """,
+            """
+            ALTER TABLE f_predi_covid
+            ADD CONSTRAINT uq_f_predi_covid_prediction
+            UNIQUE (location_id, indicateur, date_predite, model_name)
+            """,
+        ],
+    ),
+    (
+        "Remplissage initial du résumé f_covid_resume",
+        """
+        SELECT EXISTS (SELECT 1 FROM f_covid_resume)
+            OR NOT EXISTS (SELECT 1 FROM f_covid)
+        """,
+        [str(requete) for requete in REQUETES_RAFRAICHISSEMENT_COMPLET],
+    ),
+]
+
+def _creer_index_manquants(sync_conn):
+    """
+    Crée les index déclarés sur les modèles qui n'existent pas encore en base
+
+    create_all ne crée les index qu'avec leur table : les tables déjà présentes
+    sont complétées ici (ex: ix_f_predi_covid_location_date_pred, ajouté pour
+    la pagination par curseur des prédictions).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            index.create(sync_conn, checkfirst=True)
+
+async def appliquer_migrations(conn: AsyncConnection):
+    """
+    Applique les migrations manquantes sur une base PostgreSQL existante
+    """
+    # Tables ajoutées depuis la création de la base (create_all ignore les existantes)
+    await conn.run_sync(Base.metadata.create_all)
+
+    for description, verification, requetes in MIGRATIONS:
+        deja_appliquee = (await conn.execute(text(verification))).scalar()
+        if deja_appliquee:
+            continue
+        print(f"🔧 Migration: {description}")
+        for requete in requetes:
+            await conn.execute(text(requete))
+
+    await conn.run_sync(_creer_index_manquants)
@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+import os
+from datetime import date
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, tuple_
+
+from backend.app.core.database import SessionLocal
+
+# Taille maximale d'une page JSON des routes plafonnées (prédictions, plafond
+# historique de 1000) ; au-delà, utiliser format=ndjson
+LIMITE_MAX_PAGE = int(os.getenv("LIMITE_MAX_PAGE", "1000"))
+# Nombre de lignes lues à chaque aller-retour du curseur serveur en mode flux
+TAILLE_LOT_FLUX = 2000
+# En-tête portant le curseur de la page suivante (le corps reste une liste)
+ENTETE_CURSEUR = "X-Next-Cursor"
+
+
+def encoder_curseur(*valeurs: Any) -> str:
+    """Encode la clé (location_id, date, id) de la dernière ligne en jeton opaque"""
+    brut = json.dumps(
+        [valeur.isoformat() if isinstance(valeur, date) else valeur for valeur in valeurs],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(brut.encode()).decode().rstrip("=")
+
+
+def decoder_curseur(curseur: str) -> Tuple[int, date, int]:
+    """
+    Décode un jeton produit par encoder_curseur
+
+    Raises:
+        ValueError: si le jeton est mal formé
+    """
+    try:
+        rembourrage = "=" * (-len(curseur) % 4)
+        location_id, jour, identifiant = json.loads(base64.urlsafe_b64decode(curseur + rembourrage))
+        return int(location_id), date.fromisoformat(jour), int(identifiant)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError("Curseur de pagination invalide") from e
+
+
+def paginer(
+    query: Select,
+    colonnes_cle: Sequence,
+    curseur: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0
+) -> Select:
+    """
+    Trie la requête sur la clé (location_id, date, id) et applique la page demandée
+
+    Avec un curseur, la page commence strictement après la clé encodée
+    (comparaison de tuples, servie par les index (location_id, date)).
+    `skip` n'est conservé que pour compatibilité, sans curseur.
+    """
+    query = query.order_by(*colonnes_cle)
+    if curseur:
+        query = query.where(tuple_(*colonnes_cle) > decoder_curseur(curseur))
+    elif skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def curseur_suivant(lignes: List[Any], limit: Optional[int], cle: Callable[[Any], Tuple]) -> Optional[str]:
+    """Jeton de la page suivante, ou None si la page courante est la dernière"""
+    if limit is None or not lignes or len(lignes) < limit:
+        return None
+    return encoder_curseur(*cle(lignes[-1]))
+
+
+def reponse_ndjson(query: Select, serialiser: Callable[[Any], str]) -> StreamingResponse:
+    """
+    Émet les objets de la requête en NDJSON depuis un curseur serveur
+
+    Le flux est envoyé après la fin des dépendances de la requête : il
+    ouvre donc sa propre session, fermée à la fin de l'itération.
+    """
+    async def flux():
+        async with SessionLocal() as session:
+            result = await session.stream_scalars(query.execution_options(yield_per=TAILLE_LOT_FLUX))
+            async for objet in result:
+                yield serialiser(objet) + "\n"
+
+    return StreamingResponse(flux(), media_type="application/x-ndjson")
@@ -0,0 +1,53 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Float, Numeric, cast
+
+# orjson est optionnel : sans lui, la réponse retombe sur l'encodeur standard
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _par_defaut(valeur: Any) -> Any:
+    if isinstance(valeur, Decimal):
+        return float(valeur)
+    if isinstance(valeur, (date, datetime)):
+        return valeur.isoformat()
+    raise TypeError(f"Type non sérialisable en JSON: {type(valeur).__name__}")
+
+
+class ReponseORJSON(JSONResponse):
+    """
+    Réponse JSON encodée par orjson (dates, datetimes et énumérations natifs)
+
+    Utilisée comme classe de réponse par défaut de l'application et, avec
+    des lignes déjà sous forme de dictionnaires, par les routes de liste.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_par_defaut, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_par_defaut, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def colonnes_schema(modele, schema: Type[BaseModel]) -> List:
+    """
+    Colonnes du modèle correspondant aux champs d'un schéma de lecture
+
+    Les colonnes Numeric sont converties en double precision côté base :
+    le driver renvoie directement des float, sans passer par Decimal.
+    """
+    colonnes = []
+    for nom in schema.model_fields:
+        colonne = modele.__table__.c[nom]
+        if isinstance(colonne.type, Numeric) and not isinstance(colonne.type, Float):
+            colonnes.append(cast(colonne, Float).label(nom))
+        else:
+            colonnes.append(colonne)
+    return colonnes
@@ -0,0 +1,56 @@
+from typing import List, Optional, Sequence
+
+
+def lttb(x: Sequence[float], y: Sequence[Optional[float]], seuil: int) -> List[int]:
+    """
+    Sous-échantillonnage Largest-Triangle-Three-Buckets
+
+    Conserve `seuil` points d'une série en gardant sa forme visuelle : le
+    premier et le dernier point sont toujours gardés, puis dans chaque
+    tranche le point qui forme le plus grand triangle avec le point retenu
+    précédemment et la moyenne de la tranche suivante.
+
+    Args:
+        x: abscisses croissantes (ex: dates en ordinal)
+        y: valeurs (None est traité comme 0 pour le calcul des aires)
+        seuil: nombre de points à conserver (>= 3)
+
+    Returns:
+        list: indices des points retenus, triés
+    """
+    n = len(x)
+    if seuil >= n or seuil < 3:
+        return list(range(n))
+
+    valeurs = [0.0 if v is None else float(v) for v in y]
+    indices = [0]
+    taille_tranche = (n - 2) / (seuil - 2)
+    a = 0
+
+    for i in range(seuil - 2):
+        # Moyenne de la tranche suivante (le dernier point pour la dernière tranche)
+        debut_suivante = int((i + 1) * taille_tranche) + 1
+        fin_suivante = min(int((i + 2) * taille_tranche) + 1, n)
+        if debut_suivante >= fin_suivante:
+            debut_suivante, fin_suivante = n - 1, n
+        nb_suivante = fin_suivante - debut_suivante
+        x_moyen = sum(x[debut_suivante:fin_suivante]) / nb_suivante
+        y_moyen = sum(valeurs[debut_suivante:fin_suivante]) / nb_suivante
+
+        # Point de la tranche courante maximisant l'aire du triangle
+        debut = int(i * taille_tranche) + 1
+        fin = int((i + 1) * taille_tranche) + 1
+        x_a, y_a = x[a], valeurs[a]
+        aire_max = -1.0
+        retenu = debut
+        for j in range(debut, fin):
+            aire = abs((x_a - x_moyen) * (valeurs[j] - y_a) - (x_a - x[j]) * (y_moyen - y_a))
+            if aire > aire_max:
+                aire_max = aire
+                retenu = j
+
+        indices.append(retenu)
+        a = retenu
+
+    indices.append(n - 1)
+    return indices
@@ -1,11 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import List, Optional, Dict, Any
-from sqlalchemy import func, and_
-from datetime import date
-from backend.app.models.models import FCovid, DLocation
-from backend.app.schemas.schemas import FCovidCreate
+from sqlalchemy import func, and_, literal_column
+from datetime import date, datetime
+from backend.app.models.models import FCovid, FCovidResume, DLocation
+from backend.app.schemas.schemas import FCovidCreate, FCovidRead
 from backend.app.crud.location import obtenir_ou_creer_pays
+from backend.app.core.pagination import paginer
+from backend.app.core.reponses import colonnes_schema
+from backend.app.core.series import lttb
+from backend.app.crud.resume_covid import rafraichir_resume_covid
 
 
 async def creer_donnees_covid(db: AsyncSession, covid_data: FCovidCreate) -> FCovid:
@@ -23,6 +27,8 @@ async def creer_donnees_covid(db: AsyncSession, covid_data: FCovidCreate) -> FCo
         people_vaccinated=covid_data.people_vaccinated
     )
     db.add(db_covid)
+    await db.flush()
+    await rafraichir_resume_covid(db, [db_covid.location_id])
     await db.commit()
     await db.refresh(db_covid)
     return db_covid
@@ -61,15 +67,19 @@ async def obtenir_donnees_covid_par_id(db: AsyncSession, covid_fact_id: int) ->
     return result.scalars().first()
 
 
-async def liste_donnees_covid(
-    db: AsyncSession, 
-    skip: int = 0, 
-    limit: int = 100,
+# Clé de tri stable de la pagination par curseur
+COLONNES_CLE_COVID = (FCovid.location_id, FCovid.date, FCovid.covid_fact_id)
+
+
+def construire_requete_donnees_covid(
     location_id: Optional[int] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> List[FCovid]:
-    """Récupérer une liste d'enregistrements COVID avec filtres optionnels"""
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+):
+    """Construire la requête filtrée et paginée (location_id, date, id) sur f_covid"""
     query = select(FCovid)
     
     # Appliquer les filtres si fournis
@@ -84,77 +94,149 @@ async def liste_donnees_covid(
     if filters:
         query = query.where(and_(*filters))
     
-    query = query.offset(skip).limit(limit)
+    return paginer(query, COLONNES_CLE_COVID, curseur=curseur, limit=limit, skip=skip)
+
+
+async def liste_donnees_covid(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[FCovid]:
+    """Récupérer une liste d'enregistrements COVID avec filtres optionnels, triée par (pays, date, id)"""
+    query = construire_requete_donnees_covid(location_id, start_date, end_date, curseur, skip, limit)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+# Colonnes de FCovidRead, lues sans passer par l'ORM
+COLONNES_LECTURE_COVID = colonnes_schema(FCovid, FCovidRead)
+
+
+async def liste_donnees_covid_lignes(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Variante de liste_donnees_covid renvoyant des dictionnaires (colonnes seules, sans objets ORM)"""
+    query = construire_requete_donnees_covid(location_id, start_date, end_date, curseur, skip, limit)
+    result = await db.execute(query.with_only_columns(*COLONNES_LECTURE_COVID))
+    return [dict(ligne) for ligne in result.mappings()]
+
+
 async def obtenir_statistiques_covid(
     db: AsyncSession,
     location_id: Optional[int] = None
 ) -> Dict[str, Any]:
-    """Récupérer des statistiques agrégées sur les données COVID"""
-    # Construit la requête de base
+    """
+    Récupérer des statistiques agrégées sur les données COVID
+
+    Lues dans f_covid_resume (une ligne par pays) : les cumuls sont les
+    dernières valeurs connues de chaque pays, sommées sur les pays demandés.
+    """
     query = select(
-        func.sum(FCovid.total_cases).label("total_cases"),
-        func.sum(FCovid.total_deaths).label("total_deaths"),
-        func.max(FCovid.date).label("latest_date")
+        func.sum(FCovidResume.total_cases).label("total_cases"),
+        func.sum(FCovidResume.total_deaths).label("total_deaths"),
+        func.max(FCovidResume.derniere_date).label("latest_date"),
+        func.sum(FCovidResume.total_vaccinations).label("total_vaccinations"),
+        func.sum(FCovidResume.people_vaccinated).label("people_vaccinated"),
+        func.sum(FCovidResume.somme_new_cases).label("somme_new_cases"),
+        func.sum(FCovidResume.somme_new_deaths).label("somme_new_deaths"),
+        func.max(FCovidResume.pic_new_cases).label("pic_new_cases"),
+        func.max(FCovidResume.pic_new_deaths).label("pic_new_deaths"),
+        func.count(FCovidResume.location_id).label("nb_pays")
     )
     
     # Ajouter le filtre de location si fourni
     if location_id:
-        query = query.where(FCovid.location_id == location_id)
+        query = query.where(FCovidResume.location_id == location_id)
     
     result = await db.execute(query)
     stats = result.fetchone()
     
-    # Récupérer les statistiques de vaccination les plus récentes
-    vax_query = select(
-        func.sum(FCovid.total_vaccinations).label("total_vaccinations"),
-        func.sum(FCovid.people_vaccinated).label("people_vaccinated")
-    )
-    
-    if location_id:
-        vax_query = vax_query.where(FCovid.location_id == location_id)
-    
-    vax_result = await db.execute(vax_query)
-    vax_stats = vax_result.fetchone()
-    
-    # Combiner tous les résultats
     return {
         "total_cases": stats.total_cases if stats else 0,
         "total_deaths": stats.total_deaths if stats else 0,
         "latest_date": stats.latest_date if stats else None,
-        "total_vaccinations": vax_stats.total_vaccinations if vax_stats else 0,
-        "people_vaccinated": vax_stats.people_vaccinated if vax_stats else 0
+        "total_vaccinations": stats.total_vaccinations if stats else 0,
+        "people_vaccinated": stats.people_vaccinated if stats else 0,
+        "somme_new_cases": stats.somme_new_cases if stats else 0,
+        "somme_new_deaths": stats.somme_new_deaths if stats else 0,
+        "pic_new_cases": stats.pic_new_cases if stats else None,
+        "pic_new_deaths": stats.pic_new_deaths if stats else None,
+        "nb_pays": stats.nb_pays if stats else 0
     }
 
 
+# Agrégation d'une métrique sur une période : somme pour les flux, maximum
+# pour les cumuls, moyenne pour les taux d'occupation
+AGREGATS_METRIQUES = {
+    "new_cases": func.sum,
+    "new_deaths": func.sum,
+    "total_cases": func.max,
+    "total_deaths": func.max,
+    "total_vaccinations": func.max,
+    "people_vaccinated": func.max,
+    "icu_patients": func.avg,
+    "hosp_patients": func.avg,
+}
+
+GRANULARITES = {"jour": None, "semaine": "week", "mois": "month"}
+
+
 async def obtenir_evolution_temporelle_covid(
     db: AsyncSession,
     location_id: Optional[int] = None,
     metric: str = "total_cases",
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    granularite: str = "jour",
+    fenetre: Optional[int] = None,
+    points_max: Optional[int] = None
 ) -> List[Dict[str, Any]]:
-    """Récupérer une série temporelle pour une métrique spécifique"""
+    """
+    Récupérer une série temporelle pour une métrique spécifique
+
+    Le regroupement par semaine ou par mois (date_trunc) et la moyenne
+    glissante sur `fenetre` périodes sont calculés par la base. Avec
+    `points_max`, chaque pays est ensuite réduit à ce nombre de points par LTTB.
+    """
     # Vérifier que la métrique est valide
     valid_metrics = ["total_cases", "new_cases", "total_deaths", "new_deaths", 
                     "icu_patients", "hosp_patients", "total_vaccinations", "people_vaccinated"]
     
     if metric not in valid_metrics:
         raise ValueError(f"Métrique invalide. Doit être l'une de: {', '.join(valid_metrics)}")
+    if granularite not in GRANULARITES:
+        raise ValueError(f"Granularité invalide. Doit être l'une de: {', '.join(GRANULARITES)}")
     
+    colonne = getattr(FCovid, metric)
+    if GRANULARITES[granularite] is None:
+        periode = FCovid.date
+        valeur = colonne
+    else:
+        # Unité en littéral SQL (valeur issue de GRANULARITES) : l'expression du
+        # SELECT et celle du GROUP BY restent identiques pour PostgreSQL
+        periode = func.date_trunc(literal_column(f"'{GRANULARITES[granularite]}'"), FCovid.date)
+        valeur = AGREGATS_METRIQUES[metric](colonne)
+
     # Construction de la requête de base
     query = select(
-        FCovid.date,
+        periode.label("date"),
         FCovid.location_id,
-        getattr(FCovid, metric).label("value")
+        DLocation.location_name,
+        valeur.label("value")
     )
     
     # Joindre avec la table de location pour obtenir les noms
     query = query.join(DLocation, FCovid.location_id == DLocation.location_id)
-    query = query.add_columns(DLocation.location_name)
     
     # Appliquer les filtres
     filters = []
@@ -167,17 +249,38 @@ async def obtenir_evolution_temporelle_covid(
     
     if filters:
         query = query.where(and_(*filters))
-    
-    # Ordonner par date
-    query = query.order_by(FCovid.date)
+
+    if GRANULARITES[granularite] is not None:
+        query = query.group_by(periode, FCovid.location_id, DLocation.location_name)
+
+    # Moyenne glissante par pays, calculée sur la série déjà agrégée
+    if fenetre and fenetre > 1:
+        serie = query.subquery()
+        query = select(
+            serie.c.date,
+            serie.c.location_id,
+            serie.c.location_name,
+            func.avg(serie.c.value).over(
+                partition_by=serie.c.location_id,
+                order_by=serie.c.date,
+                rows=(-(fenetre - 1), 0)
+            ).label("value")
+        )
+        query = query.order_by(serie.c.date, serie.c.location_id)
+    else:
+        # Ordonner par date
+        query = query.order_by(periode, FCovid.location_id)
     
     result = await db.execute(query)
     rows = result.fetchall()
+
+    if points_max:
+        rows = _sous_echantillonner(rows, points_max)
     
     # Formatage des résultats
     return [
         {
-            "date": row.date.isoformat(),
+            "date": (row.date.date() if isinstance(row.date, datetime) else row.date).isoformat(),
             "location_id": row.location_id,
             "location_name": row.location_name,
             "value": float(row.value) if row.value is not None else None,
@@ -187,13 +290,32 @@ async def obtenir_evolution_temporelle_covid(
     ]
 
 
+def _sous_echantillonner(rows, points_max: int):
+    """Applique LTTB pays par pays puis restitue l'ordre (date, pays)"""
+    par_pays: Dict[int, list] = {}
+    for row in rows:
+        par_pays.setdefault(row.location_id, []).append(row)
+
+    conserves = []
+    for lignes in par_pays.values():
+        abscisses = [row.date.toordinal() for row in lignes]
+        indices = lttb(abscisses, [row.value for row in lignes], points_max)
+        conserves.extend(lignes[i] for i in indices)
+
+    conserves.sort(key=lambda row: (row.date, row.location_id))
+    return conserves
+
+
 async def supprimer_donnees_covid(db: AsyncSession, covid_fact_id: int) -> bool:
     """Supprimer un enregistrement COVID par son ID"""
     db_covid = await obtenir_donnees_covid_par_id(db, covid_fact_id)
     if db_covid is None:
         return False
     
-    db.delete(db_covid)
+    location_id = db_covid.location_id
+    await db.delete(db_covid)
+    await db.flush()
+    await rafraichir_resume_covid(db, [location_id])
     await db.commit()
     return True
 
@@ -210,6 +332,7 @@ async def mettre_a_jour_donnees_covid(
         return None
     
     # Mettre à jour les attributs
+    ancienne_location_id = db_covid.location_id
     db_covid.date = covid_data.date
     db_covid.location_id = covid_data.location_id
     db_covid.total_cases = covid_data.total_cases
@@ -222,6 +345,8 @@ async def mettre_a_jour_donnees_covid(
     db_covid.people_vaccinated = covid_data.people_vaccinated
     
     # Persister les modifications
+    await db.flush()
+    await rafraichir_resume_covid(db, [ancienne_location_id, db_covid.location_id])
     await db.commit()
     await db.refresh(db_covid)
     return db_covid
@@ -1,10 +1,96 @@
+import asyncio
+import os
+import time
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from backend.app.models.models import DLocation
 from backend.app.schemas.schemas import DLocationCreate
 
+# Durée de vie du cache en secondes : borne le décalage entre workers uvicorn,
+# chaque processus ne voyant que ses propres invalidations (0 = pas d'expiration)
+LOCATION_CACHE_TTL = float(os.getenv("LOCATION_CACHE_TTL", "300"))
+
+
+class CacheLocalisations:
+    """
+    Cache en lecture de la dimension d_location, partagé par le processus
+
+    La table entière (quelques centaines de lignes) est chargée au premier
+    accès puis indexée par identifiant et par nom. Les objets renvoyés sont
+    des DLocation détachés de toute session : ils ne doivent servir qu'en
+    lecture. Un nom ou un identifiant absent déclenche une requête ciblée
+    pour prendre en compte les pays créés par un autre processus.
+    """
+
+    def __init__(self, ttl: float = LOCATION_CACHE_TTL):
+        self.ttl = ttl
+        self._par_id: Dict[int, DLocation] = {}
+        self._par_nom: Dict[str, int] = {}
+        self._charge_le: Optional[float] = None
+        self._verrou = asyncio.Lock()
+
+    @staticmethod
+    def _copie(location: DLocation) -> DLocation:
+        return DLocation(location_id=location.location_id, location_name=location.location_name)
+
+    def _perime(self) -> bool:
+        if self._charge_le is None:
+            return True
+        return self.ttl > 0 and time.monotonic() - self._charge_le > self.ttl
+
+    def _ajouter(self, location: DLocation) -> DLocation:
+        copie = self._copie(location)
+        self._par_id[copie.location_id] = copie
+        self._par_nom[copie.location_name] = copie.location_id
+        return copie
+
+    async def _charger(self, db: AsyncSession):
+        if not self._perime():
+            return
+        async with self._verrou:
+            if not self._perime():
+                return
+            result = await db.execute(select(DLocation.location_id, DLocation.location_name))
+            self._par_id = {
+                location_id: DLocation(location_id=location_id, location_name=location_name)
+                for location_id, location_name in result.all()
+            }
+            self._par_nom = {location.location_name: location_id for location_id, location in self._par_id.items()}
+            self._charge_le = time.monotonic()
+
+    async def par_id(self, db: AsyncSession, location_id: int) -> Optional[DLocation]:
+        await self._charger(db)
+        location = self._par_id.get(location_id)
+        if location is None:
+            result = await db.execute(select(DLocation).where(DLocation.location_id == location_id))
+            trouve = result.scalar_one_or_none()
+            if trouve is not None:
+                location = self._ajouter(trouve)
+        return location
+
+    async def par_nom(self, db: AsyncSession, location_name: str) -> Optional[DLocation]:
+        await self._charger(db)
+        location_id = self._par_nom.get(location_name)
+        if location_id is not None:
+            return self._par_id[location_id]
+        result = await db.execute(select(DLocation).where(DLocation.location_name == location_name))
+        trouve = result.scalar_one_or_none()
+        return self._ajouter(trouve) if trouve is not None else None
+
+    async def tous(self, db: AsyncSession) -> List[DLocation]:
+        await self._charger(db)
+        return [self._par_id[location_id] for location_id in sorted(self._par_id)]
+
+    def invalider(self):
+        """Force le rechargement complet au prochain accès"""
+        self._charge_le = None
+
+
+cache_localisations = CacheLocalisations()
+
+
 async def creer_pays(
     db: AsyncSession,
     location: DLocationCreate
@@ -16,6 +102,7 @@ async def creer_pays(
     db.add(db_location)
     await db.commit()
     await db.refresh(db_location)
+    cache_localisations.invalider()
     return db_location
 
 async def obtenir_pays_par_id(
@@ -23,22 +110,18 @@ async def obtenir_pays_par_id(
     location_id: int
 ) -> Optional[DLocation]:
     """
-    Récupère un pays par son ID
+    Récupère un pays par son ID (depuis le cache de la dimension)
     """
-    query = select(DLocation).where(DLocation.location_id == location_id)
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    return await cache_localisations.par_id(db, location_id)
 
 async def obtenir_pays_par_nom(
     db: AsyncSession,
     location_name: str
 ) -> Optional[DLocation]:
     """
-    Récupère un pays par son nom
+    Récupère un pays par son nom (depuis le cache de la dimension)
     """
-    query = select(DLocation).where(DLocation.location_name == location_name)
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    return await cache_localisations.par_nom(db, location_name)
 
 async def liste_pays(
     db: AsyncSession,
@@ -46,11 +129,10 @@ async def liste_pays(
     limit: int = 100
 ) -> List[DLocation]:
     """
-    Récupère la liste des pays
+    Récupère la liste des pays, triée par identifiant
     """
-    query = select(DLocation).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    locations = await cache_localisations.tous(db)
+    return locations[skip:skip + limit]
 
 async def obtenir_ou_creer_pays(
     db: AsyncSession,
@@ -67,12 +149,15 @@ async def obtenir_ou_creer_pays(
 
 async def supprimer_pays(db: AsyncSession, location_id: int) -> bool:
     """Supprimer un pays par son ID"""
-    db_location = await obtenir_pays_par_id(db, location_id)
+    # Lecture directe : la suppression a besoin d'une instance attachée à la session
+    result = await db.execute(select(DLocation).where(DLocation.location_id == location_id))
+    db_location = result.scalar_one_or_none()
     if db_location is None:
         return False
-    
-    db.delete(db_location)
+
+    await db.delete(db_location)
     await db.commit()
+    cache_localisations.invalider()
     return True
 
 
@@ -1,10 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy import and_
 from datetime import date
 from backend.app.models.models import FMpox
-from backend.app.schemas.schemas import FMpoxCreate
+from backend.app.schemas.schemas import FMpoxCreate, FMpoxRead
+from backend.app.core.pagination import paginer
+from backend.app.core.reponses import colonnes_schema
 
 async def creer_donnees_mpox(db: AsyncSession, mpox_data: FMpoxCreate) -> FMpox:
     db_mpox = FMpox(
@@ -21,14 +23,17 @@ async def obtenir_donnees_mpox_par_id(db: AsyncSession, mpox_fact_id: int) -> Op
     result = await db.execute(select(FMpox).where(FMpox.mpox_fact_id == mpox_fact_id))
     return result.scalars().first()
 
-async def liste_donnees_mpox(
-    db: AsyncSession, 
-    skip: int = 0, 
-    limit: int = 100,
+# Clé de tri stable de la pagination par curseur
+COLONNES_CLE_MPOX = (FMpox.location_id, FMpox.date, FMpox.mpox_fact_id)
+
+def construire_requete_donnees_mpox(
     location_id: Optional[int] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> List[FMpox]:
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+):
     query = select(FMpox)
     filters = []
     if location_id:
@@ -39,10 +44,37 @@ async def liste_donnees_mpox(
         filters.append(FMpox.date <= end_date)
     if filters:
         query = query.where(and_(*filters))
-    query = query.offset(skip).limit(limit)
+    return paginer(query, COLONNES_CLE_MPOX, curseur=curseur, limit=limit, skip=skip)
+
+async def liste_donnees_mpox(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[FMpox]:
+    query = construire_requete_donnees_mpox(location_id, start_date, end_date, curseur, skip, limit)
     result = await db.execute(query)
     return result.scalars().all()
 
+# Colonnes de FMpoxRead, lues sans passer par l'ORM
+COLONNES_LECTURE_MPOX = colonnes_schema(FMpox, FMpoxRead)
+
+async def liste_donnees_mpox_lignes(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    query = construire_requete_donnees_mpox(location_id, start_date, end_date, curseur, skip, limit)
+    result = await db.execute(query.with_only_columns(*COLONNES_LECTURE_MPOX))
+    return [dict(ligne) for ligne in result.mappings()]
+
 async def mettre_a_jour_donnees_mpox(db: AsyncSession, mpox_fact_id: int, mpox_data: FMpoxCreate) -> Optional[FMpox]:
     db_mpox = await obtenir_donnees_mpox_par_id(db, mpox_fact_id)
     if db_mpox is None:
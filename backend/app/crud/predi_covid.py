@@ -1,22 +1,49 @@
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, and_, func, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Callable
 from datetime import date
 
-from backend.app.models.models import FPrediCovid
-from backend.app.schemas.schemas import FPrediCovidCreate
+from backend.app.models.models import FPrediCovid, DLocation
+from backend.app.core.cache import cache_reponses
+from backend.app.core.pagination import paginer
+from backend.app.core.reponses import colonnes_schema
+from backend.app.crud.location import cache_localisations
+from backend.app.schemas.schemas import FPrediCovidCreate, FPrediCovidRead
 
-async def liste_predictions_covid(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+# Nombre de lignes envoyées par INSERT multi-lignes lors des insertions en masse
+TAILLE_LOT_INSERTION = 5000
+
+# Correspondance entre les clés produites par generate_predictions et les indicateurs
+INDICATEURS_GENERES = [
+    ("new_cases", "new_cases_pred"),
+    ("new_deaths", "new_deaths_pred"),
+    ("countries_reporting", "countries_reporting_pred"),
+]
+
+# Noms de modèle des deux modes de génération : une génération récursive ne
+# remplace pas les prédictions directes de la même année (uq_f_predi_covid_prediction)
+MODELE_DIRECT = "RF_XGB_Ensemble"
+MODELE_RECURSIF = "RF_XGB_Ensemble_recursif"
+
+def nom_modele(recursif: bool = False) -> str:
+    """Nom de modèle sous lequel sont stockées (et lues) les prédictions d'un mode"""
+    return MODELE_RECURSIF if recursif else MODELE_DIRECT
+
+# Clé de tri stable de la pagination par curseur
+COLONNES_CLE_PREDICTIONS = (FPrediCovid.location_id, FPrediCovid.date_predite, FPrediCovid.pred_id)
+
+def construire_requete_predictions_covid(
     location_id: Optional[int] = None,
     indicateur: Optional[str] = None,
     date_debut: Optional[date] = None,
-    date_fin: Optional[date] = None
-) -> List[FPrediCovid]:
+    date_fin: Optional[date] = None,
+    curseur: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+):
     """
-    Récupère la liste des prédictions avec filtres optionnels
+    Construit la requête filtrée et paginée (location_id, date_predite, pred_id)
     """
     query = select(FPrediCovid)
     
@@ -38,11 +65,87 @@ async def liste_predictions_covid(
     if conditions:
         query = query.where(and_(*conditions))
     
-    query = query.offset(skip).limit(limit)
-    
+    return paginer(query, COLONNES_CLE_PREDICTIONS, curseur=curseur, limit=limit, skip=skip)
+
+async def liste_predictions_covid(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    indicateur: Optional[str] = None,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[FPrediCovid]:
+    """
+    Récupère la liste des prédictions avec filtres optionnels, triée par (pays, date, id)
+    """
+    query = construire_requete_predictions_covid(
+        location_id, indicateur, date_debut, date_fin, curseur, skip, limit
+    )
     result = await db.execute(query)
     return result.scalars().all()
 
+# Colonnes de FPrediCovidRead, lues sans passer par l'ORM
+COLONNES_LECTURE_PREDICTIONS = colonnes_schema(FPrediCovid, FPrediCovidRead)
+
+async def liste_predictions_covid_lignes(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    location_id: Optional[int] = None,
+    indicateur: Optional[str] = None,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None,
+    curseur: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Variante de liste_predictions_covid renvoyant des dictionnaires (colonnes seules, sans objets ORM)
+    """
+    query = construire_requete_predictions_covid(
+        location_id, indicateur, date_debut, date_fin, curseur, skip, limit
+    )
+    result = await db.execute(query.with_only_columns(*COLONNES_LECTURE_PREDICTIONS))
+    return [dict(ligne) for ligne in result.mappings()]
+
+async def liste_predictions_covid_par_pays(
+    db: AsyncSession,
+    location_ids: List[int],
+    indicateur: str,
+    date_debut: Optional[date] = None,
+    date_fin: Optional[date] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Récupère en une seule requête les prédictions de plusieurs pays, groupées par location_id
+
+    Les lignes sont renvoyées sous forme de dictionnaires (colonnes de
+    FPrediCovidRead), sans objets ORM.
+
+    Les identifiants sont passés comme un unique paramètre tableau
+    (location_id = ANY(:location_ids)) : la requête préparée reste la même
+    quel que soit le nombre de pays demandés.
+    """
+    conditions = [
+        FPrediCovid.location_id == any_(bindparam("location_ids", value=list(location_ids), type_=ARRAY(Integer))),
+        FPrediCovid.indicateur == indicateur
+    ]
+    if date_debut is not None:
+        conditions.append(FPrediCovid.date_predite >= date_debut)
+    if date_fin is not None:
+        conditions.append(FPrediCovid.date_predite <= date_fin)
+
+    query = (
+        select(*COLONNES_LECTURE_PREDICTIONS)
+        .where(and_(*conditions))
+        .order_by(FPrediCovid.location_id, FPrediCovid.date_predite)
+    )
+    result = await db.execute(query)
+
+    predictions_par_pays: Dict[int, List[Dict[str, Any]]] = {location_id: [] for location_id in location_ids}
+    for prediction in result.mappings():
+        predictions_par_pays[prediction["location_id"]].append(dict(prediction))
+    return predictions_par_pays
+
 async def obtenir_prediction_covid_par_id(
     db: AsyncSession,
     pred_id: int
@@ -65,8 +168,95 @@ async def creer_prediction_covid(
     db.add(db_prediction)
     await db.commit()
     await db.refresh(db_prediction)
+    cache_reponses.invalider()
     return db_prediction
 
+async def creer_predictions_covid_en_masse(
+    db: AsyncSession,
+    predictions: List[Dict[str, Any]],
+    model_name: str,
+    taille_lot: int = TAILLE_LOT_INSERTION,
+    progression: Optional[Callable[[int], None]] = None
+) -> Dict[str, int]:
+    """
+    Enregistre en masse les prédictions produites par generate_predictions
+
+    Toutes les localisations sont résolues en une requête (les pays manquants
+    sont créés en une seule insertion), puis les prédictions sont écrites par
+    lots d'INSERT ... ON CONFLICT DO UPDATE dans une seule transaction : une
+    régénération remplace les prédictions existantes au lieu de les dupliquer.
+    `progression` est appelée avec le nombre de lignes écrites après chaque lot.
+    """
+    noms_pays = sorted({pred["location"] for pred in predictions})
+
+    try:
+        # 1. Résoudre toutes les localisations en une seule requête
+        result = await db.execute(
+            select(DLocation.location_name, DLocation.location_id)
+            .where(DLocation.location_name.in_(noms_pays))
+        )
+        ids_pays = dict(result.all())
+
+        pays_manquants = [nom for nom in noms_pays if nom not in ids_pays]
+        if pays_manquants:
+            result = await db.execute(
+                insert(DLocation)
+                .values([{"location_name": nom} for nom in pays_manquants])
+                .returning(DLocation.location_name, DLocation.location_id)
+            )
+            ids_pays.update(result.all())
+
+        # 2. Upsert des prédictions par lots, sans passer par l'ORM
+        upsert = pg_insert(FPrediCovid)
+        upsert = upsert.on_conflict_do_update(
+            constraint='uq_f_predi_covid_prediction',
+            set_={
+                "valeur_predite": upsert.excluded.valeur_predite,
+                "date_generation": func.now(),
+                "updated_at": func.now()
+            }
+        )
+
+        lot = []
+        lignes_inserees = 0
+        for pred in predictions:
+            location_id = ids_pays[pred["location"]]
+            for indicateur, cle in INDICATEURS_GENERES:
+                lot.append({
+                    "date_predite": pred["date"],
+                    "location_id": location_id,
+                    "indicateur": indicateur,
+                    "valeur_predite": float(pred[cle]),
+                    "model_name": model_name
+                })
+            if len(lot) >= taille_lot:
+                await db.execute(upsert, lot)
+                lignes_inserees += len(lot)
+                lot = []
+                if progression is not None:
+                    progression(lignes_inserees)
+
+        if lot:
+            await db.execute(upsert, lot)
+            lignes_inserees += len(lot)
+            if progression is not None:
+                progression(lignes_inserees)
+
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    cache_reponses.invalider()
+    if pays_manquants:
+        cache_localisations.invalider()
+
+    return {
+        "lignes_inserees": lignes_inserees,
+        "pays": len(noms_pays),
+        "pays_crees": len(pays_manquants)
+    }
+
 async def supprimer_prediction_covid(
     db: AsyncSession,
     pred_id: int
@@ -80,4 +270,5 @@ async def supprimer_prediction_covid(
     
     await db.delete(prediction)
     await db.commit()
+    cache_reponses.invalider()
     return True
\ No newline at end of file
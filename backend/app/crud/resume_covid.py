@@ -0,0 +1,92 @@
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Tuple
+
+# Colonnes de f_covid_resume et leur calcul à partir de f_covid (PostgreSQL)
+AGREGATS_RESUME = [
+    ("premiere_date", "MIN(date)"),
+    ("derniere_date", "MAX(date)"),
+    ("nb_jours", "COUNT(*)"),
+    ("total_cases", "(ARRAY_AGG(total_cases ORDER BY date DESC) FILTER (WHERE total_cases IS NOT NULL))[1]"),
+    ("total_deaths", "(ARRAY_AGG(total_deaths ORDER BY date DESC) FILTER (WHERE total_deaths IS NOT NULL))[1]"),
+    ("total_vaccinations", "(ARRAY_AGG(total_vaccinations ORDER BY date DESC) FILTER (WHERE total_vaccinations IS NOT NULL))[1]"),
+    ("people_vaccinated", "(ARRAY_AGG(people_vaccinated ORDER BY date DESC) FILTER (WHERE people_vaccinated IS NOT NULL))[1]"),
+    ("somme_new_cases", "SUM(new_cases)"),
+    ("somme_new_deaths", "SUM(new_deaths)"),
+    ("pic_new_cases", "MAX(new_cases)"),
+    ("date_pic_new_cases", "(ARRAY_AGG(date ORDER BY new_cases DESC, date) FILTER (WHERE new_cases IS NOT NULL))[1]"),
+    ("pic_new_deaths", "MAX(new_deaths)"),
+    ("date_pic_new_deaths", "(ARRAY_AGG(date ORDER BY new_deaths DESC, date) FILTER (WHERE new_deaths IS NOT NULL))[1]"),
+    ("pic_icu_patients", "MAX(icu_patients)"),
+    ("pic_hosp_patients", "MAX(hosp_patients)"),
+]
+
+
+def _requete_upsert(filtre: str) -> str:
+    colonnes = ", ".join(nom for nom, _ in AGREGATS_RESUME)
+    calculs = ",\n            ".join(f"{calcul} AS {nom}" for nom, calcul in AGREGATS_RESUME)
+    mises_a_jour = ",\n            ".join(f"{nom} = EXCLUDED.{nom}" for nom, _ in AGREGATS_RESUME)
+    return f"""
+        INSERT INTO f_covid_resume (location_id, {colonnes}, mis_a_jour_le)
+        SELECT
+            location_id,
+            {calculs},
+            NOW()
+        FROM f_covid
+        {filtre}
+        GROUP BY location_id
+        ON CONFLICT (location_id) DO UPDATE SET
+            {mises_a_jour},
+            mis_a_jour_le = NOW()
+    """
+
+
+_PARAM_IDS = bindparam("location_ids", type_=ARRAY(Integer))
+
+# Rafraîchissement limité aux pays touchés par un chargement
+REQUETES_RAFRAICHISSEMENT_PARTIEL = [
+    text("""
+        DELETE FROM f_covid_resume r
+        WHERE r.location_id = ANY(:location_ids)
+        AND NOT EXISTS (SELECT 1 FROM f_covid f WHERE f.location_id = r.location_id)
+    """).bindparams(_PARAM_IDS),
+    text(_requete_upsert("WHERE location_id = ANY(:location_ids)")).bindparams(_PARAM_IDS),
+]
+
+# Reconstruction complète
+REQUETES_RAFRAICHISSEMENT_COMPLET = [
+    text("""
+        DELETE FROM f_covid_resume r
+        WHERE NOT EXISTS (SELECT 1 FROM f_covid f WHERE f.location_id = r.location_id)
+    """),
+    text(_requete_upsert("")),
+]
+
+
+def requetes_rafraichissement(location_ids: Optional[Iterable[int]] = None) -> List[Tuple[object, dict]]:
+    """
+    Requêtes (et paramètres) qui remettent f_covid_resume en phase avec f_covid
+
+    Avec `location_ids`, seuls ces pays sont recalculés : le coût est
+    proportionnel aux lignes de ces pays, pas à la table entière.
+    """
+    if location_ids is None:
+        return [(requete, {}) for requete in REQUETES_RAFRAICHISSEMENT_COMPLET]
+    ids = sorted({int(location_id) for location_id in location_ids})
+    if not ids:
+        return []
+    return [(requete, {"location_ids": ids}) for requete in REQUETES_RAFRAICHISSEMENT_PARTIEL]
+
+
+def rafraichir_resume_covid_sync(db: Session, location_ids: Optional[Iterable[int]] = None):
+    """Version synchrone (scripts d'import) ; le commit reste à la charge de l'appelant"""
+    for requete, parametres in requetes_rafraichissement(location_ids):
+        db.execute(requete, parametres)
+
+
+async def rafraichir_resume_covid(db: AsyncSession, location_ids: Optional[Iterable[int]] = None):
+    """Version asynchrone (API) ; le commit reste à la charge de l'appelant"""
+    for requete, parametres in requetes_rafraichissement(location_ids):
+        await db.execute(requete, parametres)
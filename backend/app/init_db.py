@@ -3,12 +3,15 @@ sys.stdout.reconfigure(encoding='utf-8')
 
 import asyncio
 from backend.app.core.database import Base, engine
+from backend.app.core.migrations import appliquer_migrations
 from backend.app.models import models 
 
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         print("✅ Création des tables terminée.")
+        await appliquer_migrations(conn)
+        print("✅ Migrations appliquées.")
 
 if __name__ == "__main__":
     try:
@@ -1,11 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from backend.app.api.api import api_router
+from backend.app.core.database import engine, obtenir_metriques_pool
+from backend.app.core.pagination import ENTETE_CURSEUR
+from backend.app.core.metriques import MiddlewareMetriques, instrumenter_engine, registre_metriques
+from backend.app.core.reponses import ReponseORJSON
 
 app = FastAPI(
     title="API COVID-19 & Mpox",
     description="API pour accéder aux données COVID-19 et Mpox - Projet MSPR Data Science",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ReponseORJSON
 )
 
 # Configuration CORS pour le développement
@@ -15,8 +21,13 @@ app.add_middleware(
     allow_credentials=False,  # Doit être False quand allow_origins=["*"]
     allow_methods=["*"],  # Permet toutes les méthodes
     allow_headers=["*"],  # Permet tous les headers
+    expose_headers=[ENTETE_CURSEUR, "ETag", "Last-Modified"],  # Lisibles depuis le navigateur (curseur de pagination)
 )
 
+# Latence par route, temps SQL, lignes et taille des réponses (exposés sur /metrics)
+app.add_middleware(MiddlewareMetriques)
+instrumenter_engine(engine)
+
 # Page d'accueil
 @app.get("/")
 async def accueil():
@@ -29,3 +40,13 @@ async def accueil():
 
 # Inclusion des routes de l'API
 app.include_router(api_router, prefix="/api")
+
+# État du pool de connexions, utile pour ajuster DB_POOL_SIZE au nombre de workers uvicorn
+@app.get("/sante/pool")
+async def etat_pool():
+    return obtenir_metriques_pool()
+
+# Métriques au format Prometheus (requêtes HTTP, SQL et pool de connexions)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metriques():
+    return PlainTextResponse(registre_metriques.exposer(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Date, DateTime, Numeric, ForeignKey, func
+    Column, Integer, String, Date, DateTime, Numeric, ForeignKey, Index, UniqueConstraint, func
 )
 from backend.app.core.database import Base
 
@@ -13,6 +13,10 @@ class DLocation(Base):
 class FCovid(Base):
     """Table de faits principale pour les données COVID"""
     __tablename__ = 'f_covid'
+    __table_args__ = (
+        # Filtres par pays et période
+        Index('ix_f_covid_location_date', 'location_id', 'date'),
+    )
     
     covid_fact_id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date, nullable=False)  # Format: YYYY-MM-DD
@@ -37,9 +41,43 @@ class FCovid(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+class FCovidResume(Base):
+    """Résumé précalculé de f_covid par pays, rafraîchi à chaque chargement"""
+    __tablename__ = 'f_covid_resume'
+
+    location_id = Column(Integer, ForeignKey('d_location.location_id'), primary_key=True)
+    premiere_date = Column(Date)
+    derniere_date = Column(Date)
+    nb_jours = Column(Integer)
+
+    # Dernières valeurs cumulées connues (non nulles)
+    total_cases = Column(Numeric(15, 2))
+    total_deaths = Column(Numeric(15, 2))
+    total_vaccinations = Column(Numeric(15, 2))
+    people_vaccinated = Column(Numeric(15, 2))
+
+    # Totaux des flux journaliers
+    somme_new_cases = Column(Numeric(18, 2))
+    somme_new_deaths = Column(Numeric(18, 2))
+
+    # Pics
+    pic_new_cases = Column(Numeric(15, 2))
+    date_pic_new_cases = Column(Date)
+    pic_new_deaths = Column(Numeric(15, 2))
+    date_pic_new_deaths = Column(Date)
+    pic_icu_patients = Column(Numeric(15, 2))
+    pic_hosp_patients = Column(Numeric(15, 2))
+
+    mis_a_jour_le = Column(DateTime, server_default=func.now())
+
+
 class FMpox(Base):
     """Table de faits pour les données MPOX (variole du singe)"""
     __tablename__ = 'f_mpox'
+    __table_args__ = (
+        # Filtres par pays et période
+        Index('ix_f_mpox_location_date', 'location_id', 'date'),
+    )
 
     mpox_fact_id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date, nullable=False)
@@ -65,6 +103,19 @@ class FMpox(Base):
 
 class FPrediCovid(Base):
     __tablename__ = 'f_predi_covid'
+    __table_args__ = (
+        # Une seule prédiction par pays, indicateur, date et modèle (cible des upserts)
+        UniqueConstraint(
+            'location_id', 'indicateur', 'date_predite', 'model_name',
+            name='uq_f_predi_covid_prediction'
+        ),
+        # Prédictions d'une année par indicateur (tous pays ou un pays)
+        Index('ix_f_predi_covid_indicateur_date_location', 'indicateur', 'date_predite', 'location_id'),
+        # Liste des pays ayant des prédictions pour un indicateur (/predictions/countries)
+        Index('ix_f_predi_covid_indicateur_location', 'indicateur', 'location_id'),
+        # Ordre de la pagination par curseur de GET /predictions (COLONNES_CLE_PREDICTIONS)
+        Index('ix_f_predi_covid_location_date_pred', 'location_id', 'date_predite', 'pred_id'),
+    )
 
     pred_id = Column(Integer, primary_key=True, autoincrement=True)
     date_predite = Column(Date, nullable=False)
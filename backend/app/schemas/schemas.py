@@ -86,10 +86,40 @@ class FPrediCovidRead(FPrediCovidBase):
     pred_id: int
     model_config = ConfigDict(from_attributes=True)
 
+class GenerationPredictionsResume(BaseModel):
+    annee: int
+    predictions_generees: int
+    lignes_inserees: int
+    pays: int
+    pays_crees: int
+    model_name: str
+    duree_secondes: float
+
+class JobGenerationRead(BaseModel):
+    job_id: str
+    cle: str
+    statut: str  # "en_attente", "generation", "sauvegarde", "termine" ou "erreur"
+    progression: float
+    lignes_ecrites: int
+    lignes_totales: Optional[int] = None
+    eta_secondes: Optional[float] = None
+    resultat: Optional[GenerationPredictionsResume] = None
+    erreur: Optional[str] = None
+    cree_le: datetime
+    termine_le: Optional[datetime] = None
+
+class PredictionsPaysRead(BaseModel):
+    location_id: int
+    pays: str
+    predictions: List[FPrediCovidRead]
+
 # ----------- Request Models -----------#
 class PredictionFilters(BaseModel):
     skip: int = Field(0, ge=0)
-    limit: int = Field(100, gt=0, le=1000)
+    # "json" : page limitée à LIMITE_MAX_PAGE (core/pagination) ; "ndjson" : flux sans limite par défaut
+    format: str = Field("json", pattern="^(json|ndjson)$")
+    limit: Optional[int] = Field(None, gt=0)
+    cursor: Optional[str] = None
     location_id: Optional[int] = None
     indicateur: Optional[IndicateurType] = None
     date_debut: Optional[date] = None
@@ -103,8 +133,35 @@ class PredictionFilters(BaseModel):
                 raise ValueError("La date de fin doit être postérieure à la date de début")
         return v
 
-    @validator('limit')
-    def validate_limit(cls, v):
-        if v > 1000:
-            raise ValueError("La limite maximale est de 1000 enregistrements")
-        return v
\ No newline at end of file
+    @validator('limit', always=True)
+    def validate_limit(cls, v, values):
+        # La limite LIMITE_MAX_PAGE du format json est vérifiée par l'endpoint (400)
+        if v is None and values.get('format') != 'ndjson':
+            return 100
+        return v
+
+# Nombre maximal de pays demandés en une requête batch
+MAX_PAYS_BATCH = 300
+
+class PredictionsBatchRequest(BaseModel):
+    location_ids: List[int] = Field(default_factory=list)
+    pays: List[str] = Field(default_factory=list)
+    indicateur: IndicateurType = IndicateurType.NEW_CASES
+    date_debut: Optional[date] = None
+    date_fin: Optional[date] = None
+
+    @validator('pays', always=True)
+    def validate_pays(cls, v, values):
+        total = len(v) + len(values.get('location_ids') or [])
+        if total == 0:
+            raise ValueError("Au moins un pays (location_ids ou pays) doit être fourni")
+        if total > MAX_PAYS_BATCH:
+            raise ValueError(f"La limite maximale est de {MAX_PAYS_BATCH} pays par requête")
+        return v
+
+    @validator('date_fin')
+    def validate_dates(cls, v, values):
+        if v and 'date_debut' in values and values['date_debut']:
+            if v < values['date_debut']:
+                raise ValueError("La date de fin doit être postérieure à la date de début")
+        return v
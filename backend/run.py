@@ -7,7 +7,7 @@ sys.path.append(scripts_dir)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python run.py [etl|dashboard|analysis|importCovid|importMpox|predictions]")
+        print("Usage: python run.py [etl|dashboard|analysis|importCovid|importMpox|importPrediCovid|predictions|benchmarkIndex|benchmarkSerialisation]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -23,10 +23,10 @@ if __name__ == "__main__":
         start_analysis.main()
     elif command == "importCovid":
         import import_db
-        import_db.insert_f_covid()
+        import_db.insert_f_covid(incremental="--incremental" in sys.argv[2:])
     elif command == "importMpox":
         import import_db
-        import_db.insert_f_mpox()
+        import_db.insert_f_mpox(incremental="--incremental" in sys.argv[2:])
     elif command == "importPrediCovid":
         import import_db
         import_db.insert_f_predi_covid()
@@ -36,6 +36,15 @@ if __name__ == "__main__":
         print(f"🎯 Génération des prédictions pour {year}...")
         predictions = generate_predictions.generate_predictions(year)
         print(f"✅ {len(predictions)} prédictions générées avec succès!")
+    elif command == "benchmarkIndex":
+        import benchmark_index
+        sys.argv = sys.argv[1:]
+        benchmark_index.main()
+    elif command == "benchmarkSerialisation":
+        import benchmark_serialisation
+        sys.argv = sys.argv[1:]
+        benchmark_serialisation.main()
     else:
-        print("Commande non reconnue. Utilisez 'etl', 'dashboard', 'analysis', 'importCovid', 'importMpox' ou 'predictions'.")
+        print("Commande non reconnue. Utilisez 'etl', 'dashboard', 'analysis', 'importCovid', 'importMpox', "
+              "'importPrediCovid', 'predictions', 'benchmarkIndex' ou 'benchmarkSerialisation'.")
         sys.exit(1)
\ No newline at end of file
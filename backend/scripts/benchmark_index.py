@@ -0,0 +1,208 @@
+"""
+Benchmark des index composites sur un jeu de données synthétique.
+
+Crée un schéma dédié, le remplit (par défaut ~10M lignes dans f_predi_covid
+et f_covid), puis compare plans d'exécution et temps des requêtes de l'API
+avant et après la création des index déclarés sur les modèles.
+
+Usage : python scripts/benchmark_index.py [--lignes 10000000] [--pays 250] [--repetitions 5] [--conserver]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import UniqueConstraint, create_engine, text
+from sqlalchemy.schema import AddConstraint, CreateTable, DropConstraint
+
+# Ajouter la racine du dépôt au PYTHONPATH pour importer les modèles
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from backend.app.models.models import DLocation, FCovid, FMpox, FPrediCovid
+
+load_dotenv()
+
+SCHEMA = "benchmark_index"
+TABLES = [DLocation, FCovid, FMpox, FPrediCovid]
+INDICATEURS = ["new_cases", "new_deaths", "countries_reporting"]
+
+# Requêtes représentatives des endpoints (paramètres fixés sur le jeu synthétique)
+REQUETES = {
+    "predictions-by-country (1 pays, 1 an)": """
+        SELECT dl.location_name, fpc.date_predite, fpc.valeur_predite, fpc.model_name
+        FROM d_location dl
+        JOIN f_predi_covid fpc ON dl.location_id = fpc.location_id
+        WHERE dl.location_name = 'Pays 42'
+        AND fpc.indicateur = 'new_cases'
+        AND fpc.date_predite BETWEEN DATE '2025-01-01' AND DATE '2025-12-31'
+        AND fpc.model_name = 'RF_XGB_Ensemble'
+        ORDER BY fpc.date_predite
+    """,
+    "all-predictions (tous pays, 1 an)": """
+        SELECT fpc.location_id, fpc.date_predite,
+               MAX(CASE WHEN fpc.indicateur = 'new_cases' THEN fpc.valeur_predite END)
+        FROM f_predi_covid fpc
+        WHERE fpc.date_predite BETWEEN DATE '2025-01-01' AND DATE '2025-12-31'
+        AND fpc.indicateur IN ('new_cases', 'new_deaths', 'countries_reporting')
+        AND fpc.model_name = 'RF_XGB_Ensemble'
+        GROUP BY fpc.location_id, fpc.date_predite
+    """,
+    "predictions filtrées (pays + indicateur + période)": """
+        SELECT * FROM f_predi_covid
+        WHERE location_id = 42 AND indicateur = 'new_deaths'
+        AND date_predite BETWEEN DATE '2025-03-01' AND DATE '2025-05-31'
+    """,
+    "countries (DISTINCT location_name)": """
+        SELECT DISTINCT dl.location_name
+        FROM d_location dl
+        JOIN f_predi_covid fpc ON dl.location_id = fpc.location_id
+        WHERE fpc.indicateur = 'new_cases'
+        ORDER BY dl.location_name
+    """,
+    "f_covid (1 pays, 3 mois)": """
+        SELECT * FROM f_covid
+        WHERE location_id = 42 AND date BETWEEN DATE '2021-01-01' AND DATE '2021-03-31'
+    """,
+    "f_mpox (1 pays, 3 mois)": """
+        SELECT * FROM f_mpox
+        WHERE location_id = 42 AND date BETWEEN DATE '2022-06-01' AND DATE '2022-08-31'
+    """,
+}
+
+def get_sync_engine():
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL n'est pas défini dans le fichier .env")
+    return create_engine(DATABASE_URL.replace('postgresql+asyncpg', 'postgresql+psycopg2'))
+
+def _contraintes_uniques(model):
+    """
+    Contraintes UNIQUE nommées du modèle (ex: uq_f_predi_covid_prediction)
+
+    PostgreSQL les adosse à un index : elles font partie des index mesurés.
+    """
+    return [c for c in model.__table__.constraints if isinstance(c, UniqueConstraint) and c.name]
+
+def creer_jeu_synthetique(conn, n_lignes, n_pays):
+    """
+    Crée les tables (sans index secondaires ni contraintes UNIQUE) dans le schéma de benchmark et les remplit
+    """
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    for model in TABLES:
+        conn.execute(CreateTable(model.__table__))
+        # Sans quoi le plan "avant" utiliserait déjà l'index de la contrainte
+        for contrainte in _contraintes_uniques(model):
+            conn.execute(DropConstraint(contrainte))
+
+    # Nombre de jours nécessaire pour atteindre n_lignes prédictions
+    jours_predi = max(1, n_lignes // (n_pays * len(INDICATEURS)))
+    jours_faits = max(1, n_lignes // n_pays)
+    print(f"🧪 Jeu synthétique: {n_pays} pays, {jours_predi} jours de prédictions, {jours_faits} jours de faits")
+
+    conn.execute(text("""
+        INSERT INTO d_location (location_name)
+        SELECT 'Pays ' || l FROM generate_series(1, :n_pays) l
+    """), {"n_pays": n_pays})
+
+    conn.execute(text("""
+        INSERT INTO f_predi_covid (date_predite, location_id, indicateur, valeur_predite, model_name)
+        SELECT DATE '2020-01-01' + j, l, i, round((random() * 1000)::numeric, 2), 'RF_XGB_Ensemble'
+        FROM generate_series(0, :jours - 1) j,
+             generate_series(1, :n_pays) l,
+             unnest(ARRAY['new_cases', 'new_deaths', 'countries_reporting']) i
+    """), {"jours": jours_predi, "n_pays": n_pays})
+
+    conn.execute(text("""
+        INSERT INTO f_covid (date, location_id, total_cases, new_cases, total_deaths, new_deaths)
+        SELECT DATE '2020-01-01' + j, l, j * 100, 100, j, 1
+        FROM generate_series(0, :jours - 1) j, generate_series(1, :n_pays) l
+    """), {"jours": jours_faits, "n_pays": n_pays})
+
+    # Mpox : volume dix fois plus faible, comme dans les données réelles
+    conn.execute(text("""
+        INSERT INTO f_mpox (date, location_id, total_cases, new_cases)
+        SELECT DATE '2022-05-01' + j, l, j * 10, 10
+        FROM generate_series(0, :jours - 1) j, generate_series(1, :n_pays) l
+    """), {"jours": max(1, jours_faits // 10), "n_pays": n_pays})
+
+    conn.execute(text("ANALYZE"))
+
+def creer_index(conn):
+    """
+    Crée les index secondaires et les contraintes UNIQUE déclarés sur les modèles
+    """
+    for model in TABLES:
+        for contrainte in _contraintes_uniques(model):
+            print(f"   + {contrainte.name}")
+            conn.execute(AddConstraint(contrainte))
+        for index in model.__table__.indexes:
+            print(f"   + {index.name}")
+            index.create(conn)
+    conn.execute(text("ANALYZE"))
+
+def _types_de_noeuds(plan):
+    types = [plan["Node Type"] + (f" ({plan['Index Name']})" if "Index Name" in plan else "")]
+    for sous_plan in plan.get("Plans", []):
+        types.extend(_types_de_noeuds(sous_plan))
+    return types
+
+def mesurer(conn, repetitions):
+    """
+    Exécute chaque requête avec EXPLAIN ANALYZE et retourne {requête: (temps médian en ms, noeuds du plan)}
+    """
+    resultats = {}
+    for nom, requete in REQUETES.items():
+        temps = []
+        for _ in range(repetitions):
+            plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {requete}")).scalar()[0]
+            temps.append(plan["Execution Time"])
+        resultats[nom] = (statistics.median(temps), _types_de_noeuds(plan["Plan"]))
+    return resultats
+
+def afficher(titre, resultats):
+    print(f"\n=== {titre} ===")
+    for nom, (temps, noeuds) in resultats.items():
+        print(f"{nom:<52} {temps:>10.2f} ms")
+        print(f"    plan: {' > '.join(noeuds)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des index composites sur données synthétiques")
+    parser.add_argument("--lignes", type=int, default=10_000_000, help="Nombre de lignes synthétiques par table de faits")
+    parser.add_argument("--pays", type=int, default=250, help="Nombre de pays synthétiques")
+    parser.add_argument("--repetitions", type=int, default=5, help="Exécutions par requête (médiane retenue)")
+    parser.add_argument("--conserver", action="store_true", help=f"Ne pas supprimer le schéma {SCHEMA} à la fin")
+    args = parser.parse_args()
+
+    engine = get_sync_engine()
+    with engine.connect() as conn:
+        try:
+            with conn.begin():
+                creer_jeu_synthetique(conn, args.lignes, args.pays)
+            with conn.begin():
+                avant = mesurer(conn, args.repetitions)
+
+            print("\n🔧 Création des index...")
+            with conn.begin():
+                creer_index(conn)
+            with conn.begin():
+                apres = mesurer(conn, args.repetitions)
+
+            afficher("Sans index secondaires ni contraintes UNIQUE", avant)
+            afficher("Avec index composites", apres)
+
+            print("\n=== Gain ===")
+            for nom in REQUETES:
+                print(f"{nom:<52} x{avant[nom][0] / max(apres[nom][0], 1e-3):.1f}")
+        finally:
+            if not args.conserver:
+                conn.rollback()
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de la sérialisation des listes de faits COVID.
+
+Compare, sur une table SQLite synthétique en mémoire, le chemin historique
+(objets ORM -> validation pydantic from_attributes -> json.dumps) au chemin
+utilisé par les routes de liste (tuples de colonnes -> dictionnaires -> orjson).
+
+Usage : python scripts/benchmark_serialisation.py [--lignes 100000] [--repetitions 5]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+# Ajouter la racine du dépôt au PYTHONPATH pour importer les modèles
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from backend.app.core.reponses import ReponseORJSON, colonnes_schema, orjson
+from backend.app.models.models import Base, DLocation, FCovid
+from backend.app.schemas.schemas import FCovidRead
+
+N_PAYS = 200
+
+
+def creer_jeu_synthetique(engine, n_lignes):
+    Base.metadata.create_all(engine, tables=[DLocation.__table__, FCovid.__table__])
+    jours = max(n_lignes // N_PAYS, 1)
+    debut = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(DLocation), [
+            {"location_id": i, "location_name": f"Pays {i}"} for i in range(1, N_PAYS + 1)
+        ])
+        lignes = [
+            {
+                "date": debut + timedelta(days=j),
+                "location_id": i,
+                "total_cases": float(j * 100 + i),
+                "new_cases": float(j % 500),
+                "total_deaths": float(j * 2),
+                "new_deaths": float(j % 20),
+                "icu_patients": None if j % 3 else float(j % 50),
+                "hosp_patients": float(j % 80),
+                "total_vaccinations": float(j * 1000),
+                "people_vaccinated": float(j * 700),
+            }
+            for i in range(1, N_PAYS + 1)
+            for j in range(jours)
+        ]
+        conn.execute(insert(FCovid), lignes)
+    print(f"🧪 Jeu synthétique: {N_PAYS} pays x {jours} jours = {N_PAYS * jours} lignes")
+
+
+def chemin_orm(engine) -> bytes:
+    """Chemin historique : entités ORM puis validation et encodage pydantic/json"""
+    adaptateur = TypeAdapter(List[FCovidRead])
+    with Session(engine) as session:
+        objets = session.scalars(select(FCovid).order_by(FCovid.location_id, FCovid.date)).all()
+        contenu = adaptateur.dump_python(adaptateur.validate_python(objets, from_attributes=True), mode="json")
+    return json.dumps(contenu, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def chemin_colonnes(engine) -> bytes:
+    """Chemin des routes de liste : tuples de colonnes encodés par orjson"""
+    colonnes = colonnes_schema(FCovid, FCovidRead)
+    with engine.connect() as conn:
+        lignes = conn.execute(
+            select(*colonnes).order_by(FCovid.location_id, FCovid.date)
+        ).mappings().all()
+    return ReponseORJSON([dict(ligne) for ligne in lignes]).body
+
+
+def mesurer(fonction, engine, repetitions):
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        corps = fonction(engine)
+        temps.append((time.perf_counter() - debut) * 1000)
+    return statistics.median(temps), len(corps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sérialisation JSON des listes de faits")
+    parser.add_argument("--lignes", type=int, default=100_000, help="Nombre de lignes synthétiques dans f_covid")
+    parser.add_argument("--repetitions", type=int, default=5, help="Exécutions par chemin (médiane retenue)")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("⚠️ orjson non installé : le chemin colonnes utilise l'encodeur json standard")
+
+    engine = create_engine("sqlite://")
+    creer_jeu_synthetique(engine, args.lignes)
+
+    orm, taille_orm = mesurer(chemin_orm, engine, args.repetitions)
+    colonnes, taille_colonnes = mesurer(chemin_colonnes, engine, args.repetitions)
+
+    print("\n=== Sérialisation ===")
+    print(f"{'ORM + pydantic + json':<32} {orm:>10.2f} ms  ({taille_orm / 1e6:.1f} Mo)")
+    print(f"{'colonnes + orjson':<32} {colonnes:>10.2f} ms  ({taille_colonnes / 1e6:.1f} Mo)")
+    print(f"\n=== Gain === x{orm / max(colonnes, 1e-3):.1f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
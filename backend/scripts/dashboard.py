@@ -5,7 +5,12 @@ from dash import dcc, html, Input, Output
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import os
+
+# Importable depuis backend (scripts.xxx) comme depuis scripts/ (run.py)
+try:
+    from scripts.data_loader import charger_donnees_traitees, donnees_traitees_existent
+except ImportError:
+    from data_loader import charger_donnees_traitees, donnees_traitees_existent
 
 # Dictionnaire de traduction pour les métriques
 METRIC_LABELS = {
@@ -22,17 +27,16 @@ def metric_label(metric):
     return METRIC_LABELS.get(metric, metric.replace("_", " ").capitalize())
 
 # Vérifier si les données existent, sinon exécuter l'ETL
-if not os.path.exists('data/covid_processed.csv') or not os.path.exists('data/mpox_processed.csv'):
+if not donnees_traitees_existent('data/covid_processed.csv') or not donnees_traitees_existent('data/mpox_processed.csv'):
     print("Les données transformées n'existent pas. Exécution du script ETL...")
     import scripts.etl_script as etl_script
     etl_script.main()
 
 # Chargement des données
-covid_df = pd.read_csv('data/covid_processed.csv')
-covid_df['date'] = pd.to_datetime(covid_df['date'])
+covid_df = charger_donnees_traitees('data/covid_processed.csv')
 
 try:
-    mpox_df = pd.read_csv('data/mpox_processed.csv')
+    mpox_df = charger_donnees_traitees('data/mpox_processed.csv')
     # Vérifier la structure des données mpox et adapter si nécessaire
     if 'Date_confirmation' in mpox_df.columns:
         mpox_df['Date_confirmation'] = pd.to_datetime(mpox_df['Date_confirmation'], errors='coerce')
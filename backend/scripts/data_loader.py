@@ -0,0 +1,137 @@
+"""
+Lecture et écriture des données traitées par l'ETL.
+
+Chaque jeu traité (data/covid_processed.csv, data/mpox_processed.csv) est
+écrit au format Feather (Arrow IPC non compressé, relu en mémoire mappée,
+types et dates conservés) à côté d'un CSV optionnel. Les lecteurs (dashboard,
+génération des prédictions, import en base, tests) passent par
+`charger_donnees_traitees`, qui préfère le fichier Feather quand il est à jour.
+Les CSV sources volumineux sont lus par lots typés avec `read_csv_chunked`.
+"""
+
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# pyarrow est optionnel : sans lui, seuls les CSV sont lus et écrits
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+EXTENSION_COLONNAIRE = ".feather"
+# Lignes lues par lot dans les CSV sources, ex: fichier OWID (borne la mémoire de lecture)
+TAILLE_LOT_ETL = int(os.getenv("TAILLE_LOT_ETL", "200000"))
+# Écrire aussi le CSV (lisible à la main, compatible avec les anciens scripts)
+ECRIRE_CSV = os.getenv("ETL_ECRIRE_CSV", "true").strip().lower() in ("1", "true", "yes", "oui", "on")
+
+
+def chemin_colonnaire(chemin_csv: str) -> str:
+    """Chemin du fichier Feather associé à un CSV traité"""
+    return os.path.splitext(chemin_csv)[0] + EXTENSION_COLONNAIRE
+
+
+def resoudre_fichier(chemin_csv: str):
+    """
+    Fichier réellement lu pour un jeu traité, ou None s'il n'existe pas
+
+    Le Feather est retenu s'il existe et n'est pas plus ancien que le CSV
+    (un CSV modifié à la main reste prioritaire).
+    """
+    chemin_feather = chemin_colonnaire(chemin_csv)
+    csv_existe = os.path.exists(chemin_csv)
+    if feather is not None and os.path.exists(chemin_feather):
+        if not csv_existe or os.path.getmtime(chemin_feather) >= os.path.getmtime(chemin_csv):
+            return chemin_feather
+    return chemin_csv if csv_existe else None
+
+
+def donnees_traitees_existent(chemin_csv: str) -> bool:
+    return resoudre_fichier(chemin_csv) is not None
+
+
+def charger_donnees_traitees(chemin_csv: str, columns=None, categories: bool = False) -> pd.DataFrame:
+    """
+    Charger un jeu traité depuis son fichier Feather, ou à défaut son CSV
+
+    Args:
+        chemin_csv (str): Chemin du CSV traité (ex: data/covid_processed.csv)
+        columns (list): Colonnes à lire (toutes par défaut)
+        categories (bool): Garder les colonnes catégorielles (ex: location) ;
+            par défaut elles sont rendues en chaînes, comme à la lecture du CSV
+
+    Returns:
+        DataFrame: données avec la colonne date déjà convertie
+    """
+    chemin = resoudre_fichier(chemin_csv)
+    if chemin is None:
+        raise FileNotFoundError(f"Aucune donnée traitée trouvée pour {chemin_csv}")
+
+    if chemin.endswith(EXTENSION_COLONNAIRE):
+        df = feather.read_table(chemin, columns=columns, memory_map=True).to_pandas()
+        if not categories:
+            for col in df.select_dtypes('category').columns:
+                df[col] = df[col].astype(object)
+        return df
+
+    entetes = pd.read_csv(chemin, nrows=0).columns
+    return pd.read_csv(
+        chemin,
+        usecols=columns,
+        parse_dates=['date'] if 'date' in entetes and (columns is None or 'date' in columns) else False
+    )
+
+
+def ecrire_donnees_traitees(df: pd.DataFrame, chemin_csv: str, csv: bool = ECRIRE_CSV):
+    """
+    Écrire un jeu traité en Feather et, si demandé, en CSV
+
+    Le CSV est écrit en premier pour que le Feather soit le plus récent des
+    deux ; sans pyarrow, seul le CSV est écrit.
+
+    Returns:
+        list: chemins des fichiers écrits
+    """
+    ecrits = []
+    if csv or feather is None:
+        df.to_csv(chemin_csv, index=False)
+        ecrits.append(chemin_csv)
+    if feather is not None:
+        chemin_feather = chemin_colonnaire(chemin_csv)
+        # Non compressé : lecture en mémoire mappée sans décompression
+        feather.write_feather(df.reset_index(drop=True), chemin_feather, compression='uncompressed')
+        ecrits.append(chemin_feather)
+    return ecrits
+
+
+def read_csv_chunked(path, columns, dtypes, chunksize=TAILLE_LOT_ETL):
+    """
+    Lire un CSV par lots en ne gardant que `columns`, avec types et dates fixés
+
+    Chaque lot est dédoublonné dès sa lecture ; les colonnes catégorielles
+    des lots sont ensuite alignées sur l'union de leurs catégories pour que
+    la concaténation reste catégorielle (sans repasser par des chaînes).
+    """
+    wanted = set(columns)
+    chunks = []
+    for chunk in pd.read_csv(
+        path,
+        usecols=lambda col: col in wanted,
+        dtype=dtypes,
+        parse_dates=['date'],
+        chunksize=chunksize
+    ):
+        chunks.append(chunk.drop_duplicates())
+
+    if not chunks:
+        return pd.DataFrame(columns=list(columns))
+
+    for col in chunks[0].select_dtypes('category').columns:
+        categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+
+    df = pd.concat(chunks, ignore_index=True)
+    # Ordre des colonnes de `columns` (celles absentes du fichier sont ignorées)
+    return df[[col for col in columns if col in df.columns]]
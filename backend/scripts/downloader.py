@@ -0,0 +1,162 @@
+"""
+Téléchargement des sources de l'ETL.
+
+Les fichiers sont écrits sur disque par blocs (jamais chargés entiers en
+mémoire). Une requête conditionnelle (ETag / Last-Modified) évite de
+retélécharger une source inchangée, et un téléchargement interrompu reprend
+là où il s'est arrêté (en-tête Range, validé par If-Range). Chaque fichier
+téléchargé est décrit dans un manifeste JSON (URL, validateurs, taille,
+SHA-256) placé à côté des données.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import requests
+
+TAILLE_BLOC = 1024 * 1024
+TIMEOUT_SECONDES = float(os.getenv("ETL_TIMEOUT_TELECHARGEMENT", "60"))
+NOM_MANIFESTE = "manifest.json"
+SUFFIXE_PARTIEL = ".part"
+
+# Résultats de telecharger()
+TELECHARGE = "telecharge"
+INCHANGE = "inchange"
+
+
+def sha256_fichier(chemin: str) -> str:
+    sha = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), b""):
+            sha.update(bloc)
+    return sha.hexdigest()
+
+
+def chemin_manifeste(destination: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(destination)), NOM_MANIFESTE)
+
+
+def lire_manifeste(chemin: str) -> dict:
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _ecrire_manifeste(chemin: str, manifeste: dict):
+    """Écriture atomique : un manifeste n'est jamais lu à moitié écrit"""
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump(manifeste, f, indent=2, sort_keys=True)
+    os.replace(temporaire, chemin)
+
+
+def _validateurs(reponse) -> dict:
+    return {
+        "etag": reponse.headers.get("ETag"),
+        "last_modified": reponse.headers.get("Last-Modified"),
+    }
+
+
+def _fichier_conforme(destination: str, entree: dict) -> bool:
+    """Le fichier local correspond-il à l'entrée du manifeste (taille et SHA-256) ?"""
+    if not entree or not os.path.exists(destination):
+        return False
+    if os.path.getsize(destination) != entree.get("taille"):
+        return False
+    return sha256_fichier(destination) == entree.get("sha256")
+
+
+def telecharger(url: str, destination: str, manifeste: str = None, taille_bloc: int = TAILLE_BLOC,
+                timeout: float = TIMEOUT_SECONDES, session=None) -> str:
+    """
+    Télécharger `url` vers `destination` si la source a changé
+
+    Args:
+        url (str): URL de la source
+        destination (str): Fichier local à produire
+        manifeste (str): Chemin du manifeste (par défaut manifest.json à côté de la destination)
+        taille_bloc (int): Taille des blocs lus et écrits
+        timeout (float): Timeout de connexion et de lecture, en secondes
+        session: Session requests à réutiliser (une nouvelle par défaut)
+
+    Returns:
+        str: TELECHARGE ou INCHANGE
+
+    Raises:
+        requests.RequestException: en cas d'erreur réseau ou HTTP ; le
+            fichier partiel est conservé pour reprise au prochain appel
+    """
+    manifeste = manifeste or chemin_manifeste(destination)
+    cle = os.path.basename(destination)
+    contenu_manifeste = lire_manifeste(manifeste)
+    entree = contenu_manifeste.get(cle, {})
+    partiel = destination + SUFFIXE_PARTIEL
+    session = session or requests.Session()
+
+    # Octets identiques d'un appel à l'autre (pas de compression à la volée) pour la reprise
+    entetes = {"Accept-Encoding": "identity"}
+    deja_recu = os.path.getsize(partiel) if os.path.exists(partiel) else 0
+    partiel_connu = entree.get("partiel") or {}
+    validateur_partiel = partiel_connu.get("etag") or partiel_connu.get("last_modified")
+    if deja_recu and entree.get("url") == url and validateur_partiel:
+        # Reprise, seulement si la source n'a pas changé depuis le début du fichier partiel
+        entetes["Range"] = f"bytes={deja_recu}-"
+        entetes["If-Range"] = validateur_partiel
+    else:
+        deja_recu = 0
+        if entree.get("url") == url and _fichier_conforme(destination, entree):
+            if entree.get("etag"):
+                entetes["If-None-Match"] = entree["etag"]
+            if entree.get("last_modified"):
+                entetes["If-Modified-Since"] = entree["last_modified"]
+
+    with session.get(url, headers=entetes, stream=True, timeout=timeout) as reponse:
+        if reponse.status_code == 304:
+            print(f"Source inchangée, {destination} conservé")
+            return INCHANGE
+        reprise = "Range" in entetes and reponse.status_code == 206
+        plage_attendue = reponse.headers.get("Content-Range", "").startswith(f"bytes {deja_recu}-")
+        if "Range" in entetes and (reponse.status_code == 416 or (reprise and not plage_attendue)):
+            # Plage refusée ou inattendue : le fichier partiel n'est plus exploitable
+            os.remove(partiel)
+            return telecharger(url, destination, manifeste, taille_bloc, timeout, session)
+        reponse.raise_for_status()
+
+        sha = hashlib.sha256()
+        if reprise:
+            print(f"Reprise du téléchargement à l'octet {deja_recu}")
+            with open(partiel, "rb") as f:
+                for bloc in iter(lambda: f.read(taille_bloc), b""):
+                    sha.update(bloc)
+            mode = "ab"
+            validateurs = partiel_connu
+        else:
+            # Source modifiée (ou reprise non supportée) : on repart de zéro
+            mode = "wb"
+            validateurs = _validateurs(reponse)
+
+        # Validateurs mémorisés avant d'écrire, pour pouvoir reprendre après une coupure
+        entree = {"url": url, "partiel": validateurs}
+        contenu_manifeste[cle] = entree
+        _ecrire_manifeste(manifeste, contenu_manifeste)
+
+        with open(partiel, mode) as f:
+            for bloc in reponse.iter_content(chunk_size=taille_bloc):
+                f.write(bloc)
+                sha.update(bloc)
+
+    os.replace(partiel, destination)
+    contenu_manifeste[cle] = {
+        "url": url,
+        "etag": validateurs.get("etag"),
+        "last_modified": validateurs.get("last_modified"),
+        "taille": os.path.getsize(destination),
+        "sha256": sha.hexdigest(),
+        "telecharge_le": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _ecrire_manifeste(manifeste, contenu_manifeste)
+    return TELECHARGE
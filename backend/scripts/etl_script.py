@@ -2,13 +2,20 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import requests
 import kagglehub
 from dotenv import load_dotenv
 from datetime import datetime
 from io import StringIO
 import os
 
+# Importable depuis backend (scripts.xxx) comme depuis scripts/ (run.py)
+try:
+    from scripts.data_loader import ecrire_donnees_traitees, read_csv_chunked
+    from scripts.downloader import TELECHARGE, telecharger
+except ImportError:
+    from data_loader import ecrire_donnees_traitees, read_csv_chunked
+    from downloader import TELECHARGE, telecharger
+
 # Création du répertoire pour stocker les données
 if not os.path.exists('data'):
     os.makedirs('data')
@@ -18,17 +25,37 @@ COVID_DATA_URL = os.getenv("COVID_DATA_URL")
 # MPOX_DATA_URL = "https://7rydd2v2ra.execute-api.eu-central-1.amazonaws.com/web/lastest.csv"
 MPOX_KAGGLE_DATASET = os.getenv("MPOX_KAGGLE_DATASET")
 
+# Colonnes COVID conservées : seules celles-ci sont lues dans le fichier OWID
+COVID_COLUMNS = ['date', 'location', 'total_cases', 'new_cases',
+                 'total_deaths', 'new_deaths', 'icu_patients',
+                 'hosp_patients', 'total_vaccinations', 'people_vaccinated']
+
+# Types fixés à la lecture. float32 n'est exact que jusqu'à 2^24 (~16,7 M) :
+# les cumuls et les cas (agrégats mondiaux) restent en float64
+COVID_DTYPES = {
+    'location': 'category',
+    'total_cases': 'float64',
+    'new_cases': 'float64',
+    'total_deaths': 'float32',
+    'new_deaths': 'float32',
+    'icu_patients': 'float32',
+    'hosp_patients': 'float32',
+    'total_vaccinations': 'float64',
+    'people_vaccinated': 'float64',
+}
+
 def download_data(url, filename):
-    """Télécharger les données à partir de l'URL spécifiée"""
+    """
+    Télécharger les données à partir de l'URL spécifiée
+
+    Écriture en flux sur disque, requête conditionnelle (source inchangée
+    non retéléchargée), reprise d'un téléchargement interrompu et SHA-256
+    enregistré dans data/manifest.json (voir scripts/downloader.py).
+    """
     print(f"Téléchargement des données depuis {url}...")
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Vérifier si la requête a réussi
-        
-        with open(f"data/{filename}", 'w', encoding='utf-8') as f:
-            f.write(response.text)
-        
-        print(f"Données enregistrées dans data/{filename}")
+        if telecharger(url, f"data/{filename}") == TELECHARGE:
+            print(f"Données enregistrées dans data/{filename}")
         return True
     except Exception as e:
         print(f"Erreur lors du téléchargement: {e}")
@@ -36,27 +63,20 @@ def download_data(url, filename):
 
 def load_and_clean_covid_data():
     """Charger et nettoyer les données COVID-19"""
-    if not os.path.exists('data/covid_data.csv'):
+    # Revalidation à chaque exécution : peu coûteuse si la source n'a pas changé
+    if COVID_DATA_URL:
         success = download_data(COVID_DATA_URL, 'covid_data.csv')
-        if not success:
+        if not success and not os.path.exists('data/covid_data.csv'):
             return None
+    elif not os.path.exists('data/covid_data.csv'):
+        print("COVID_DATA_URL n'est pas défini et data/covid_data.csv est absent.")
+        return None
     
-    # Chargement des données
-    covid_df = pd.read_csv('data/covid_data.csv')
-    
-    # Nettoyage et transformation
-    # Sélection des colonnes pertinentes
-    cols_to_keep = ['date', 'location', 'total_cases', 'new_cases', 
-                    'total_deaths', 'new_deaths', 'icu_patients',
-                    'hosp_patients', 'total_vaccinations', 'people_vaccinated']
-    
-    covid_df = covid_df[[col for col in cols_to_keep if col in covid_df.columns]]
-    
-    # Conversion de la date
-    covid_df['date'] = pd.to_datetime(covid_df['date'])
+    # Chargement des seules colonnes pertinentes, typées et dates converties à la lecture
+    covid_df = read_csv_chunked('data/covid_data.csv', COVID_COLUMNS, COVID_DTYPES)
 
-    # Effacer les doublons 
-    covid_df.drop_duplicates(inplace=True)
+    # Effacer les doublons (y compris entre deux lots)
+    covid_df.drop_duplicates(inplace=True, ignore_index=True)
     
     return covid_df
 
@@ -136,7 +156,10 @@ def generate_visualizations(covid_df, mpox_df):
     if covid_df is not None:
         # Filtrer quelques pays majeurs pour la lisibilité
         major_countries = ['France', 'United States', 'United Kingdom', 'Germany', 'China', 'India', 'Brazil']
-        filtered_df = covid_df[covid_df['location'].isin(major_countries)]
+        filtered_df = covid_df[covid_df['location'].isin(major_countries)].copy()
+        if isinstance(filtered_df['location'].dtype, pd.CategoricalDtype):
+            # Ne garder que les pays retenus (la catégorie contient tous les pays du CSV)
+            filtered_df['location'] = filtered_df['location'].cat.remove_unused_categories()
         
         plt.subplot(2, 2, 1)
         for country in major_countries:
@@ -152,10 +175,13 @@ def generate_visualizations(covid_df, mpox_df):
         
         # 2. Taux de vaccination COVID-19
         plt.subplot(2, 2, 2)
-        latest_data = covid_df.sort_values('date').groupby('location').last().reset_index()
+        latest_data = covid_df.sort_values('date').groupby('location', observed=True).last().reset_index()
         # Filtrer pour n'avoir que les pays avec des données de vaccination
         vacc_data = latest_data[latest_data['people_vaccinated'].notna()]
-        top_vacc = vacc_data.sort_values('people_vaccinated', ascending=False).head(10)
+        top_vacc = vacc_data.sort_values('people_vaccinated', ascending=False).head(10).copy()
+        if isinstance(top_vacc['location'].dtype, pd.CategoricalDtype):
+            # Sinon seaborn trace un axe avec toutes les catégories, même vides
+            top_vacc['location'] = top_vacc['location'].cat.remove_unused_categories()
         
         sns.barplot(x='people_vaccinated', y='location', data=top_vacc)
         plt.title('Pays avec le plus de personnes vaccinées')
@@ -242,12 +268,12 @@ def main():
     
     # Sauvegarde des données transformées
     if covid_df is not None:
-        covid_df.to_csv('data/covid_processed.csv', index=False)
-        print("Données COVID-19 transformées enregistrées dans data/covid_processed.csv")
+        fichiers = ecrire_donnees_traitees(covid_df, 'data/covid_processed.csv')
+        print(f"Données COVID-19 transformées enregistrées dans {', '.join(fichiers)}")
     
     if mpox_df is not None:
-        mpox_df.to_csv('data/mpox_processed.csv', index=False)
-        print("Données mpox transformées enregistrées dans data/mpox_processed.csv")
+        fichiers = ecrire_donnees_traitees(mpox_df, 'data/mpox_processed.csv')
+        print(f"Données mpox transformées enregistrées dans {', '.join(fichiers)}")
     
     # Génération des visualisations
     if covid_df is not None or mpox_df is not None:
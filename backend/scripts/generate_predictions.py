@@ -1,36 +1,38 @@
 import pandas as pd
 import numpy as np
 import joblib
+import hashlib
+import json
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from sklearn.preprocessing import LabelEncoder
 
+# Importable depuis backend (scripts.xxx) comme depuis scripts/ (run.py)
+try:
+    from scripts.data_loader import charger_donnees_traitees, resoudre_fichier
+except ImportError:
+    from data_loader import charger_donnees_traitees, resoudre_fichier
+
 # === PARAMÈTRES ===
 YEAR_TO_PREDICT = 2025
+N_WORKERS = int(os.getenv("PREDICTIONS_WORKERS", "1"))  # Taille du pool de processus (1 = exécution séquentielle)
 
-# === CHARGEMENT DES MODÈLES ===
-model_cases = joblib.load("ml_models/model_cases_rf.joblib")
-model_deaths = joblib.load("ml_models/model_deaths_xgb.joblib")
-model_geo = joblib.load("ml_models/model_spread_rf.joblib")
-
-# === CHARGEMENT DES DONNÉES HISTORIQUES ===
-data_path = "data/covid_processed.csv"
-data = pd.read_csv(data_path, parse_dates=["date"])
-
-# === PRÉPARATION ===
-data["location_encoded"] = LabelEncoder().fit_transform(data["location"])
-data["day"] = data["date"].dt.day
-data["month"] = data["date"].dt.month
-data["year"] = data["date"].dt.year
-data["epidemic_phase"] = data["year"].apply(lambda y: 0 if y <= 2022 else 1)
-data["days_since_start"] = (data["date"] - data["date"].min()).dt.days
+# Chemins des artefacts (relatifs au dossier backend)
+MODEL_PATHS = {
+    "cases": "ml_models/model_cases_rf.joblib",
+    "deaths": "ml_models/model_deaths_xgb.joblib",
+    "geo": "ml_models/model_spread_rf.joblib",
+}
+DATA_PATH = "data/covid_processed.csv"
 
-data.sort_values(["location", "date"], inplace=True)
-data["new_cases_rolling7"] = data.groupby("location")["new_cases"].transform(lambda x: x.rolling(7, min_periods=1).mean())
-data["trend_new_cases"] = data.groupby("location")["new_cases"].transform(lambda x: x.diff(7))
-
-# === DERNIÈRE VALEUR PAR PAYS ===
-max_year = data["year"].max()
+# Cache disque des prédictions générées
+CACHE_DIR = os.getenv("PREDICTIONS_CACHE_DIR", "cache/predictions")
+CACHE_MAX_MB = float(os.getenv("PREDICTIONS_CACHE_MAX_MB", "512"))
+CACHE_VERSION = 1  # À incrémenter si le format ou la logique de génération change
 
 def get_last_valid_row(df, year):
     subset = df[df["year"] == year]
@@ -39,43 +41,282 @@ def get_last_valid_row(df, year):
     else:
         return pd.DataFrame()
 
-latest_data = (
-    data.groupby("location", group_keys=False)
-    .apply(lambda df: get_last_valid_row(df, max_year))
-    .dropna(how="all")
-    .reset_index(drop=True)
-)
+def preparer_donnees(data_path: str = DATA_PATH):
+    """
+    Charge l'historique COVID et calcule les features et la dernière observation par pays
+
+    Args:
+        data_path (str): Chemin du CSV des données traitées (le Feather associé est préféré)
 
-if latest_data.empty:
-    print(f"❌ Aucun pays n'a de données pour l'année {max_year}")
-    exit()
+    Returns:
+        tuple: (historique préparé, dernière observation nettoyée de chaque pays)
+    """
+    # === CHARGEMENT DES DONNÉES HISTORIQUES ===
+    data = charger_donnees_traitees(data_path)
+
+    # === PRÉPARATION ===
+    data["location_encoded"] = LabelEncoder().fit_transform(data["location"])
+    data["day"] = data["date"].dt.day
+    data["month"] = data["date"].dt.month
+    data["year"] = data["date"].dt.year
+    data["epidemic_phase"] = data["year"].apply(lambda y: 0 if y <= 2022 else 1)
+    data["days_since_start"] = (data["date"] - data["date"].min()).dt.days
+
+    data.sort_values(["location", "date"], inplace=True)
+    data["new_cases_rolling7"] = data.groupby("location")["new_cases"].transform(lambda x: x.rolling(7, min_periods=1).mean())
+    data["trend_new_cases"] = data.groupby("location")["new_cases"].transform(lambda x: x.diff(7))
+
+    # === DERNIÈRE VALEUR PAR PAYS ===
+    max_year = data["year"].max()
+
+    latest_data = (
+        data.groupby("location", group_keys=False)
+        .apply(lambda df: get_last_valid_row(df, max_year))
+        .dropna(how="all")
+        .reset_index(drop=True)
+    )
+
+    if latest_data.empty:
+        raise ValueError(f"Aucun pays n'a de données pour l'année {max_year}")
+
+    # === NETTOYAGE DES DONNÉES D'ENTRÉE ===
+    print(f"🧹 Nettoyage des données d'entrée...")
+    print(f"Avant nettoyage: {len(latest_data)} pays")
+    print(f"Pays disponibles: {sorted(latest_data['location'].unique())}")
+
+    # Remplacer les valeurs NaN par des valeurs par défaut
+    latest_data["new_cases"] = latest_data["new_cases"].fillna(0)
+    latest_data["new_deaths"] = latest_data["new_deaths"].fillna(0)
+    latest_data["new_cases_rolling7"] = latest_data["new_cases_rolling7"].fillna(0)
+    latest_data["trend_new_cases"] = latest_data["trend_new_cases"].fillna(0)
+
+    # Supprimer les lignes avec des valeurs critiques manquantes
+    latest_data = latest_data.dropna(subset=["total_cases", "total_deaths", "location_encoded"])
+
+    print(f"Après nettoyage: {len(latest_data)} pays")
+    print(f"Pays retenus après nettoyage: {sorted(latest_data['location'].unique())}")
+
+    return data, latest_data
+
+class RegistreModeles:
+    """
+    Registre des modèles et des données préparées, partagé par tout le processus
 
-# === NETTOYAGE DES DONNÉES D'ENTRÉE ===
-print(f"🧹 Nettoyage des données d'entrée...")
-print(f"Avant nettoyage: {len(latest_data)} pays")
-print(f"Pays disponibles: {sorted(latest_data['location'].unique())}")
+    Rien n'est chargé à l'import : les artefacts sont lus au premier accès puis
+    réutilisés. Les modèles sont rechargés si la date de modification d'un
+    fichier .joblib change, et les données si le CSV change.
+    """
 
-# Remplacer les valeurs NaN par des valeurs par défaut
-latest_data["new_cases"] = latest_data["new_cases"].fillna(0)
-latest_data["new_deaths"] = latest_data["new_deaths"].fillna(0)
-latest_data["new_cases_rolling7"] = latest_data["new_cases_rolling7"].fillna(0)
-latest_data["trend_new_cases"] = latest_data["trend_new_cases"].fillna(0)
+    def __init__(self, model_paths: dict = None, data_path: str = DATA_PATH):
+        self.model_paths = dict(model_paths or MODEL_PATHS)
+        self.data_path = data_path
+        self._lock = threading.RLock()
+        self._modeles = None
+        self._mtimes_modeles = None
+        self._donnees = {}  # chemin -> (mtime, data, latest_data)
+
+    def _mtimes(self):
+        return tuple(os.path.getmtime(self.model_paths[nom]) for nom in ("cases", "deaths", "geo"))
+
+    def modeles(self):
+        """
+        Retourne le tuple (modèle cas, modèle décès, modèle propagation)
+        """
+        with self._lock:
+            mtimes = self._mtimes()
+            if self._modeles is None or mtimes != self._mtimes_modeles:
+                if self._modeles is not None:
+                    print("🔁 Fichiers .joblib modifiés, rechargement des modèles")
+                self._modeles = tuple(
+                    joblib.load(self.model_paths[nom]) for nom in ("cases", "deaths", "geo")
+                )
+                self._mtimes_modeles = mtimes
+            return self._modeles
+
+    def donnees(self, data_path: str = None):
+        """
+        Retourne (historique préparé, dernière observation par pays) pour un fichier de données
+        """
+        data_path = data_path or self.data_path
+        with self._lock:
+            # Date du fichier réellement lu (Feather ou CSV)
+            mtime = os.path.getmtime(resoudre_fichier(data_path) or data_path)
+            entree = self._donnees.get(data_path)
+            if entree is None or entree[0] != mtime:
+                data, latest_data = preparer_donnees(data_path)
+                entree = (mtime, data, latest_data)
+                self._donnees[data_path] = entree
+            return entree[1], entree[2]
+
+    def warmup(self):
+        """
+        Charge les modèles et les données par défaut sans attendre la première génération
+        """
+        self.modeles()
+        self.donnees()
+
+    def reload(self):
+        """
+        Oublie les artefacts chargés et les relit immédiatement
+        """
+        with self._lock:
+            self._modeles = None
+            self._mtimes_modeles = None
+            self._donnees.clear()
+        self.warmup()
+
+registre = RegistreModeles()
+
+# === CACHE DES PRÉDICTIONS ===
+COLONNES_CACHE = ["date", "location", "new_cases_pred", "new_deaths_pred", "countries_reporting_pred"]
+
+class CachePredictions:
+    """
+    Cache disque des prédictions, une entrée par année et par jeu d'artefacts
 
-# Supprimer les lignes avec des valeurs critiques manquantes
-latest_data = latest_data.dropna(subset=["total_cases", "total_deaths", "location_encoded"])
+    La clé combine l'année, le mode de génération et l'empreinte SHA-256 du
+    contenu des modèles et des données : un artefact modifié invalide donc
+    les entrées existantes. Chaque entrée est un dossier contenant un fichier
+    .npy par colonne, relu en mémoire mappée. Au-delà de `max_mb`, les entrées
+    les moins récemment utilisées sont supprimées.
+    """
 
-print(f"Après nettoyage: {len(latest_data)} pays")
-print(f"Pays retenus après nettoyage: {sorted(latest_data['location'].unique())}")
+    def __init__(self, dossier: str = CACHE_DIR, max_mb: float = CACHE_MAX_MB):
+        self.dossier = dossier
+        self.max_octets = int(max_mb * 1024 * 1024)
+        self._empreintes = {}  # chemin -> (taille, mtime, sha256)
+        self._lock = threading.Lock()
+
+    def empreinte_fichier(self, chemin: str) -> str:
+        """SHA-256 du contenu d'un fichier, recalculé seulement si sa taille ou sa date changent"""
+        stat = os.stat(chemin)
+        with self._lock:
+            connue = self._empreintes.get(chemin)
+            if connue is not None and connue[:2] == (stat.st_size, stat.st_mtime_ns):
+                return connue[2]
+
+        sha = hashlib.sha256()
+        with open(chemin, "rb") as f:
+            for bloc in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(bloc)
+        empreinte = sha.hexdigest()
+
+        with self._lock:
+            self._empreintes[chemin] = (stat.st_size, stat.st_mtime_ns, empreinte)
+        return empreinte
+
+    def cle(self, year: int, model_paths: dict, data_path: str, recursif: bool, batch: bool = True) -> str:
+        description = {
+            "version": CACHE_VERSION,
+            "annee": year,
+            "recursif": recursif,
+            # Batch et boucle historique sont mis en cache séparément (comparaison --legacy)
+            "batch": batch,
+            "modeles": {nom: self.empreinte_fichier(chemin) for nom, chemin in sorted(model_paths.items())},
+            # Empreinte du fichier réellement lu (Feather ou CSV)
+            "donnees": self.empreinte_fichier(resoudre_fichier(data_path) or data_path),
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def lire(self, cle: str):
+        """Retourne la liste de prédictions en cache, ou None"""
+        entree = os.path.join(self.dossier, cle)
+        if not os.path.isdir(entree):
+            return None
+        try:
+            colonnes = {
+                nom: np.load(os.path.join(entree, f"{nom}.npy"), mmap_mode="r")
+                for nom in COLONNES_CACHE
+            }
+        except (OSError, ValueError):
+            return None
+        os.utime(entree)  # Marque l'entrée comme récemment utilisée
+
+        dates = colonnes["date"].astype(object)
+        locations = colonnes["location"].tolist()
+        return [
+            {
+                "date": date_predite,
+                "location": location,
+                "new_cases_pred": cases,
+                "new_deaths_pred": deaths,
+                "countries_reporting_pred": reporting
+            }
+            for date_predite, location, cases, deaths, reporting in zip(
+                dates,
+                locations,
+                colonnes["new_cases_pred"].tolist(),
+                colonnes["new_deaths_pred"].tolist(),
+                colonnes["countries_reporting_pred"].tolist()
+            )
+        ]
+
+    def ecrire(self, cle: str, predictions: list):
+        """Enregistre les prédictions puis applique l'éviction LRU"""
+        os.makedirs(self.dossier, exist_ok=True)
+        temporaire = os.path.join(self.dossier, f".{cle}.{os.getpid()}.{threading.get_ident()}")
+        os.makedirs(temporaire, exist_ok=True)
+
+        colonnes = {
+            "date": np.array([pred["date"] for pred in predictions], dtype="datetime64[D]"),
+            "location": np.array([pred["location"] for pred in predictions], dtype=str),
+        }
+        for nom in COLONNES_CACHE[2:]:
+            colonnes[nom] = np.array([pred[nom] for pred in predictions], dtype=float)
+        for nom, valeurs in colonnes.items():
+            np.save(os.path.join(temporaire, f"{nom}.npy"), valeurs)
+
+        entree = os.path.join(self.dossier, cle)
+        try:
+            os.rename(temporaire, entree)
+        except OSError:
+            # Une autre génération a écrit la même entrée entre-temps
+            shutil.rmtree(temporaire, ignore_errors=True)
+        self.evincer()
+
+    def evincer(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de la taille maximale"""
+        if not os.path.isdir(self.dossier):
+            return
+        entrees = []
+        for nom in os.listdir(self.dossier):
+            chemin = os.path.join(self.dossier, nom)
+            if nom.startswith(".") or not os.path.isdir(chemin):
+                continue
+            taille = sum(f.stat().st_size for f in os.scandir(chemin))
+            entrees.append((os.path.getmtime(chemin), taille, chemin))
+
+        total = sum(taille for _, taille, _ in entrees)
+        for _, taille, chemin in sorted(entrees):
+            if total <= self.max_octets:
+                break
+            shutil.rmtree(chemin, ignore_errors=True)
+            total -= taille
+            print(f"🧹 Cache: entrée {os.path.basename(chemin)[:12]} évincée")
+
+    def vider(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+cache_predictions = CachePredictions()
+
+def warmup():
+    """Précharge les modèles et les données du registre partagé"""
+    registre.warmup()
+
+def reload():
+    """Force le rechargement des modèles et des données du registre partagé"""
+    registre.reload()
+
+# === RÈGLES MÉTIER ===
+# Limites maximales par jour
+TAUX_MORTALITE_MAX = 0.05  # 5% maximum
+MAX_DECES_PAR_JOUR = 50    # Maximum 50 décès par jour
+MIN_CAS_POUR_DECES = 10    # Minimum 10 cas pour avoir des décès
 
 def post_traitement(predictions):
     """
     Applique les règles métier aux prédictions pour assurer leur cohérence
     """
-    # Limites maximales par jour
-    TAUX_MORTALITE_MAX = 0.05  # 5% maximum
-    MAX_DECES_PAR_JOUR = 50    # Maximum 50 décès par jour
-    MIN_CAS_POUR_DECES = 10    # Minimum 10 cas pour avoir des décès
-    
     for pred in predictions:
         # Règle 1 : Valeurs toujours positives
         pred['new_cases_pred'] = max(0, pred['new_cases_pred'])
@@ -97,43 +338,224 @@ def post_traitement(predictions):
     
     return predictions
 
-def generate_predictions(year_to_predict: int = YEAR_TO_PREDICT):
+def post_traitement_vectorise(new_cases, new_deaths, countries_reporting):
     """
-    Génère les prédictions pour une année donnée
-    
+    Applique les mêmes règles métier que post_traitement sur des tableaux NumPy
+
+    Returns:
+        tuple: (nouveaux cas, nouveaux décès, pays touchés) corrigés
+    """
+    # Règle 1 : Valeurs toujours positives
+    new_cases = np.maximum(new_cases, 0)
+    new_deaths = np.maximum(new_deaths, 0)
+    countries_reporting = np.maximum(countries_reporting, 0)
+
+    # Règle 2 : Limitation du nombre de décès par jour
+    new_deaths = np.minimum(new_deaths, MAX_DECES_PAR_JOUR)
+
+    # Règle 3 : Pas de décès si trop peu de cas
+    new_deaths = np.where(new_cases < MIN_CAS_POUR_DECES, 0, new_deaths)
+
+    # Règle 4 : Limitation du taux de mortalité
+    new_deaths = np.minimum(new_deaths, new_cases * TAUX_MORTALITE_MAX)
+
+    return new_cases, new_deaths, countries_reporting
+
+# Features pour chaque modèle
+FEATURES_CASES = [
+    "total_cases", "location_encoded", "day", "month", "year",
+    "total_deaths", "epidemic_phase", "days_since_start",
+    "new_cases_rolling7", "trend_new_cases"
+]
+
+FEATURES_DEATHS = [
+    "total_cases", "location_encoded", "day", "month", "year",
+    "total_deaths", "new_cases", "epidemic_phase", "days_since_start",
+    "new_cases_rolling7", "trend_new_cases"
+]
+
+FEATURES_GEO = FEATURES_DEATHS.copy()
+
+# Colonnes figées à la dernière observation de chaque pays
+FEATURES_PAYS = [
+    "total_cases", "location_encoded", "total_deaths",
+    "new_cases_rolling7", "trend_new_cases", "new_cases"
+]
+
+def construire_features_batch(pays_df, date_range, date_origine):
+    """
+    Construit une matrice de features unique pour tous les couples (pays, date)
+
+    Les lignes sont ordonnées pays par pays puis date par date, dans le même
+    ordre que la boucle historique.
+
     Args:
-        year_to_predict (int): Année pour laquelle générer les prédictions
-        
+        pays_df (pd.DataFrame): Dernière observation de chaque pays
+        date_range (pd.DatetimeIndex): Dates à prédire
+        date_origine (pd.Timestamp): Première date de l'historique
+
     Returns:
-        list: Liste de dictionnaires contenant les prédictions
+        pd.DataFrame: Une ligne par couple (pays, date)
     """
-    start_date = f"{year_to_predict}-01-01"
-    end_date = f"{year_to_predict}-12-31"
-    print(f"📅 Génération des prédictions pour l'année {year_to_predict}")
+    n_pays = len(pays_df)
+    n_jours = len(date_range)
+
+    features = {
+        col: np.repeat(pays_df[col].to_numpy(), n_jours)
+        for col in FEATURES_PAYS
+    }
+    features["day"] = np.tile(date_range.day.to_numpy(), n_pays)
+    features["month"] = np.tile(date_range.month.to_numpy(), n_pays)
+    features["year"] = np.tile(date_range.year.to_numpy(), n_pays)
+    features["epidemic_phase"] = np.ones(n_pays * n_jours, dtype=np.int64)
+    features["days_since_start"] = np.tile((date_range - date_origine).days.to_numpy(), n_pays)
+
+    return pd.DataFrame(features)
+
+def _generer_predictions_batch(modeles, working_data, date_range, date_origine):
+    """
+    Génère les prédictions de tous les pays en un seul appel par modèle
+    """
+    model_cases, model_deaths, model_geo = modeles
+    matrice = construire_features_batch(working_data, date_range, date_origine)
 
-    date_range = pd.date_range(start=start_date, end=end_date)
-    future_rows = []
+    new_cases_pred = model_cases.predict(matrice[FEATURES_CASES])
+    new_deaths_pred = model_deaths.predict(matrice[FEATURES_DEATHS])
+    countries_reporting_pred = model_geo.predict(matrice[FEATURES_GEO])
 
-    working_data = latest_data
-    total_countries = len(working_data)
-    processed_locations = set()  # Pour suivre les pays traités
+    future_rows = _lignes_predictions(
+        working_data, date_range, new_cases_pred, new_deaths_pred, countries_reporting_pred
+    )
+    processed_locations = set(working_data["location"])
+    print(f"✅ {len(processed_locations)} pays traités en batch: {len(future_rows)} prédictions générées")
 
-    print(f"🌍 Début de la génération pour {total_countries} pays")
+    return future_rows, processed_locations
 
-    # Features pour chaque modèle
-    features_cases = [
-        "total_cases", "location_encoded", "day", "month", "year",
-        "total_deaths", "epidemic_phase", "days_since_start",
-        "new_cases_rolling7", "trend_new_cases"
+def _lignes_predictions(working_data, date_range, new_cases_pred, new_deaths_pred, countries_reporting_pred):
+    """
+    Convertit des prédictions ordonnées pays par pays puis date par date en liste de dictionnaires
+    """
+    dates = np.tile(date_range.date, len(working_data))
+    locations = np.repeat(working_data["location"].to_numpy(), len(date_range))
+
+    return [
+        {
+            "date": date_predite,
+            "location": location,
+            "new_cases_pred": cases,
+            "new_deaths_pred": deaths,
+            "countries_reporting_pred": reporting
+        }
+        for date_predite, location, cases, deaths, reporting in zip(
+            dates, locations, new_cases_pred, new_deaths_pred, countries_reporting_pred
+        )
     ]
 
-    features_deaths = [
-        "total_cases", "location_encoded", "day", "month", "year",
-        "total_deaths", "new_cases", "epidemic_phase", "days_since_start",
-        "new_cases_rolling7", "trend_new_cases"
-    ]
+# Fenêtre d'état du mode récursif : 7 jours pour la moyenne glissante + 1 pour la tendance à 7 jours
+TAILLE_FENETRE = 8
 
-    features_geo = features_deaths.copy()
+def calculer_fenetres_new_cases(data, working_data, taille: int = TAILLE_FENETRE):
+    """
+    Extrait les derniers new_cases observés de chaque pays, alignés sur working_data
+
+    Returns:
+        np.ndarray: Tableau (pays, taille), du plus ancien au plus récent,
+        complété à gauche par NaN si l'historique est trop court
+    """
+    derniers = (
+        data[data["location"].isin(working_data["location"])]
+        .groupby("location")["new_cases"]
+        .apply(lambda x: x.to_numpy(dtype=float)[-taille:])
+    )
+    fenetres = np.full((len(working_data), taille), np.nan)
+    for i, location in enumerate(working_data["location"]):
+        valeurs = derniers[location]
+        fenetres[i, taille - len(valeurs):] = valeurs
+    return fenetres
+
+def _moyenne_glissante(fenetres):
+    """Moyenne par ligne en ignorant les NaN (0 si la ligne est vide), comme rolling(min_periods=1)"""
+    valides = ~np.isnan(fenetres)
+    comptes = valides.sum(axis=1)
+    sommes = np.where(valides, fenetres, 0).sum(axis=1)
+    return np.divide(sommes, comptes, out=np.zeros(len(fenetres)), where=comptes > 0)
+
+def _generer_predictions_recursif(modeles, working_data, date_range, date_origine, fenetres):
+    """
+    Prévision autorégressive : chaque jour prédit alimente les features du lendemain
+
+    L'état de tous les pays (cumuls, new_cases, fenêtre glissante) est tenu
+    dans des tableaux NumPy : chaque jour coûte un appel par modèle, quel que
+    soit le nombre de pays. Le premier jour utilise exactement les features
+    de la dernière observation, comme le mode direct.
+    """
+    model_cases, model_deaths, model_geo = modeles
+    n_pays = len(working_data)
+    n_jours = len(date_range)
+
+    # État initial : dernière observation de chaque pays
+    total_cases = working_data["total_cases"].to_numpy(dtype=float)
+    total_deaths = working_data["total_deaths"].to_numpy(dtype=float)
+    new_cases = working_data["new_cases"].to_numpy(dtype=float)
+    new_cases_rolling7 = working_data["new_cases_rolling7"].to_numpy(dtype=float)
+    trend_new_cases = working_data["trend_new_cases"].to_numpy(dtype=float)
+    location_encoded = working_data["location_encoded"].to_numpy()
+    fenetres = np.array(fenetres, dtype=float)
+
+    jours_depuis_debut = (date_range - date_origine).days.to_numpy()
+    sorties_cases = np.empty((n_pays, n_jours))
+    sorties_deaths = np.empty((n_pays, n_jours))
+    sorties_reporting = np.empty((n_pays, n_jours))
+
+    for j, jour in enumerate(date_range):
+        features = pd.DataFrame({
+            "total_cases": total_cases,
+            "location_encoded": location_encoded,
+            "day": np.full(n_pays, jour.day),
+            "month": np.full(n_pays, jour.month),
+            "year": np.full(n_pays, jour.year),
+            "total_deaths": total_deaths,
+            "epidemic_phase": np.ones(n_pays, dtype=np.int64),
+            "days_since_start": np.full(n_pays, jours_depuis_debut[j]),
+            "new_cases_rolling7": new_cases_rolling7,
+            "trend_new_cases": trend_new_cases,
+            "new_cases": new_cases
+        })
+
+        cases, deaths, reporting = post_traitement_vectorise(
+            model_cases.predict(features[FEATURES_CASES]),
+            model_deaths.predict(features[FEATURES_DEATHS]),
+            model_geo.predict(features[FEATURES_GEO])
+        )
+        sorties_cases[:, j] = cases
+        sorties_deaths[:, j] = deaths
+        sorties_reporting[:, j] = reporting
+
+        # Mise à jour de l'état pour le jour suivant
+        total_cases = total_cases + cases
+        total_deaths = total_deaths + deaths
+        new_cases = cases
+        fenetres = np.concatenate([fenetres[:, 1:], cases[:, None]], axis=1)
+        new_cases_rolling7 = _moyenne_glissante(fenetres[:, 1:])
+        trend_new_cases = np.nan_to_num(fenetres[:, -1] - fenetres[:, 0])
+
+    future_rows = _lignes_predictions(
+        working_data, date_range, sorties_cases.ravel(), sorties_deaths.ravel(), sorties_reporting.ravel()
+    )
+    processed_locations = set(working_data["location"])
+    print(f"✅ {len(processed_locations)} pays traités en mode récursif: {len(future_rows)} prédictions générées")
+
+    return future_rows, processed_locations
+
+def _generer_predictions_boucle(modeles, working_data, date_range, date_origine, progression=None):
+    """
+    Génère les prédictions pays par pays et jour par jour (chemin historique)
+    """
+    model_cases, model_deaths, model_geo = modeles
+    future_rows = []
+    total_countries = len(working_data)
+    processed_locations = set()  # Pour suivre les pays traités
+    location = None
 
     try:
         for i, (_, row) in enumerate(working_data.iterrows(), 1):
@@ -153,7 +575,7 @@ def generate_predictions(year_to_predict: int = YEAR_TO_PREDICT):
                 day = single_date.day
                 month = single_date.month
                 year = single_date.year
-                days_since_start = (single_date - data["date"].min()).days
+                days_since_start = (single_date - date_origine).days
 
                 # Features de base communes
                 base_features = { 
@@ -171,15 +593,15 @@ def generate_predictions(year_to_predict: int = YEAR_TO_PREDICT):
                 }
 
                 # Prédiction des cas
-                features_for_cases = pd.DataFrame([base_features])[features_cases]
+                features_for_cases = pd.DataFrame([base_features])[FEATURES_CASES]
                 new_cases_pred = model_cases.predict(features_for_cases)[0]
 
                 # Prédiction des décès
-                features_for_deaths = pd.DataFrame([base_features])[features_deaths]
+                features_for_deaths = pd.DataFrame([base_features])[FEATURES_DEATHS]
                 new_deaths_pred = model_deaths.predict(features_for_deaths)[0]
 
                 # Prédiction de la propagation géographique
-                features_for_geo = pd.DataFrame([base_features])[features_geo]
+                features_for_geo = pd.DataFrame([base_features])[FEATURES_GEO]
                 countries_reporting_pred = model_geo.predict(features_for_geo)[0]
 
                 country_predictions.append({
@@ -194,6 +616,8 @@ def generate_predictions(year_to_predict: int = YEAR_TO_PREDICT):
             future_rows.extend(country_predictions)
             processed_locations.add(location)
             print(f"✅ {location} terminé: {len(country_predictions)} prédictions générées")
+            if progression is not None:
+                progression(i, total_countries)
 
             # Sauvegarde intermédiaire tous les 10 pays
             if i % 10 == 0:
@@ -206,8 +630,175 @@ def generate_predictions(year_to_predict: int = YEAR_TO_PREDICT):
         print(f"Dernier pays en cours: {location}")
         raise e
 
+    return future_rows, processed_locations
+
+# === EXÉCUTION PARALLÈLE ===
+# Modèles chargés une seule fois par processus du pool (voir _initialiser_worker)
+_modeles_worker = None
+
+def _initialiser_worker(modeles):
+    """
+    Reçoit les modèles une seule fois au démarrage de chaque processus du pool
+    """
+    global _modeles_worker
+    _modeles_worker = modeles
+
+def _traiter_lot_pays(index_lot, pays_df, date_range, date_origine, batch, fenetres=None):
+    """
+    Génère les prédictions d'un lot de pays dans un processus du pool
+
+    `fenetres` (historique récent des pays du lot) active le mode récursif.
+
+    Returns:
+        tuple: (index du lot, prédictions, pays traités, pid du worker, durée en secondes)
+    """
+    debut = time.perf_counter()
+    if fenetres is not None:
+        rows, locations = _generer_predictions_recursif(_modeles_worker, pays_df, date_range, date_origine, fenetres)
+    else:
+        generer = _generer_predictions_batch if batch else _generer_predictions_boucle
+        rows, locations = generer(_modeles_worker, pays_df, date_range, date_origine)
+    return index_lot, rows, locations, os.getpid(), time.perf_counter() - debut
+
+def _generer_predictions_pool(
+    modeles, working_data, date_range, date_origine, batch, n_workers, progression=None, fenetres=None
+):
+    """
+    Répartit les pays sur un pool de processus et fusionne les résultats dans l'ordre des pays
+    """
+    n_lots = min(len(working_data), n_workers * 4)
+    indices_lots = np.array_split(np.arange(len(working_data)), n_lots)
+    lots = [working_data.iloc[indices] for indices in indices_lots]
+
+    resultats = {}
+    stats_workers = {}
+    pays_traites = 0
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_initialiser_worker,
+        initargs=(modeles,)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _traiter_lot_pays, index_lot, lot, date_range, date_origine, batch,
+                None if fenetres is None else fenetres[indices_lots[index_lot]]
+            )
+            for index_lot, lot in enumerate(lots)
+        ]
+        for future in as_completed(futures):
+            index_lot, rows, locations, pid, duree = future.result()
+            resultats[index_lot] = (rows, locations)
+
+            stats = stats_workers.setdefault(pid, {"pays": 0, "predictions": 0, "duree": 0.0})
+            stats["pays"] += len(locations)
+            stats["predictions"] += len(rows)
+            stats["duree"] += duree
+            print(f"📦 Lot {index_lot + 1}/{n_lots} terminé par le worker {pid} ({len(locations)} pays)")
+
+            pays_traites += len(lots[index_lot])
+            if progression is not None:
+                progression(pays_traites, len(working_data))
+
+    # Fusion déterministe : les lots sont repris dans l'ordre des pays
+    future_rows = []
+    processed_locations = set()
+    for index_lot in range(n_lots):
+        rows, locations = resultats[index_lot]
+        future_rows.extend(rows)
+        processed_locations.update(locations)
+
+    print(f"⚙️ Débit par worker ({n_workers} processus):")
+    for pid, stats in sorted(stats_workers.items()):
+        debit = stats["predictions"] / stats["duree"] if stats["duree"] > 0 else float("inf")
+        print(f"   Worker {pid}: {stats['pays']} pays, {stats['predictions']} prédictions "
+              f"en {stats['duree']:.2f}s ({debit:,.0f} prédictions/s)")
+
+    return future_rows, processed_locations
+
+def generate_predictions(
+    year_to_predict: int = YEAR_TO_PREDICT,
+    data_path: str = None,
+    *,
+    batch: bool = True,
+    n_workers: int = N_WORKERS,
+    recursif: bool = False,
+    cache: bool = True,
+    progression=None
+):
+    """
+    Génère les prédictions pour une année donnée
+    
+    Args:
+        year_to_predict (int): Année pour laquelle générer les prédictions
+        data_path (str): CSV d'historique à utiliser (par défaut data/covid_processed.csv)
+        batch (bool): Si True, construit une matrice de features pour tous les
+            couples (pays, date) et appelle chaque modèle une seule fois.
+            Si False, utilise la boucle historique (3 prédictions par jour et par pays).
+        n_workers (int): Nombre de processus du pool. Au-delà de 1, les pays sont
+            répartis en lots sur un ProcessPoolExecutor puis fusionnés dans l'ordre.
+        recursif (bool): Si True, prévision autorégressive : les prédictions de
+            chaque jour mettent à jour cumuls, moyenne glissante et tendance
+            utilisés le lendemain (au lieu de figer la dernière observation).
+        cache (bool): Si True, réutilise le résultat en cache disque quand ni
+            l'année, ni le mode, ni le contenu des modèles et des données n'ont changé.
+        progression (callable): Appelée avec (pays traités, nombre total de pays)
+            au fil de la génération.
+        
+    Returns:
+        list: Liste de dictionnaires contenant les prédictions
+    """
+    start_date = f"{year_to_predict}-01-01"
+    end_date = f"{year_to_predict}-12-31"
+    print(f"📅 Génération des prédictions pour l'année {year_to_predict}")
+
+    date_range = pd.date_range(start=start_date, end=end_date)
+
+    cle_cache = None
+    if cache:
+        cle_cache = cache_predictions.cle(
+            year_to_predict, registre.model_paths, data_path or registre.data_path, recursif, batch
+        )
+        future_rows = cache_predictions.lire(cle_cache)
+        if future_rows is not None:
+            print(f"⚡ {len(future_rows)} prédictions relues depuis le cache")
+            if progression is not None:
+                progression(1, 1)
+            return future_rows
+
+    data, working_data = registre.donnees(data_path)
+    total_countries = len(working_data)
+
+    mode = "récursif" if recursif else ("batch" if batch else "boucle")
+    print(f"🌍 Début de la génération pour {total_countries} pays (mode {mode})")
+
+    modeles = registre.modeles()
+    date_origine = data["date"].min()
+    fenetres = calculer_fenetres_new_cases(data, working_data) if recursif else None
+
+    if n_workers > 1 and total_countries > 1:
+        future_rows, processed_locations = _generer_predictions_pool(
+            modeles, working_data, date_range, date_origine, batch, n_workers, progression, fenetres
+        )
+    elif recursif:
+        future_rows, processed_locations = _generer_predictions_recursif(
+            modeles, working_data, date_range, date_origine, fenetres
+        )
+        if progression is not None:
+            progression(total_countries, total_countries)
+    elif batch:
+        future_rows, processed_locations = _generer_predictions_batch(modeles, working_data, date_range, date_origine)
+        if progression is not None:
+            progression(total_countries, total_countries)
+    else:
+        future_rows, processed_locations = _generer_predictions_boucle(
+            modeles, working_data, date_range, date_origine, progression
+        )
+
     # Application des règles métier
     future_rows = post_traitement(future_rows)
+
+    if cle_cache is not None:
+        cache_predictions.ecrire(cle_cache, future_rows)
     
     print(f"\n✅ Prédictions générées avec succès")
     print(f"📊 {len(future_rows)} prédictions générées pour {len(processed_locations)} pays")
@@ -219,8 +810,18 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Génère des prédictions COVID pour l'année 2025")
     parser.add_argument("--year", type=int, default=YEAR_TO_PREDICT, help="Année à prédire")
+    parser.add_argument("--legacy", action="store_true", help="Utilise la boucle historique pays par pays au lieu du mode batch")
+    parser.add_argument("--workers", type=int, default=N_WORKERS, help="Nombre de processus pour répartir les pays")
+    parser.add_argument("--recursif", action="store_true", help="Prévision autorégressive (les prédictions alimentent les jours suivants)")
+    parser.add_argument("--sans-cache", action="store_true", help="Ignore le cache disque des prédictions")
     args = parser.parse_args()
 
     # Génération des prédictions
-    generate_predictions(args.year)
+    generate_predictions(
+        args.year,
+        batch=not args.legacy,
+        n_workers=args.workers,
+        recursif=args.recursif,
+        cache=not args.sans_cache
+    )
 
@@ -1,14 +1,64 @@
+import io
 import os
 import sys
+import time
 import pandas as pd
 from datetime import datetime
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
 
+# Ajouter la racine du dépôt au PYTHONPATH pour importer le code de l'API
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app.crud.resume_covid import rafraichir_resume_covid_sync
+from backend.app.models.models import FCovid, FMpox
+
+# Importable depuis backend (scripts.xxx) comme depuis scripts/ (run.py)
+try:
+    from scripts.data_loader import charger_donnees_traitees
+except ImportError:
+    from data_loader import charger_donnees_traitees
+
 # Charger les variables d'environnement
 load_dotenv()
 
+# Lignes envoyées par appel à COPY (borne la mémoire du tampon CSV)
+TAILLE_LOT_COPY = int(os.getenv("TAILLE_LOT_COPY", "100000"))
+# Import incrémental : jours relus avant la dernière date connue de chaque pays
+# (les sources révisent souvent les derniers jours publiés)
+FENETRE_REVISION_JOURS = int(os.getenv("IMPORT_FENETRE_REVISION_JOURS", "14"))
+
+COLONNES_F_COVID = [
+    'date',
+    'location_id',
+    'total_cases',
+    'new_cases',
+    'total_deaths',
+    'new_deaths',
+    'icu_patients',
+    'hosp_patients',
+    'total_vaccinations',
+    'people_vaccinated'
+]
+
+COLONNES_F_MPOX = [
+    'date',
+    'location_id',
+    'total_cases',
+    'total_deaths',
+    'new_cases',
+    'new_deaths',
+    'new_cases_smoothed',
+    'new_deaths_smoothed',
+    'new_cases_per_million',
+    'total_cases_per_million',
+    'new_cases_smoothed_per_million',
+    'new_deaths_per_million',
+    'total_deaths_per_million',
+    'new_deaths_smoothed_per_million'
+]
+
 def get_sync_db():
     DATABASE_URL = os.getenv("DATABASE_URL")
     if not DATABASE_URL:
@@ -19,11 +69,162 @@ def get_sync_db():
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return SessionLocal()
 
-def insert_f_covid():
-    data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'covid_processed.csv')
-    df = pd.read_csv(data_path)
+def copier_dataframe(db: Session, table: str, df: pd.DataFrame, colonnes, taille_lot: int = TAILLE_LOT_COPY) -> int:
+    """
+    Envoie le DataFrame dans `table` via COPY FROM STDIN (CSV), par lots
+
+    Utilise la connexion psycopg2 de la session : les lots font partie de
+    la transaction en cours, validée (ou annulée) par l'appelant.
+    """
+    curseur = db.connection().connection.dbapi_connection.cursor()
+    requete = f"COPY {table} ({', '.join(colonnes)}) FROM STDIN WITH (FORMAT csv, NULL '')"
+    try:
+        for debut in range(0, len(df), taille_lot):
+            tampon = io.StringIO()
+            df.iloc[debut:debut + taille_lot].to_csv(
+                tampon, columns=colonnes, header=False, index=False, na_rep='', date_format='%Y-%m-%d'
+            )
+            tampon.seek(0)
+            curseur.copy_expert(requete, tampon)
+    finally:
+        curseur.close()
+    return len(df)
+
+
+def charger_table_faits(db: Session, modele, df: pd.DataFrame, colonnes) -> int:
+    """
+    Rechargement complet d'une table de faits dans une seule transaction
+
+    TRUNCATE, suppression des index secondaires, COPY par lots, recréation
+    des index (une construction triée au lieu d'une mise à jour par ligne)
+    puis ANALYZE. Le commit reste à la charge de l'appelant.
+    """
+    table = modele.__table__
+    conn = db.connection()
+
+    print(f"Suppression des anciennes données {table.name}...")
+    db.execute(text(f"TRUNCATE TABLE {table.name}"))
+    for index in table.indexes:
+        index.drop(bind=conn, checkfirst=True)
+
+    print(f"Import des données {table.name} (COPY)...")
+    debut = time.perf_counter()
+    nb_lignes = copier_dataframe(db, table.name, df, colonnes)
+    duree_copy = time.perf_counter() - debut
+
+    for index in table.indexes:
+        print(f"   + {index.name}")
+        index.create(bind=conn)
+    db.execute(text(f"ANALYZE {table.name}"))
+    duree = time.perf_counter() - debut
+
+    print(
+        f"⚡ {nb_lignes} lignes copiées en {duree_copy:.1f} s ({nb_lignes / max(duree_copy, 1e-6):.0f} lignes/s), "
+        f"{duree:.1f} s index compris"
+    )
+    return nb_lignes
+
+
+def ajouter_locations(db: Session, noms):
+    """Ajoute à d_location les pays absents (import incrémental)"""
+    db.execute(
+        text("""
+            INSERT INTO d_location (location_name)
+            SELECT UNNEST(CAST(:noms AS VARCHAR[]))
+            ON CONFLICT (location_name) DO NOTHING
+        """),
+        {"noms": [str(nom) for nom in noms]}
+    )
+
+
+def lire_points_hauts(db: Session, table: str) -> pd.DataFrame:
+    """Point haut (dernière date chargée) de chaque pays de la table : location_id, point_haut"""
+    return pd.read_sql(
+        text(f"SELECT location_id, MAX(date) AS point_haut FROM {table} GROUP BY location_id"),
+        db.connection(),
+        parse_dates=['point_haut']
+    )
+
+
+def selectionner_delta(df: pd.DataFrame, points_hauts: pd.DataFrame, fenetre_jours: int = FENETRE_REVISION_JOURS) -> pd.DataFrame:
+    """
+    Garde les lignes postérieures au point haut de chaque pays
 
-    df['date'] = pd.to_datetime(df['date'])
+    Les `fenetre_jours` jours précédant le point haut sont relus pour prendre
+    en compte les révisions ; les pays absents de la table sont gardés en entier.
+    Une clé (location_id, date) en double ne garde que sa dernière ligne.
+    """
+    df = df.merge(points_hauts, on='location_id', how='left')
+    seuil = df['point_haut'] - pd.Timedelta(days=fenetre_jours)
+    delta = df[df['point_haut'].isna() | (df['date'] >= seuil)].drop(columns='point_haut')
+    return delta.drop_duplicates(['location_id', 'date'], keep='last')
+
+
+def filtrer_delta(db: Session, table: str, df: pd.DataFrame, fenetre_jours: int = FENETRE_REVISION_JOURS) -> pd.DataFrame:
+    """Delta de `df` par rapport au contenu de `table` (voir selectionner_delta)"""
+    return selectionner_delta(df, lire_points_hauts(db, table), fenetre_jours)
+
+
+def fusionner_table_faits(db: Session, modele, df: pd.DataFrame, colonnes) -> set:
+    """
+    Import incrémental : fusionne le delta dans la table via une table de transit
+
+    Le delta (voir filtrer_delta) est copié dans une table temporaire, puis
+    les lignes (location_id, date) existantes dont une valeur a changé sont
+    mises à jour et les nouvelles insérées. Seules ces lignes sont verrouillées.
+    La clé n'étant pas contrainte en unicité, la fusion se fait en
+    UPDATE ... IS DISTINCT FROM puis INSERT ... WHERE NOT EXISTS.
+
+    Returns:
+        set: location_id des pays modifiés (pour rafraîchir les agrégats)
+    """
+    table = modele.__table__.name
+    transit = f"transit_{table}"
+    valeurs = [colonne for colonne in colonnes if colonne not in ('date', 'location_id')]
+
+    delta = filtrer_delta(db, table, df)
+    print(f"Delta {table}: {len(delta)} lignes sur {len(df)} (fenêtre de révision {FENETRE_REVISION_JOURS} j)")
+    if delta.empty:
+        return set()
+
+    debut = time.perf_counter()
+    # Mêmes types que la table cible : les arrondis Numeric n'apparaissent pas comme des changements
+    db.execute(text(
+        f"CREATE TEMP TABLE {transit} ON COMMIT DROP AS SELECT {', '.join(colonnes)} FROM {table} WITH NO DATA"
+    ))
+    copier_dataframe(db, transit, delta, colonnes)
+    db.execute(text(f"ANALYZE {transit}"))
+
+    modifies = db.execute(text(f"""
+        UPDATE {table} f
+        SET {', '.join(f'{colonne} = t.{colonne}' for colonne in valeurs)}, updated_at = NOW()
+        FROM {transit} t
+        WHERE f.location_id = t.location_id
+        AND f.date = t.date
+        AND ({', '.join(f'f.{colonne}' for colonne in valeurs)})
+            IS DISTINCT FROM ({', '.join(f't.{colonne}' for colonne in valeurs)})
+        RETURNING f.location_id
+    """)).scalars().all()
+
+    ajoutes = db.execute(text(f"""
+        INSERT INTO {table} ({', '.join(colonnes)})
+        SELECT {', '.join(f't.{colonne}' for colonne in colonnes)}
+        FROM {transit} t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table} f
+            WHERE f.location_id = t.location_id AND f.date = t.date
+        )
+        RETURNING location_id
+    """)).scalars().all()
+
+    duree = time.perf_counter() - debut
+    print(f"⚡ {table}: {len(modifies)} lignes mises à jour, {len(ajoutes)} insérées en {duree:.1f} s")
+    return set(modifies) | set(ajoutes)
+
+
+def insert_f_covid(incremental: bool = False):
+    data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'covid_processed.csv')
+    df = charger_donnees_traitees(data_path)
 
     db: Session = get_sync_db()
     try:
@@ -35,33 +236,29 @@ def insert_f_covid():
             locations_df = pd.DataFrame({'location_name': df['location'].unique()})
             locations_df.to_sql('d_location', db.bind, if_exists='append', index=False)
             db.commit()
+        elif incremental:
+            # Nouveaux pays apparus depuis le dernier import
+            ajouter_locations(db, df['location'].unique())
         else:
             print(f"Table d_location existe déjà avec {location_count} locations.")
 
-        # Vider uniquement les données COVID (pas la structure)
-        print("Suppression des anciennes données COVID...")
-        db.execute(text("DELETE FROM f_covid"))
-        db.commit()
-
-        location_mapping = pd.read_sql('SELECT location_id, location_name FROM d_location', db.bind)
+        # Lue dans la transaction de la session pour voir les pays ajoutés
+        location_mapping = pd.read_sql('SELECT location_id, location_name FROM d_location', db.connection())
 
         covid_facts = df.merge(location_mapping, left_on='location', right_on='location_name')
 
-        f_covid = covid_facts[[
-            'date',
-            'location_id',
-            'total_cases',
-            'new_cases',
-            'total_deaths',
-            'new_deaths',
-            'icu_patients',
-            'hosp_patients',
-            'total_vaccinations',
-            'people_vaccinated'
-        ]]
-
-        print("Import des données f_covid...")
-        f_covid.to_sql('f_covid', db.bind, if_exists='append', index=False)
+        if incremental:
+            location_ids = fusionner_table_faits(db, FCovid, covid_facts, COLONNES_F_COVID)
+            # Seuls les pays modifiés sont recalculés dans le résumé
+            print(f"Rafraîchissement du résumé f_covid_resume ({len(location_ids)} pays)...")
+            rafraichir_resume_covid_sync(db, location_ids)
+        else:
+            # Suppression, chargement, index et résumé dans une seule transaction
+            charger_table_faits(db, FCovid, covid_facts, COLONNES_F_COVID)
+
+            # Rechargement complet : le résumé par pays est entièrement recalculé
+            print("Rafraîchissement du résumé f_covid_resume...")
+            rafraichir_resume_covid_sync(db)
         db.commit()
         print("✅ Import COVID terminé.")
     except Exception as e:
@@ -70,11 +267,9 @@ def insert_f_covid():
     finally:
         db.close()
 
-def insert_f_mpox():
+def insert_f_mpox(incremental: bool = False):
     data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'mpox_processed.csv')
-    df = pd.read_csv(data_path)
-
-    df['date'] = pd.to_datetime(df['date'])
+    df = charger_donnees_traitees(data_path)
 
     db: Session = get_sync_db()
     try:
@@ -85,34 +280,14 @@ def insert_f_mpox():
             print("⚠️  Attention: Table d_location vide. Importez d'abord les données COVID.")
             return
 
-        # Vider uniquement les données Mpox (pas la structure)
-        print("Suppression des anciennes données Mpox...")
-        db.execute(text("DELETE FROM f_mpox"))
-        db.commit()
-
         location_mapping = pd.read_sql('SELECT location_id, location_name FROM d_location', db.bind)
 
         mpox_facts = df.merge(location_mapping, left_on='location', right_on='location_name')
 
-        f_mpox = mpox_facts[[
-            'date',
-            'location_id',
-            'total_cases',
-            'total_deaths',
-            'new_cases',
-            'new_deaths',
-            'new_cases_smoothed',
-            'new_deaths_smoothed',
-            'new_cases_per_million',
-            'total_cases_per_million',
-            'new_cases_smoothed_per_million',
-            'new_deaths_per_million',
-            'total_deaths_per_million',
-            'new_deaths_smoothed_per_million'
-        ]]
-
-        print("Import des données f_mpox...")
-        f_mpox.to_sql('f_mpox', db.bind, if_exists='append', index=False)
+        if incremental:
+            fusionner_table_faits(db, FMpox, mpox_facts, COLONNES_F_MPOX)
+        else:
+            charger_table_faits(db, FMpox, mpox_facts, COLONNES_F_MPOX)
         db.commit()
         print("✅ Import Mpox terminé.")
     except Exception as e:
@@ -124,11 +299,12 @@ def insert_f_mpox():
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         cmd = sys.argv[1]
+        incremental = "--incremental" in sys.argv[2:]
         if cmd == "importCovid":
-            insert_f_covid()
+            insert_f_covid(incremental)
         elif cmd == "importMpox":
-            insert_f_mpox()
+            insert_f_mpox(incremental)
         else:
-            print("Commande inconnue. Utilisez : importCovid ou importMpox")
+            print("Commande inconnue. Utilisez : importCovid ou importMpox [--incremental]")
     else:
         print("Veuillez fournir une commande.")
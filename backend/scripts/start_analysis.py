@@ -17,7 +17,8 @@ def main():
         print("Dossier 'data' créé.")
     
     # Exécuter l'ETL si nécessaire
-    if not os.path.exists('data/covid_processed.csv') or not os.path.exists('data/mpox_processed.csv'):
+    from scripts.data_loader import donnees_traitees_existent
+    if not donnees_traitees_existent('data/covid_processed.csv') or not donnees_traitees_existent('data/mpox_processed.csv'):
         print("\n=== Démarrage du processus ETL ===")
         try:
             import scripts.etl_script as etl_script
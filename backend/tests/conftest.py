@@ -0,0 +1,58 @@
+import sys
+import os
+import asyncio
+import tempfile
+
+import pytest
+
+# Les tests n'utilisent jamais la base configurée dans .env : l'engine de
+# l'API (créé à l'import) pointe sur une base SQLite temporaire
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(prefix="tests_api_"), "api.db")
+
+# Racine du dépôt dans le PYTHONPATH (l'application s'importe en backend.app)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def executer(coroutine_fn):
+    """
+    Exécute une coroutine sur l'engine de l'API hors du client de test
+
+    Les connexions aiosqlite sont liées à leur boucle d'événements : le pool
+    est vidé avant de rendre la main.
+    """
+    from backend.app.core.database import engine
+
+    async def lancer():
+        try:
+            return await coroutine_fn()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(lancer())
+
+
+@pytest.fixture
+def base_sqlite():
+    """Schéma de l'API recréé à vide, cache des réponses vidé"""
+    from backend.app.core.cache import cache_reponses
+    from backend.app.core.database import Base, engine
+    from backend.app.models import models  # noqa: F401  (enregistre les tables)
+
+    async def recreer():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    executer(recreer)
+    cache_reponses.invalider()
+    yield
+    cache_reponses.invalider()
+
+
+@pytest.fixture
+def client(base_sqlite):
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+
+    yield TestClient(app)
+    executer(lambda: asyncio.sleep(0))
@@ -0,0 +1,136 @@
+import sys
+import os
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy.sql.dml import Insert
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from conftest import executer
+from backend.app.core import cache
+from backend.app.core.cache import CLE_VERSION, BackendMemoire, cache_reponses
+from backend.app.core.database import SessionLocal
+from backend.app.crud import predi_covid as crud_predi_covid
+from backend.app.models.models import DLocation, FPrediCovid
+
+URL_PAYS = "/api/predictions/countries"
+
+
+class Horloge:
+    """Remplace time.monotonic dans le module de cache"""
+
+    def __init__(self):
+        self.maintenant = 1000.0
+
+    def __call__(self):
+        return self.maintenant
+
+
+def test_backend_memoire_expiration(monkeypatch):
+    horloge = Horloge()
+    monkeypatch.setattr(cache.time, "monotonic", horloge)
+    backend = BackendMemoire()
+
+    backend.ecrire("a", b"1", ttl=10)
+    horloge.maintenant += 9
+    assert backend.lire("a") == b"1"
+    horloge.maintenant += 1
+    assert backend.lire("a") is None
+
+
+def test_backend_memoire_lru():
+    backend = BackendMemoire(max_entrees=2)
+    backend.ecrire("a", b"1", ttl=60)
+    backend.ecrire("b", b"2", ttl=60)
+    # Une lecture rend "a" plus récent que "b" : c'est "b" qui sort
+    assert backend.lire("a") == b"1"
+    backend.ecrire("c", b"3", ttl=60)
+
+    assert backend.lire("b") is None
+    assert (backend.lire("a"), backend.lire("c")) == (b"1", b"3")
+
+
+@pytest.fixture
+def predictions(base_sqlite):
+    async def inserer():
+        async with SessionLocal() as db:
+            db.add(DLocation(location_id=1, location_name="France"))
+            db.add(FPrediCovid(
+                location_id=1, date_predite=date(2025, 1, 1), indicateur="new_cases",
+                valeur_predite=10, model_name=crud_predi_covid.MODELE_DIRECT
+            ))
+            await db.commit()
+
+    executer(inserer)
+
+
+def test_if_none_match(client, predictions):
+    premiere = client.get(URL_PAYS)
+    assert premiere.status_code == 200
+    assert premiere.json() == ["France"]
+    etag = premiere.headers["etag"]
+
+    identique = client.get(URL_PAYS, headers={"If-None-Match": etag})
+    assert identique.status_code == 304
+    assert identique.content == b""
+    assert identique.headers["etag"] == etag
+
+    autre = client.get(URL_PAYS, headers={"If-None-Match": '"obsolete", "autre"'})
+    assert autre.status_code == 200
+    assert autre.json() == ["France"]
+
+    # Les autres routes ont leur propre ETag pour la même version des données
+    par_pays = client.get("/api/predictions/predictions-by-country/2025", params={"pays": "France"})
+    assert par_pays.headers["etag"] != etag
+
+
+class SessionInsertion:
+    """Session minimale pour creer_predictions_covid_en_masse (sans upsert PostgreSQL)"""
+
+    def __init__(self):
+        self.commits = 0
+
+    async def execute(self, requete, parametres=None):
+        cree = isinstance(requete, Insert) and requete.table.name == "d_location"
+        return type("Resultat", (), {"all": lambda _self: [("Italy", 2)] if cree else []})()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def test_invalidation_apres_insertion_en_masse(client, predictions):
+    etag = client.get(URL_PAYS).headers["etag"]
+    assert cache_reponses.backend.lire(CLE_VERSION) is not None
+
+    # Écriture hors CRUD : l'empreinte en cache n'est pas recalculée, la réponse reste servie
+    async def ajouter_pays():
+        async with SessionLocal() as db:
+            db.add(DLocation(location_id=2, location_name="Italy"))
+            db.add(FPrediCovid(
+                location_id=2, date_predite=date(2025, 1, 1), indicateur="new_cases",
+                valeur_predite=5, model_name=crud_predi_covid.MODELE_DIRECT
+            ))
+            await db.commit()
+
+    executer(ajouter_pays)
+    assert client.get(URL_PAYS, headers={"If-None-Match": etag}).status_code == 304
+
+    session = SessionInsertion()
+    resume = asyncio.run(crud_predi_covid.creer_predictions_covid_en_masse(session, [{
+        "date": date(2025, 1, 2), "location": "Italy",
+        "new_cases_pred": 1.0, "new_deaths_pred": 0.0, "countries_reporting_pred": 1.0
+    }], model_name=crud_predi_covid.MODELE_DIRECT))
+    assert session.commits == 1 and resume["pays_crees"] == 1
+    assert cache_reponses.backend.lire(CLE_VERSION) is None
+
+    # Nouvelle empreinte : l'ancien ETag ne correspond plus, le contenu est recalculé
+    apres = client.get(URL_PAYS, headers={"If-None-Match": etag})
+    assert apres.status_code == 200
+    assert apres.headers["etag"] != etag
+    assert apres.json() == ["France", "Italy"]
@@ -0,0 +1,83 @@
+import sys
+import os
+import pandas as pd
+import pytest
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts import data_loader
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def donnees():
+    return pd.DataFrame({
+        "date": pd.date_range("2021-01-01", periods=6),
+        "location": pd.Categorical(["France", "Italy"] * 3),
+        "new_cases": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+    })
+
+
+def test_feather_prefere_et_identique_au_csv(tmp_path, donnees):
+    chemin_csv = str(tmp_path / "covid_processed.csv")
+    ecrits = data_loader.ecrire_donnees_traitees(donnees, chemin_csv, csv=True)
+    assert ecrits == [chemin_csv, data_loader.chemin_colonnaire(chemin_csv)]
+    assert data_loader.resoudre_fichier(chemin_csv).endswith(".feather")
+
+    depuis_feather = data_loader.charger_donnees_traitees(chemin_csv)
+    depuis_csv = pd.read_csv(chemin_csv, parse_dates=["date"])
+    pd.testing.assert_frame_equal(depuis_feather, depuis_csv)
+
+
+def test_csv_modifie_apres_feather_prioritaire(tmp_path, donnees):
+    chemin_csv = str(tmp_path / "covid_processed.csv")
+    data_loader.ecrire_donnees_traitees(donnees, chemin_csv, csv=True)
+    feather = data_loader.chemin_colonnaire(chemin_csv)
+    os.utime(feather, (0, 0))
+    assert data_loader.resoudre_fichier(chemin_csv) == chemin_csv
+
+
+def test_feather_seul_et_colonnes(tmp_path, donnees):
+    chemin_csv = str(tmp_path / "covid_processed.csv")
+    data_loader.ecrire_donnees_traitees(donnees, chemin_csv, csv=False)
+    assert not os.path.exists(chemin_csv)
+    assert data_loader.donnees_traitees_existent(chemin_csv)
+
+    df = data_loader.charger_donnees_traitees(chemin_csv, columns=["location", "new_cases"], categories=True)
+    assert list(df.columns) == ["location", "new_cases"]
+    assert isinstance(df["location"].dtype, pd.CategoricalDtype)
+
+
+def test_absent(tmp_path):
+    chemin_csv = str(tmp_path / "absent.csv")
+    assert not data_loader.donnees_traitees_existent(chemin_csv)
+    with pytest.raises(FileNotFoundError):
+        data_loader.charger_donnees_traitees(chemin_csv)
+
+
+def test_read_csv_chunked_categories_differentes(tmp_path):
+    """Des lots aux catégories différentes donnent les mêmes types et valeurs qu'une lecture directe"""
+    chemin = tmp_path / "covid_data.csv"
+    pd.DataFrame({
+        "iso_code": ["FRA", "FRA", "ITA", "ITA", "CHN", "FRA", "BRA"],
+        "date": ["2021-01-01", "2021-01-02", "2021-01-01", "2021-01-02", "2021-01-01", "2021-01-03", "2021-01-01"],
+        "location": ["France", "France", "Italy", "Italy", "China", "France", "Brazil"],
+        "new_cases": [1.0, None, 3.0, 4.0, 5.0, 6.0, 7.0],
+        "new_deaths": [0.5, 1.0, None, 2.0, 0.0, 1.0, 3.0],
+    }).to_csv(chemin, index=False)
+    colonnes = ["date", "location", "new_cases", "new_deaths"]
+    types = {"location": "category", "new_cases": "float64", "new_deaths": "float32"}
+
+    # Lots de 2 lignes : {France}, {Italy}, {China, France}, {Brazil}
+    par_lots = data_loader.read_csv_chunked(chemin, colonnes, types, chunksize=2)
+    direct = pd.read_csv(chemin, usecols=colonnes, dtype=types, parse_dates=["date"])[colonnes]
+
+    assert isinstance(par_lots["location"].dtype, pd.CategoricalDtype)
+    assert sorted(par_lots["location"].cat.categories) == ["Brazil", "China", "France", "Italy"]
+    # Catégories dans l'ordre de rencontre et non triées : on compare les valeurs
+    pd.testing.assert_frame_equal(
+        par_lots.astype({"location": object}), direct.astype({"location": object})
+    )
+    assert par_lots.dtypes.drop("location").equals(direct.dtypes.drop("location"))
@@ -0,0 +1,143 @@
+import sys
+import os
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts import downloader
+
+
+class Source:
+    """Fichier servi par le serveur local, modifiable pendant le test"""
+
+    def __init__(self, contenu: bytes):
+        self.requetes = []
+        self.coupure = None  # Nombre d'octets envoyés avant de couper la connexion
+        self.publier(contenu)
+
+    def publier(self, contenu: bytes):
+        self.contenu = contenu
+        self.etag = '"' + hashlib.md5(contenu).hexdigest() + '"'
+
+
+def creer_gestionnaire(source: Source):
+    class Gestionnaire(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            source.requetes.append(dict(self.headers))
+            if self.headers.get("If-None-Match") == source.etag:
+                self.send_response(304)
+                self.send_header("ETag", source.etag)
+                self.end_headers()
+                return
+
+            debut = 0
+            plage = self.headers.get("Range")
+            if plage and self.headers.get("If-Range") == source.etag:
+                debut = int(plage.split("=")[1].rstrip("-"))
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {debut}-{len(source.contenu) - 1}/{len(source.contenu)}")
+            else:
+                self.send_response(200)
+            corps = source.contenu[debut:]
+            self.send_header("ETag", source.etag)
+            self.send_header("Content-Length", str(len(corps)))
+            self.end_headers()
+
+            if source.coupure is not None:
+                self.wfile.write(corps[:source.coupure])
+                source.coupure = None
+                self.close_connection = True
+                return
+            self.wfile.write(corps)
+
+    return Gestionnaire
+
+
+@pytest.fixture
+def serveur():
+    source = Source(os.urandom(300_000))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), creer_gestionnaire(source))
+    fil = threading.Thread(target=httpd.serve_forever, daemon=True)
+    fil.start()
+    yield source, f"http://127.0.0.1:{httpd.server_address[1]}/covid.csv"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def lire_manifeste(dossier):
+    with open(dossier / downloader.NOM_MANIFESTE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_telechargement_puis_inchange(serveur, tmp_path):
+    source, url = serveur
+    destination = tmp_path / "covid_data.csv"
+
+    assert downloader.telecharger(url, str(destination), taille_bloc=4096) == downloader.TELECHARGE
+    assert destination.read_bytes() == source.contenu
+    entree = lire_manifeste(tmp_path)["covid_data.csv"]
+    assert entree["sha256"] == hashlib.sha256(source.contenu).hexdigest()
+    assert entree["taille"] == len(source.contenu)
+    assert entree["etag"] == source.etag
+
+    # Source inchangée : requête conditionnelle, rien n'est réécrit
+    assert downloader.telecharger(url, str(destination)) == downloader.INCHANGE
+    assert source.requetes[-1]["If-None-Match"] == source.etag
+
+    # Source modifiée : nouveau contenu et nouvelle empreinte
+    source.publier(os.urandom(1000))
+    assert downloader.telecharger(url, str(destination)) == downloader.TELECHARGE
+    assert destination.read_bytes() == source.contenu
+    assert lire_manifeste(tmp_path)["covid_data.csv"]["sha256"] == hashlib.sha256(source.contenu).hexdigest()
+
+
+def test_fichier_local_altere_retelecharge(serveur, tmp_path):
+    source, url = serveur
+    destination = tmp_path / "covid_data.csv"
+    downloader.telecharger(url, str(destination))
+
+    destination.write_bytes(b"corrompu")
+    assert downloader.telecharger(url, str(destination)) == downloader.TELECHARGE
+    assert "If-None-Match" not in source.requetes[-1]
+    assert destination.read_bytes() == source.contenu
+
+
+def test_reprise_apres_coupure(serveur, tmp_path):
+    source, url = serveur
+    destination = tmp_path / "covid_data.csv"
+    source.coupure = 100_000
+
+    with pytest.raises(requests.RequestException):
+        downloader.telecharger(url, str(destination), taille_bloc=4096)
+    assert not destination.exists()
+    # Les blocs reçus avant la coupure sont conservés
+    recu = os.path.getsize(str(destination) + downloader.SUFFIXE_PARTIEL)
+    assert 0 < recu <= 100_000
+
+    assert downloader.telecharger(url, str(destination), taille_bloc=4096) == downloader.TELECHARGE
+    assert source.requetes[-1]["Range"] == f"bytes={recu}-"
+    assert destination.read_bytes() == source.contenu
+    assert lire_manifeste(tmp_path)["covid_data.csv"]["sha256"] == hashlib.sha256(source.contenu).hexdigest()
+
+
+def test_reprise_abandonnee_si_source_modifiee(serveur, tmp_path):
+    source, url = serveur
+    destination = tmp_path / "covid_data.csv"
+    source.coupure = 50_000
+    with pytest.raises(requests.RequestException):
+        downloader.telecharger(url, str(destination))
+
+    # If-Range ne correspond plus : le serveur renvoie le fichier complet
+    source.publier(os.urandom(200_000))
+    assert downloader.telecharger(url, str(destination)) == downloader.TELECHARGE
+    assert destination.read_bytes() == source.contenu
@@ -0,0 +1,117 @@
+import sys
+import os
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from conftest import executer
+from backend.app.core import export
+from backend.app.core.database import SessionLocal
+from backend.app.models.models import DLocation, FPrediCovid
+
+URL_EXPORT = "/api/predictions/export"
+COLONNES = [colonne.name for colonne in FPrediCovid.__table__.columns]
+
+
+def predictions_synthetiques(n: int):
+    """Générateur de n prédictions, dont une valeur décimale et des dates successives"""
+    for i in range(n):
+        yield FPrediCovid(
+            location_id=1, date_predite=date(2025, 1, 1) + timedelta(days=i),
+            indicateur="new_cases", valeur_predite=i + 0.25, model_name="m"
+        )
+
+
+@pytest.fixture(params=[25, 20], ids=["lot_partiel", "lots_complets"])
+def predictions(request, base_sqlite, monkeypatch):
+    """25 lignes (lots 10 + 10 + 5) ou 20 lignes (lots pleins), avec des lots de 10"""
+    monkeypatch.setattr(export, "TAILLE_LOT_EXPORT", 10)
+
+    async def inserer():
+        async with SessionLocal() as db:
+            db.add(DLocation(location_id=1, location_name="France"))
+            db.add_all(predictions_synthetiques(request.param))
+            await db.commit()
+
+    executer(inserer)
+    return request.param
+
+
+def verifier_lignes(lignes, n):
+    assert len(lignes) == n
+    assert [ligne["date_predite"] for ligne in lignes] == [
+        (date(2025, 1, 1) + timedelta(days=i)).isoformat() for i in range(n)
+    ]
+    assert [float(ligne["valeur_predite"]) for ligne in lignes] == [i + 0.25 for i in range(n)]
+
+
+def test_export_csv(client, predictions):
+    reponse = client.get(URL_EXPORT, params={"format": "csv"})
+    assert reponse.status_code == 200
+    assert reponse.headers["content-type"].startswith("text/csv")
+    assert 'filename="f_predi_covid.csv"' in reponse.headers["content-disposition"]
+
+    lecteur = csv.reader(io.StringIO(reponse.text))
+    entete, *lignes = list(lecteur)
+    # En-tête émis une seule fois, quel que soit le nombre de lots
+    assert entete == COLONNES
+    assert entete not in lignes
+    verifier_lignes([dict(zip(entete, ligne)) for ligne in lignes], predictions)
+
+
+def test_export_ndjson(client, predictions):
+    reponse = client.get(URL_EXPORT, params={"format": "ndjson"})
+    assert reponse.headers["content-type"] == "application/x-ndjson"
+    assert reponse.text.endswith("\n")
+
+    lignes = [json.loads(ligne) for ligne in reponse.text.splitlines()]
+    assert all(list(ligne) == COLONNES for ligne in lignes)
+    verifier_lignes(lignes, predictions)
+
+
+def test_export_arrow(client, predictions):
+    pa = pytest.importorskip("pyarrow")
+    reponse = client.get(URL_EXPORT, params={"format": "arrow"})
+    assert reponse.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    lecteur = pa.ipc.open_stream(reponse.content)
+    lots = list(lecteur)
+    assert [lot.num_rows for lot in lots] == [10] * (predictions // 10) + ([predictions % 10] if predictions % 10 else [])
+
+    table = pa.Table.from_batches(lots, schema=lecteur.schema)
+    assert table.schema.field("date_predite").type == pa.date32()
+    assert table.schema.field("valeur_predite").type == pa.float64()
+    assert table.schema.field("pred_id").type == pa.int64()
+    verifier_lignes(
+        [dict(ligne, date_predite=ligne["date_predite"].isoformat()) for ligne in table.to_pylist()], predictions
+    )
+
+
+def test_export_filtre_vide(client, predictions):
+    """Sans ligne, le CSV ne contient que l'en-tête et le NDJSON est vide"""
+    assert client.get(URL_EXPORT, params={"format": "csv", "location_id": 99}).text.splitlines() == [",".join(COLONNES)]
+    assert client.get(URL_EXPORT, params={"format": "ndjson", "location_id": 99}).text == ""
+
+
+def test_encodeurs_valeurs_manquantes():
+    """Les encodeurs de lot gardent None (champ vide en CSV, null en NDJSON et en Arrow)"""
+    pa = pytest.importorskip("pyarrow")
+    lignes = [(1, date(2025, 1, 1), None), (2, None, 1.5)]
+    noms = ["id", "jour", "valeur"]
+
+    assert list(csv.reader(io.StringIO(export._lot_csv(lignes)))) == [["1", "2025-01-01", ""], ["2", "", "1.5"]]
+    assert [json.loads(ligne) for ligne in export._lot_ndjson(noms, lignes).splitlines()] == [
+        {"id": 1, "jour": "2025-01-01", "valeur": None},
+        {"id": 2, "jour": None, "valeur": 1.5},
+    ]
+    schema = pa.schema([("id", pa.int64()), ("jour", pa.date32()), ("valeur", pa.float64())])
+    assert export._lot_arrow(schema, lignes).to_pylist() == [
+        {"id": 1, "jour": date(2025, 1, 1), "valeur": None},
+        {"id": 2, "jour": None, "valeur": 1.5},
+    ]
@@ -7,6 +7,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from scripts.generate_predictions import generate_predictions
+from scripts.data_loader import charger_donnees_traitees
 
 # Liste des pays à tester
 PAYS_TEST = ["France", "Italy", "China", "United States"]
@@ -25,7 +26,7 @@ def test_predictions_simple():
     # Charger les données historiques pour filtrer
     data_path = "data/covid_processed.csv"
     test_data_path = "data/covid_processed_test.csv"
-    data = pd.read_csv(data_path, parse_dates=["date"])
+    data = charger_donnees_traitees(data_path)
     
     # Filtrer les données pour les pays de test
     data_filtered = data[data["location"].isin(PAYS_TEST)]
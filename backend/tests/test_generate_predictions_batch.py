@@ -0,0 +1,168 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import joblib
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts import generate_predictions as gp
+
+PAYS_TEST = ["France", "Italy", "China"]
+
+@pytest.fixture
+def registre_test(tmp_path, monkeypatch):
+    """
+    Registre pointant vers un historique et des modèles synthétiques
+    """
+    rng = np.random.default_rng(0)
+    lignes = []
+    for pays in PAYS_TEST:
+        dates = pd.date_range("2021-01-01", "2024-03-31")
+        new_cases = rng.poisson(100, len(dates)).astype(float)
+        new_deaths = rng.poisson(3, len(dates)).astype(float)
+        lignes.append(pd.DataFrame({
+            "date": dates,
+            "location": pays,
+            "total_cases": new_cases.cumsum(),
+            "new_cases": new_cases,
+            "total_deaths": new_deaths.cumsum(),
+            "new_deaths": new_deaths,
+        }))
+    data_path = tmp_path / "covid_processed.csv"
+    pd.concat(lignes).to_csv(data_path, index=False)
+
+    X = pd.DataFrame(rng.random((300, len(gp.FEATURES_DEATHS))) * 1000, columns=gp.FEATURES_DEATHS)
+    model_paths = {}
+    for nom, features in [("cases", gp.FEATURES_CASES), ("deaths", gp.FEATURES_DEATHS), ("geo", gp.FEATURES_GEO)]:
+        modele = DecisionTreeRegressor(max_depth=6, random_state=0).fit(X[features], rng.random(300) * 100)
+        model_paths[nom] = str(tmp_path / f"model_{nom}.joblib")
+        joblib.dump(modele, model_paths[nom])
+
+    registre = gp.RegistreModeles(model_paths, str(data_path))
+    monkeypatch.setattr(gp, "registre", registre)
+    monkeypatch.setattr(gp, "cache_predictions", gp.CachePredictions(str(tmp_path / "cache")))
+    return registre
+
+def test_registre_paresseux():
+    """Construire un registre ne lit aucun fichier"""
+    registre = gp.RegistreModeles({"cases": "absent", "deaths": "absent", "geo": "absent"}, "absent.csv")
+    assert registre._modeles is None
+    assert registre._donnees == {}
+
+def test_batch_identique_boucle(registre_test):
+    boucle = gp.generate_predictions(2025, batch=False, n_workers=1, cache=False)
+    batch = gp.generate_predictions(2025, batch=True, n_workers=1, cache=False)
+    assert len(batch) == 365 * len(PAYS_TEST)
+    assert batch == boucle
+
+def test_pool_identique_sequentiel(registre_test):
+    sequentiel = gp.generate_predictions(2025, n_workers=1, cache=False)
+    pool = gp.generate_predictions(2025, n_workers=2, cache=False)
+    assert pool == sequentiel
+
+def test_rechargement_si_joblib_modifie(registre_test):
+    modeles = registre_test.modeles()
+    assert registre_test.modeles() is modeles
+
+    chemin = registre_test.model_paths["cases"]
+    mtime = os.path.getmtime(chemin) + 10
+    os.utime(chemin, (mtime, mtime))
+    assert registre_test.modeles() is not modeles
+
+def test_post_traitement_vectorise_identique():
+    rng = np.random.default_rng(1)
+    cases = rng.normal(50, 60, 500)
+    deaths = rng.normal(5, 30, 500)
+    reporting = rng.normal(1, 2, 500)
+
+    predictions = gp.post_traitement([
+        {"new_cases_pred": c, "new_deaths_pred": d, "countries_reporting_pred": r}
+        for c, d, r in zip(cases, deaths, reporting)
+    ])
+    cases_v, deaths_v, reporting_v = gp.post_traitement_vectorise(cases, deaths, reporting)
+
+    assert np.allclose([p["new_cases_pred"] for p in predictions], cases_v)
+    assert np.allclose([p["new_deaths_pred"] for p in predictions], deaths_v)
+    assert np.allclose([p["countries_reporting_pred"] for p in predictions], reporting_v)
+
+def test_recursif_premier_jour_et_cumuls(registre_test):
+    direct = pd.DataFrame(gp.generate_predictions(2025, n_workers=1, cache=False))
+    recursif = pd.DataFrame(gp.generate_predictions(2025, n_workers=1, recursif=True, cache=False))
+
+    assert len(recursif) == len(direct)
+    assert list(recursif["location"]) == list(direct["location"])
+
+    # Le premier jour part des mêmes features que le mode direct
+    premier_jour = recursif["date"] == recursif["date"].min()
+    colonnes = ["new_cases_pred", "new_deaths_pred", "countries_reporting_pred"]
+    assert np.allclose(
+        recursif.loc[premier_jour, colonnes].to_numpy(dtype=float),
+        direct.loc[premier_jour, colonnes].to_numpy(dtype=float)
+    )
+
+def test_recursif_pool_identique_sequentiel(registre_test):
+    sequentiel = gp.generate_predictions(2025, n_workers=1, recursif=True, cache=False)
+    pool = gp.generate_predictions(2025, n_workers=2, recursif=True, cache=False)
+    assert pool == sequentiel
+
+def test_cache_relu_puis_invalide(registre_test, monkeypatch):
+    premiere = gp.generate_predictions(2025, n_workers=1)
+    assert len(os.listdir(gp.cache_predictions.dossier)) == 1
+
+    # Un second appel ne doit plus solliciter les modèles
+    monkeypatch.setattr(registre_test, "modeles", lambda: pytest.fail("modèles rechargés malgré le cache"))
+    assert gp.generate_predictions(2025, n_workers=1) == premiere
+    monkeypatch.undo()
+
+    # Un modèle au contenu différent change la clé
+    cle = gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False)
+    joblib.dump(DecisionTreeRegressor(max_depth=1).fit([[0] * 10, [1] * 10], [0, 1]), registre_test.model_paths["cases"])
+    assert gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False) != cle
+
+def test_cache_distingue_batch_et_boucle(registre_test, monkeypatch):
+    """Un appel --legacy après un appel batch ne relit pas le résultat batch"""
+    cle_batch = gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False, batch=True)
+    cle_boucle = gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False, batch=False)
+    assert cle_batch != cle_boucle
+
+    gp.generate_predictions(2025, n_workers=1, batch=True)
+    appels = []
+    boucle = gp._generer_predictions_boucle
+    monkeypatch.setattr(gp, "_generer_predictions_boucle", lambda *args, **kwargs: appels.append(1) or boucle(*args, **kwargs))
+    gp.generate_predictions(2025, n_workers=1, batch=False)
+    assert appels == [1]
+
+def test_cache_suit_le_fichier_feather(registre_test):
+    """La clé du cache porte sur le fichier réellement lu (Feather prioritaire)"""
+    pytest.importorskip("pyarrow")
+    from scripts.data_loader import ecrire_donnees_traitees
+
+    cle_csv = gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False)
+    data = pd.read_csv(registre_test.data_path, parse_dates=["date"])
+    data["new_cases"] = data["new_cases"] + 1
+    ecrire_donnees_traitees(data, registre_test.data_path, csv=False)
+
+    assert gp.cache_predictions.cle(2025, registre_test.model_paths, registre_test.data_path, False) != cle_csv
+    historique, _ = registre_test.donnees()
+    assert historique["new_cases"].sum() == data["new_cases"].sum()
+
+def test_cache_eviction_lru(tmp_path):
+    cache = gp.CachePredictions(str(tmp_path / "cache"), max_mb=0.2)
+    predictions = [
+        {"date": pd.Timestamp("2025-01-01").date(), "location": "France",
+         "new_cases_pred": 1.0, "new_deaths_pred": 0.0, "countries_reporting_pred": 2.0}
+    ] * 1000
+    for i in range(4):
+        cache.ecrire(f"entree{i}", predictions)
+        chemin = os.path.join(cache.dossier, f"entree{i}")
+        os.utime(chemin, (i, i))
+
+    cache.evincer()
+    restantes = sorted(os.listdir(cache.dossier))
+    assert "entree3" in restantes
+    assert "entree0" not in restantes
+    assert cache.lire("entree3") == predictions
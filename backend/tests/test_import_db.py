@@ -0,0 +1,124 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Les modèles de l'API sont importés par import_db : une base SQLite suffit ici
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts import import_db
+
+
+class CurseurFactice:
+    """Curseur psycopg2 minimal : garde la requête et le CSV de chaque COPY"""
+
+    def __init__(self):
+        self.copies = []
+        self.ferme = False
+
+    def copy_expert(self, requete, tampon):
+        self.copies.append((requete, tampon.read()))
+
+    def close(self):
+        self.ferme = True
+
+
+class SessionFactice:
+    """Reproduit db.connection().connection.dbapi_connection.cursor()"""
+
+    def __init__(self):
+        self.curseur = CurseurFactice()
+
+    def connection(self):
+        dbapi_connection = SimpleNamespace(cursor=lambda: self.curseur)
+        return SimpleNamespace(connection=SimpleNamespace(dbapi_connection=dbapi_connection))
+
+
+@pytest.fixture
+def faits():
+    # Colonnes dans un ordre différent de COLONNES_F_COVID, plus une colonne ignorée
+    return pd.DataFrame({
+        'location': ['France', 'France', 'Italy'],
+        'new_cases': [10.0, np.nan, 3.5],
+        'location_id': [1, 1, 2],
+        'date': pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-01']),
+        'total_cases': [100.0, 110.0, np.nan],
+    })
+
+
+def test_copier_dataframe_csv(faits):
+    db = SessionFactice()
+    colonnes = ['date', 'location_id', 'total_cases', 'new_cases']
+
+    assert import_db.copier_dataframe(db, 'f_covid', faits, colonnes) == 3
+
+    (requete, csv), = db.curseur.copies
+    assert requete == "COPY f_covid (date, location_id, total_cases, new_cases) FROM STDIN WITH (FORMAT csv, NULL '')"
+    # Ordre des colonnes de la requête, dates en %Y-%m-%d, NaN en champ vide (NULL)
+    assert csv.splitlines() == [
+        "2021-01-01,1,100.0,10.0",
+        "2021-01-02,1,110.0,",
+        "2021-01-01,2,,3.5",
+    ]
+    assert db.curseur.ferme
+
+
+def test_copier_dataframe_par_lots(faits):
+    db = SessionFactice()
+    import_db.copier_dataframe(db, 'f_covid', faits, ['date', 'location_id'], taille_lot=2)
+
+    assert [csv.splitlines() for _, csv in db.curseur.copies] == [
+        ["2021-01-01,1", "2021-01-02,1"],
+        ["2021-01-01,2"],
+    ]
+
+
+@pytest.fixture
+def points_hauts():
+    # France chargée jusqu'au 31/01, Italy jusqu'au 10/01, Spain jamais chargée
+    return pd.DataFrame({
+        'location_id': [1, 2],
+        'point_haut': pd.to_datetime(['2021-01-31', '2021-01-10']),
+    })
+
+
+def test_selectionner_delta_fenetre_de_revision(points_hauts):
+    df = pd.DataFrame({
+        'location_id': 1,
+        'date': pd.date_range('2021-01-01', '2021-02-05'),
+    })
+    delta = import_db.selectionner_delta(df, points_hauts, fenetre_jours=7)
+
+    # Les 7 jours avant le point haut sont relus, en plus des nouvelles dates
+    assert delta['date'].min() == pd.Timestamp('2021-01-24')
+    assert delta['date'].max() == pd.Timestamp('2021-02-05')
+    assert len(delta) == 13
+    assert list(delta.columns) == ['location_id', 'date']
+
+
+def test_selectionner_delta_nouveau_pays_garde_en_entier(points_hauts):
+    df = pd.DataFrame({
+        'location_id': [2] * 3 + [3] * 3,
+        'date': list(pd.to_datetime(['2020-06-01', '2021-01-05', '2021-01-12'])) * 2,
+    })
+    delta = import_db.selectionner_delta(df, points_hauts, fenetre_jours=0)
+
+    assert delta.loc[delta['location_id'] == 2, 'date'].tolist() == [pd.Timestamp('2021-01-12')]
+    assert len(delta[delta['location_id'] == 3]) == 3
+
+
+def test_selectionner_delta_doublons_derniere_ligne(points_hauts):
+    df = pd.DataFrame({
+        'location_id': [3, 3, 3],
+        'date': pd.to_datetime(['2021-01-01', '2021-01-01', '2021-01-02']),
+        'new_cases': [1.0, 2.0, 5.0],
+    })
+    delta = import_db.selectionner_delta(df, points_hauts)
+
+    assert delta['new_cases'].tolist() == [2.0, 5.0]
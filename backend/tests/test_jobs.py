@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+import threading
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.core import jobs
+from backend.app.core.jobs import GestionnaireJobs, Job
+
+
+async def attendre_fin(job: Job):
+    while job.actif:
+        await asyncio.sleep(0.01)
+
+
+def test_meme_cle_un_seul_job():
+    async def scenario():
+        gestionnaire = GestionnaireJobs(max_workers=1)
+        liberer = asyncio.Event()
+        appels = []
+
+        async def traitement(job):
+            appels.append(job.job_id)
+            job.mettre_a_jour(statut="generation", progression=0.5)
+            await liberer.wait()
+            return {"lignes": 3}
+
+        premier, cree = gestionnaire.soumettre("generation-2025-direct", traitement)
+        assert cree
+        await asyncio.sleep(0)
+        second, cree_second = gestionnaire.soumettre("generation-2025-direct", traitement)
+        assert second is premier and not cree_second
+        assert premier.statut == "generation"
+
+        # Une autre clé (autre mode) donne un autre job
+        autre, cree_autre = gestionnaire.soumettre("generation-2025-recursif", traitement)
+        assert cree_autre and autre is not premier
+
+        liberer.set()
+        await attendre_fin(premier)
+        await attendre_fin(autre)
+        assert len(appels) == 2
+        assert premier.statut == "termine"
+        assert premier.progression == 1.0
+        assert premier.resultat == {"lignes": 3}
+        assert premier.termine_le is not None
+        assert gestionnaire.obtenir(premier.job_id) is premier
+
+        # Le job terminé libère la clé : une nouvelle soumission relance un job
+        troisieme, cree_troisieme = gestionnaire.soumettre("generation-2025-direct", traitement)
+        assert cree_troisieme and troisieme is not premier
+        await attendre_fin(troisieme)
+
+    asyncio.run(scenario())
+
+
+def test_job_en_erreur():
+    async def scenario():
+        gestionnaire = GestionnaireJobs(max_workers=1)
+
+        async def traitement(job):
+            job.mettre_a_jour(statut="sauvegarde", progression=0.7)
+            raise RuntimeError("base indisponible")
+
+        job, _ = gestionnaire.soumettre("generation-2025-direct", traitement)
+        await attendre_fin(job)
+        assert job.statut == "erreur"
+        assert job.erreur == "base indisponible"
+        assert job.to_dict()["eta_secondes"] is None
+
+        nouveau, cree = gestionnaire.soumettre("generation-2025-direct", traitement)
+        assert cree and nouveau is not job
+        await attendre_fin(nouveau)
+
+    asyncio.run(scenario())
+
+
+def test_progression_et_eta(monkeypatch):
+    horloge = [100.0]
+    monkeypatch.setattr(jobs.time, "monotonic", lambda: horloge[0])
+
+    job = Job("cle")
+    assert job.eta_secondes is None  # Pas encore démarré
+    job.mettre_a_jour(statut="generation")
+    horloge[0] += 10
+    job.mettre_a_jour(progression=0.25, lignes_totales=400, lignes_ecrites=100)
+
+    # 10 s pour 25 % : 30 s restantes
+    assert job.eta_secondes == 30.0
+    etat = job.to_dict()
+    assert (etat["progression"], etat["lignes_ecrites"], etat["lignes_totales"]) == (0.25, 100, 400)
+
+    job.mettre_a_jour(progression=1.5)
+    assert job.progression == 1.0
+
+
+def test_executer_en_thread():
+    async def scenario():
+        gestionnaire = GestionnaireJobs(max_workers=1)
+        return await gestionnaire.executer_en_thread(lambda x, y=0: (threading.current_thread().name, x + y), 1, y=2)
+
+    nom_thread, somme = asyncio.run(scenario())
+    assert nom_thread.startswith("jobs") and somme == 3
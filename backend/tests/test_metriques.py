@@ -0,0 +1,83 @@
+import sys
+import os
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.core.metriques import Compteur, Histogramme, MesureRequete, RegistreMetriques
+
+
+def valeurs_exposees(texte: str) -> dict:
+    """{'nom{etiquettes}': valeur} pour chaque ligne d'échantillon Prometheus"""
+    echantillons = {}
+    for ligne in texte.splitlines():
+        if ligne and not ligne.startswith("#"):
+            nom, valeur = ligne.rsplit(" ", 1)
+            echantillons[nom] = float(valeur)
+    return echantillons
+
+
+def test_histogramme_cumulatif():
+    histogramme = Histogramme("duree", "Durée", ("route",), (0.1, 1.0))
+    for mesure in (0.05, 0.1, 0.5, 3.0):
+        histogramme.observer(("/a",), mesure)
+    histogramme.observer(("/b",), 0.2)
+
+    lignes = histogramme.exposer()
+    assert lignes[:2] == ["# HELP duree Durée", "# TYPE duree histogram"]
+    echantillons = valeurs_exposees("\n".join(lignes))
+    # Une borne est inclusive (le = less or equal) et les compteurs sont cumulés
+    assert echantillons['duree_bucket{route="/a",le="0.1"}'] == 2
+    assert echantillons['duree_bucket{route="/a",le="1"}'] == 3
+    assert echantillons['duree_bucket{route="/a",le="+Inf"}'] == 4
+    assert echantillons['duree_count{route="/a"}'] == 4
+    assert echantillons['duree_sum{route="/a"}'] == 3.65
+    assert echantillons['duree_bucket{route="/b",le="0.1"}'] == 0
+    assert echantillons['duree_count{route="/b"}'] == 1
+
+
+def test_compteur_et_echappement():
+    sans_etiquette = Compteur("total", "Total")
+    assert sans_etiquette.exposer()[-1] == "total 0"
+    sans_etiquette.incrementer(pas=2.5)
+    assert sans_etiquette.exposer()[-1] == "total 2.5"
+
+    compteur = Compteur("requetes", "Requêtes", ("route",))
+    compteur.incrementer(('/a"b',))
+    assert compteur.exposer()[-1] == 'requetes{route="/a\\"b"} 1'
+
+
+def test_registre_observer_requete():
+    registre = RegistreMetriques()
+    registre.observer_requete("GET", "/api/x", 200, 0.02, 1500, MesureRequete(temps_db=0.01, nb_requetes_sql=2, lignes=7))
+
+    echantillons = valeurs_exposees(registre.exposer())
+    assert echantillons['api_requete_duree_secondes_count{methode="GET",route="/api/x",statut="200"}'] == 1
+    assert echantillons['api_reponse_taille_octets_bucket{methode="GET",route="/api/x",le="10000"}'] == 1
+    assert echantillons['api_requete_lignes_sql_bucket{methode="GET",route="/api/x",le="1"}'] == 0
+    assert echantillons['api_requete_lignes_sql_bucket{methode="GET",route="/api/x",le="10"}'] == 1
+    assert echantillons['api_requetes_sql_total{methode="GET",route="/api/x"}'] == 2
+    assert "api_pool_checkouts_total" in echantillons
+
+
+def test_middleware_route_statut_et_sql(client):
+    def echantillons():
+        return valeurs_exposees(client.get("/metrics").text)
+
+    route = 'methode="GET",route="/api/predictions/predictions-by-country/{year}"'
+    cle_404 = f'api_requete_duree_secondes_count{{{route},statut="404"}}'
+    cle_sql = f"api_requetes_sql_total{{{route}}}"
+    avant = echantillons()
+
+    # Base vide : 404 après au moins une requête SQL, sous le gabarit de la route
+    assert client.get("/api/predictions/predictions-by-country/2025", params={"pays": "France"}).status_code == 404
+    assert client.get("/api/predictions/predictions-by-country/2026", params={"pays": "Italy"}).status_code == 404
+    client.get("/inconnue")
+
+    apres = echantillons()
+    assert apres[cle_404] - avant.get(cle_404, 0) == 2
+    assert apres[cle_sql] - avant.get(cle_sql, 0) >= 2
+    assert apres[f'api_requete_duree_db_secondes_count{{{route}}}'] - avant.get(f'api_requete_duree_db_secondes_count{{{route}}}', 0) == 2
+    assert 'api_requete_duree_secondes_count{methode="GET",route="non_routee",statut="404"}' in apres
+    # /metrics n'est pas mesuré lui-même
+    assert not any('route="/metrics"' in nom for nom in apres)
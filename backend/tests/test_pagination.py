@@ -0,0 +1,94 @@
+import sys
+import os
+from datetime import date, timedelta
+
+import pytest
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from conftest import executer
+from backend.app.core.database import SessionLocal
+from backend.app.core.migrations import _creer_index_manquants
+from backend.app.core.pagination import ENTETE_CURSEUR, LIMITE_MAX_PAGE, decoder_curseur, encoder_curseur
+from backend.app.crud.predi_covid import COLONNES_CLE_PREDICTIONS
+from backend.app.models.models import DLocation, FPrediCovid
+
+URL_PREDICTIONS = "/api/predictions/"
+
+
+def test_curseur_aller_retour():
+    jeton = encoder_curseur(42, date(2025, 3, 1), 1234)
+    assert "=" not in jeton
+    assert decoder_curseur(jeton) == (42, date(2025, 3, 1), 1234)
+
+
+@pytest.mark.parametrize("jeton", ["zzz", "", encoder_curseur(1, 2), encoder_curseur(1, "pas-une-date", 3)])
+def test_curseur_invalide(jeton):
+    with pytest.raises(ValueError):
+        decoder_curseur(jeton)
+
+
+def test_index_de_la_cle_de_pagination(base_sqlite):
+    """L'ordre de pagination des prédictions est servi par un index, créé aussi sur les bases existantes"""
+    index = {index.name: index for index in FPrediCovid.__table__.indexes}["ix_f_predi_covid_location_date_pred"]
+    assert [colonne.name for colonne in index.columns] == [colonne.name for colonne in COLONNES_CLE_PREDICTIONS]
+
+    from backend.app.core.database import engine
+
+    async def recreer_index():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: index.drop(sync_conn))
+            await conn.run_sync(_creer_index_manquants)
+            return (await conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'ix_f_predi_covid_location_date_pred'"
+            )).scalar()
+
+    assert executer(recreer_index) == "ix_f_predi_covid_location_date_pred"
+
+
+@pytest.fixture
+def predictions(base_sqlite):
+    async def inserer():
+        async with SessionLocal() as db:
+            for location_id in (2, 1):
+                db.add(DLocation(location_id=location_id, location_name=f"Pays {location_id}"))
+                for jour in range(3):
+                    db.add(FPrediCovid(
+                        location_id=location_id, date_predite=date(2025, 1, 3) - timedelta(days=jour),
+                        indicateur="new_cases", valeur_predite=jour, model_name="m"
+                    ))
+            await db.commit()
+
+    executer(inserer)
+
+
+def test_pages_successives(client, predictions):
+    lues, curseur, pages = [], None, 0
+    while True:
+        reponse = client.get(URL_PREDICTIONS, params={"limit": 4, **({"cursor": curseur} if curseur else {})})
+        assert reponse.status_code == 200
+        lues += reponse.json()
+        pages += 1
+        curseur = reponse.headers.get(ENTETE_CURSEUR)
+        if curseur is None:
+            break
+
+    assert pages == 2
+    cles = [(p["location_id"], p["date_predite"]) for p in lues]
+    assert len(cles) == 6
+    assert cles == sorted(cles)
+
+
+def test_curseur_corrompu_400(client, predictions):
+    reponse = client.get(URL_PREDICTIONS, params={"cursor": "zzz"})
+    assert reponse.status_code == 400
+
+
+def test_limite_max_page(client, predictions):
+    assert client.get(URL_PREDICTIONS, params={"limit": LIMITE_MAX_PAGE + 1}).status_code == 400
+    reponse = client.get(URL_PREDICTIONS, params={"limit": LIMITE_MAX_PAGE})
+    assert reponse.status_code == 200
+    assert ENTETE_CURSEUR not in reponse.headers
+    # Le flux NDJSON n'est pas plafonné
+    assert client.get(URL_PREDICTIONS, params={"limit": LIMITE_MAX_PAGE + 1, "format": "ndjson"}).status_code == 200
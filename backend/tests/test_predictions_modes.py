@@ -0,0 +1,60 @@
+import sys
+import os
+from datetime import date, timedelta
+
+import pytest
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from conftest import executer
+from backend.app.core.database import SessionLocal
+from backend.app.crud.predi_covid import MODELE_DIRECT, MODELE_RECURSIF
+from backend.app.models.models import DLocation, FPrediCovid
+
+JOURS = 5
+
+
+@pytest.fixture
+def deux_modes(base_sqlite):
+    """La même année générée en mode direct (valeur 10) et récursif (valeur 20)"""
+    async def inserer():
+        async with SessionLocal() as db:
+            db.add(DLocation(location_id=1, location_name="France"))
+            for model_name, valeur in ((MODELE_DIRECT, 10), (MODELE_RECURSIF, 20)):
+                for jour in range(JOURS):
+                    for indicateur in ("new_cases", "new_deaths", "countries_reporting"):
+                        db.add(FPrediCovid(
+                            location_id=1,
+                            date_predite=date(2025, 1, 1) + timedelta(days=jour),
+                            indicateur=indicateur,
+                            valeur_predite=valeur,
+                            model_name=model_name
+                        ))
+            await db.commit()
+
+    executer(inserer)
+
+
+def test_par_pays_une_seule_serie(client, deux_modes):
+    reponse = client.get("/api/predictions/predictions-by-country/2025", params={"pays": "France"})
+    assert reponse.status_code == 200
+    predictions = reponse.json()
+    assert len(predictions) == JOURS
+    assert len({p["date"] for p in predictions}) == JOURS
+    assert {(p["modele"], p["nouveaux_cas"]) for p in predictions} == {(MODELE_DIRECT, 10.0)}
+
+    recursives = client.get(
+        "/api/predictions/predictions-by-country/2025", params={"pays": "France", "recursif": True}
+    ).json()
+    assert {(p["modele"], p["nouveaux_cas"]) for p in recursives} == {(MODELE_RECURSIF, 20.0)}
+
+
+def test_toutes_predictions_un_seul_modele(client, deux_modes):
+    lignes = client.get("/api/predictions/all-predictions/2025").json()["France"]
+    assert len(lignes) == JOURS
+    assert {(l["modele"], l["nouveaux_cas"], l["deces"]) for l in lignes} == {(MODELE_DIRECT, 10.0, 10.0)}
+
+    colonnes = client.get("/api/predictions/all-predictions/2025", params={"mode": "colonnes", "recursif": True}).json()
+    assert colonnes["France"]["modele"] == MODELE_RECURSIF
+    assert colonnes["France"]["nouveaux_cas"] == [20.0] * JOURS
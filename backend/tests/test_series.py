@@ -0,0 +1,45 @@
+import sys
+import os
+import math
+
+# Racine du dépôt dans le PYTHONPATH (l'application s'importe en backend.app)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.app.core.series import lttb
+
+
+def test_lttb_conserve_extremites_et_taille():
+    """
+    Le sous-échantillonnage garde le nombre de points demandé, dont le premier et le dernier
+    """
+    x = list(range(1000))
+    y = [math.sin(i / 20) for i in x]
+
+    indices = lttb(x, y, 100)
+
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(set(indices))
+
+
+def test_lttb_garde_les_pics():
+    """
+    Un pic isolé doit survivre au sous-échantillonnage
+    """
+    x = list(range(500))
+    y = [1.0] * 500
+    y[237] = 1000.0
+
+    indices = lttb(x, y, 20)
+
+    assert 237 in indices
+
+
+def test_lttb_serie_courte_ou_valeurs_manquantes():
+    """
+    Une série plus courte que le seuil est renvoyée telle quelle ; None compte comme 0
+    """
+    assert lttb([1, 2, 3], [1, None, 3], 10) == [0, 1, 2]
+
+    indices = lttb(list(range(50)), [None] * 25 + [5.0] * 25, 10)
+    assert len(indices) == 10
@@ -1,13 +1,20 @@
+import sys
+import os
 import pandas as pd
 import numpy as np
 import joblib
 from sklearn.preprocessing import LabelEncoder
 from datetime import datetime, date
 
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.data_loader import charger_donnees_traitees
+
 print("🧪 Test d'une prédiction simple...")
 
 # Charger les données
-data = pd.read_csv('data/covid_processed.csv', parse_dates=["date"])
+data = charger_donnees_traitees('data/covid_processed.csv')
 
 # Préparation des données
 data["location_encoded"] = LabelEncoder().fit_transform(data["location"])
@@ -40,38 +40,34 @@ export const fetchCountries = async () => {
  */
 export const fetchMultiCountryPredictions = async (params) => {
   try {
-    // Créer un tableau de promesses pour chaque pays
-    const promises = params.pays.map(async (pays) => {
-      // Construction de l'URL avec les paramètres
-      const url = new URL(`${API_BASE_URL}/predictions/`, window.location.origin);
-      
-      // Ajout des paramètres
-      url.searchParams.append('indicateur', params.indicateur || 'new_cases');
-      url.searchParams.append('location_id', pays.location_id);
-      
-      if (params.dateDebut) {
-        url.searchParams.append('date_debut', format(params.dateDebut, 'yyyy-MM-dd'));
-      }
-      if (params.dateFin) {
-        url.searchParams.append('date_fin', format(params.dateFin, 'yyyy-MM-dd'));
-      }
-
-      console.log('Fetching URL:', url.toString()); 
+    // Une seule requête pour tous les pays sélectionnés
+    const body = {
+      location_ids: params.pays.map((pays) => pays.location_id),
+      indicateur: params.indicateur || 'new_cases',
+    };
+
+    if (params.dateDebut) {
+      body.date_debut = format(params.dateDebut, 'yyyy-MM-dd');
+    }
+    if (params.dateFin) {
+      body.date_fin = format(params.dateFin, 'yyyy-MM-dd');
+    }
 
-      const response = await fetch(url);
-      
-      if (!response.ok) {
-        throw new Error(`Erreur HTTP: ${response.status}`);
-      }
-      
-      const data = await response.json();
-      return {
-        pays: pays.location_name,
-        predictions: data
-      };
+    const response = await fetch(`${API_BASE_URL}/predictions/batch`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+      },
+      body: JSON.stringify(body),
     });
 
-    return Promise.all(promises);
+    if (!response.ok) {
+      throw new Error(`Erreur HTTP: ${response.status}`);
+    }
+
+    // Réponse groupée par pays : [{ location_id, pays, predictions }]
+    return response.json();
   } catch (error) {
     console.error('Erreur lors de la récupération des prédictions:', error);
     throw error;